@@ -0,0 +1,40 @@
+import streamlit as st
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# ✅ (connect, read) timeouts in seconds; no request may hang a rerun forever
+API_TIMEOUT = (3.05, 10)
+
+
+@st.cache_resource
+def get_api_session():
+    """One keep-alive ``requests.Session`` shared by every rerun and browser tab.
+
+    Connections to the backend are pooled and reused instead of opening a
+    new TCP connection per click. Connection errors are retried for every
+    method (the request never reached Django); 502/503/504 responses only
+    for idempotent methods, so a POST is never sent twice.
+    """
+    retry = Retry(
+        total=3,
+        connect=3,
+        read=0,
+        status=2,
+        backoff_factor=0.2,
+        status_forcelist=(502, 503, 504),
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=20)
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Accept": "application/json"})
+    return session
+
+
+def api_post(url, payload, token=None):
+    """POST ``payload`` as JSON through the shared session."""
+    # ✅ Per-user headers go on the request, never on the shared session
+    headers = {"Authorization": f"Token {token}"} if token else None
+    return get_api_session().post(url, json=payload, headers=headers, timeout=API_TIMEOUT)
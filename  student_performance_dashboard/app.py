@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+from api_client import api_post
 from pages.dashboard import show_dashboard  # Import dashboard function
 
 # ✅ Set page config (hide Streamlit’s built-in navigation)
@@ -63,7 +64,7 @@ elif st.session_state["page"] == "register":
 
     if st.button("Register"):
         try:
-            response = requests.post(f"{API_BASE_URL}register/", json={
+            response = api_post(f"{API_BASE_URL}register/", {
                 "username": username,
                 "email": email,
                 "password": password,
@@ -85,7 +86,7 @@ elif st.session_state["page"] == "login":
 
     if st.button("Login"):
         try:
-            response = requests.post(f"{API_BASE_URL}login/", json={"email": email, "password": password})
+            response = api_post(f"{API_BASE_URL}login/", {"email": email, "password": password})
             if response.status_code == 200:
                 user_data = response.json()
                 st.session_state["auth_token"] = user_data["token"]
@@ -1,7 +1,114 @@
+import time
+import altair as alt
+import numpy as np
+import pandas as pd
 import streamlit as st
 import requests
 import json  # ✅ Ensure JSON formatting
 
+from api_client import api_post
+
+# ✅ Live mode waits until the inputs have not changed for this long before calling the API
+LIVE_DEBOUNCE_SECONDS = 0.08
+
+# ✅ Features the what-if sweep can vary: label and slider range
+SWEEP_RANGES = {
+    "Study_Hours_Per_Day": ("📚 Study Hours Per Day", 1, 10),
+    "Extracurricular_Hours_Per_Day": ("🎭 Extracurricular Hours Per Day", 0, 10),
+    "Sleep_Hours_Per_Day": ("😴 Sleep Hours Per Day", 0, 12),
+    "Social_Hours_Per_Day": ("🗣️ Social Hours Per Day", 0, 10),
+    "Physical_Activity_Hours_Per_Day": ("🏃 Physical Activity Hours Per Day", 0, 10),
+    "StudyHoursPerWeek": ("📖 Study Hours Per Week", 0, 50),
+    "AttendanceRate": ("📅 Attendance Rate (%)", 0, 100),
+}
+
+
+@st.cache_data(ttl=600, max_entries=5000, show_spinner=False)
+def predict_live(api_predict_url, inputs, _username):
+    """Predicted GPA for one input tuple, without saving it.
+
+    Memoized on ``inputs`` (shared by all users; the username only satisfies
+    the API), so returning to a slider position is answered instantly.
+    Failed requests raise and are therefore not cached.
+    """
+    response = api_post(api_predict_url, dict(inputs, username=_username, persist=False))
+    response.raise_for_status()
+    return response.json()["GPA"]
+
+
+@st.cache_data(ttl=600, max_entries=500, show_spinner=False)
+def fetch_sweep(api_sweep_url, inputs, features):
+    """GPA over every slider position of ``features`` in one API call."""
+    sweep = [
+        {"feature": feature, "start": SWEEP_RANGES[feature][1], "stop": SWEEP_RANGES[feature][2],
+         "steps": SWEEP_RANGES[feature][2] - SWEEP_RANGES[feature][1] + 1}
+        for feature in features
+    ]
+    response = api_post(api_sweep_url, {"profile": dict(inputs), "sweep": sweep})
+    response.raise_for_status()
+    return response.json()
+
+
+@st.fragment(run_every=LIVE_DEBOUNCE_SECONDS)
+def show_live_prediction(api_predict_url, inputs):
+    """Live GPA for ``inputs``, once they have settled.
+
+    While a slider is moving every new value resets the timestamp of the
+    last change and the API is not called; the fragment re-runs itself
+    every ``LIVE_DEBOUNCE_SECONDS`` and predicts once the inputs are older
+    than that. Repeated inputs are answered by ``predict_live``'s cache.
+    """
+    now = time.monotonic()
+    if st.session_state.get("live_inputs") != inputs:
+        st.session_state["live_inputs"] = inputs
+        st.session_state["live_inputs_changed_at"] = now
+
+    if now - st.session_state["live_inputs_changed_at"] < LIVE_DEBOUNCE_SECONDS:
+        st.caption("⏳ Predicting...")
+        return
+
+    try:
+        live_gpa = predict_live(api_predict_url, inputs, st.session_state['username'])
+        st.metric("⚡ Live Predicted GPA", round(live_gpa, 2))
+    except requests.exceptions.RequestException as e:
+        st.error(f"🚨 Live prediction failed: {e}")
+
+
+def show_what_if(api_sweep_url, inputs):
+    """Curve (one feature) or heatmap (two features) of GPA around the current inputs."""
+    features = st.multiselect(
+        "Vary up to two factors", list(SWEEP_RANGES), default=["Sleep_Hours_Per_Day"],
+        max_selections=2, format_func=lambda feature: SWEEP_RANGES[feature][0],
+    )
+    if not features:
+        return
+
+    try:
+        result = fetch_sweep(api_sweep_url, inputs, tuple(features))
+    except requests.exceptions.RequestException as e:
+        st.error(f"🚨 What-if request failed: {e}")
+        return
+
+    st.caption(f"Your current inputs predict **{round(result['baseline_GPA'], 2)}**.")
+    if len(features) == 1:
+        feature = features[0]
+        curve = pd.DataFrame({SWEEP_RANGES[feature][0]: result["axes"][feature], "Predicted GPA": result["GPA"]})
+        st.line_chart(curve.set_index(SWEEP_RANGES[feature][0]))
+        return
+
+    x_feature, y_feature = features
+    x_grid, y_grid = np.meshgrid(result["axes"][x_feature], result["axes"][y_feature], indexing="ij")
+    grid = pd.DataFrame({x_feature: x_grid.ravel(), y_feature: y_grid.ravel(),
+                         "GPA": np.asarray(result["GPA"]).ravel()})
+    heatmap = alt.Chart(grid).mark_rect().encode(
+        x=alt.X(f"{x_feature}:O", title=SWEEP_RANGES[x_feature][0]),
+        y=alt.Y(f"{y_feature}:O", title=SWEEP_RANGES[y_feature][0], sort="descending"),
+        color=alt.Color("GPA:Q", title="Predicted GPA", scale=alt.Scale(scheme="viridis")),
+        tooltip=[x_feature, y_feature, alt.Tooltip("GPA:Q", format=".2f")],
+    )
+    st.altair_chart(heatmap, use_container_width=True)
+
+
 def show_dashboard(api_predict_url):
     # Check if the user is logged in
     if 'username' not in st.session_state:
@@ -13,6 +120,7 @@ def show_dashboard(api_predict_url):
 
     # 📌 Prediction Form
     st.header("📊 Predict Your Next GPA")
+    live_mode = st.toggle("⚡ Live prediction", help="Update the prediction as you move the sliders (not saved)")
 
     # ✅ Lifestyle Factors
     study_hours = st.slider("📚 Study Hours Per Day", 1, 10, 3)
@@ -36,30 +144,32 @@ def show_dashboard(api_predict_url):
     part_time_job = st.selectbox("💼 Part-Time Job", ["Yes", "No"])
     extracurricular_activity = st.selectbox("🎾 Extracurricular Activities", ["Yes", "No"])
 
-    if st.button("🎯 Predict GPA"):
-        # ✅ Prepare the data to send to the API
-        data = {
-            "username": st.session_state['username'],
-            "Study_Hours_Per_Day": study_hours,
-            "Extracurricular_Hours_Per_Day": extracurricular_hours,
-            "Sleep_Hours_Per_Day": sleep_hours,
-            "Social_Hours_Per_Day": social_hours,
-            "Physical_Activity_Hours_Per_Day": physical_activity_hours,
-            "Stress_Level": stress_level,
-            "StudyHoursPerWeek": study_hours_per_week,
-            "AttendanceRate": attendance_rate,
-            "Gender": gender,
-            "Major": major,
-            "PartTimeJob": part_time_job,
-            "ExtraCurricularActivities": extracurricular_activity
-        }
+    # ✅ Prepare the data to send to the API
+    data = {
+        "username": st.session_state['username'],
+        "Study_Hours_Per_Day": study_hours,
+        "Extracurricular_Hours_Per_Day": extracurricular_hours,
+        "Sleep_Hours_Per_Day": sleep_hours,
+        "Social_Hours_Per_Day": social_hours,
+        "Physical_Activity_Hours_Per_Day": physical_activity_hours,
+        "Stress_Level": stress_level,
+        "StudyHoursPerWeek": study_hours_per_week,
+        "AttendanceRate": attendance_rate,
+        "Gender": gender,
+        "Major": major,
+        "PartTimeJob": part_time_job,
+        "ExtraCurricularActivities": extracurricular_activity
+    }
 
-        try:
-            # ✅ Convert to JSON format
-            json_data = json.dumps(data)  # Convert dict to JSON string
+    inputs = tuple(sorted((key, value) for key, value in data.items() if key != "username"))
+
+    if live_mode:
+        show_live_prediction(api_predict_url, inputs)
 
-            # ✅ Make the API request
-            response = requests.post(api_predict_url, data=json_data, headers={'Content-Type': 'application/json'})
+    if st.button("🎯 Predict GPA"):
+        try:
+            # ✅ Make the API request (pooled keep-alive connection)
+            response = api_post(api_predict_url, data)
             response_data = response.json()
 
             # ✅ Handle response
@@ -76,3 +186,7 @@ def show_dashboard(api_predict_url):
             st.error(f"🚨 API request failed: {e}")
         except json.JSONDecodeError as e:
             st.error(f"🚨 JSON Parse Error: {e}")
+
+    # 🔍 What-if analysis: the whole curve / grid comes back from one request
+    with st.expander("🔍 What if I changed...?"):
+        show_what_if(f"{api_predict_url.rstrip('/')}/sweep/", inputs)
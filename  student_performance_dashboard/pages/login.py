@@ -1,5 +1,5 @@
 import streamlit as st
-import requests
+from api_client import api_post
 
 st.set_page_config(page_title="Login", layout="wide")
 
@@ -12,7 +12,7 @@ password = st.text_input("Password", type="password")
 
 # Login Function
 def login_user(email, password):
-    response = requests.post(API_LOGIN_URL, json={"email": email, "password": password})
+    response = api_post(API_LOGIN_URL, {"email": email, "password": password})
     if response.status_code == 200:
         return response.json()  # Returns {'token': '...', 'username': '...'}
     return None
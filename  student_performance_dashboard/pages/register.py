@@ -1,5 +1,5 @@
 import streamlit as st
-import requests
+from api_client import api_post
 
 st.set_page_config(page_title="Register", layout="wide")
 
@@ -14,7 +14,7 @@ role = st.selectbox("Role", ["student", "professor"])
 
 # Registration Function
 def register_user(username, email, password, role):
-    response = requests.post(API_REGISTER_URL, json={
+    response = api_post(API_REGISTER_URL, {
         "username": username,
         "email": email,
         "password": password,
@@ -0,0 +1,230 @@
+import logging
+import random
+
+from django.conf import settings
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models import Count, F, Max, Min, Q, Sum
+from django.db.models.functions import Greatest, Least
+
+from predictor.models import PredictionAggregate, StudentPerformance
+
+logger = logging.getLogger(__name__)
+
+# ✅ Groups kept up to date; OVERALL covers every prediction
+AGGREGATE_DIMENSIONS = ["Major", "Gender", "Stress_Level"]
+OVERALL = "all"
+# ✅ Rows each group is striped over; concurrent inserts pick a stripe at random
+DEFAULT_AGGREGATE_SHARDS = 8
+
+
+def _group_keys(instance):
+    yield OVERALL, ""
+    for dimension in AGGREGATE_DIMENSIONS:
+        # ✅ Prepare like the INSERT does, so 1.0 / "1" / 1 land in the same group as a rebuild
+        value = StudentPerformance._meta.get_field(dimension).get_prep_value(getattr(instance, dimension))
+        yield dimension, "" if value is None else str(value)
+
+
+def aggregate_deltas(instances):
+    """Per-group (count, sum, sum of squares, min, max) of the GPAs in ``instances``."""
+    deltas = {}
+    for instance in instances:
+        if instance.GPA is None:
+            continue
+        gpa = float(instance.GPA)
+        for key in _group_keys(instance):
+            delta = deltas.get(key)
+            if delta is None:
+                deltas[key] = [1, gpa, gpa * gpa, gpa, gpa]
+            else:
+                delta[0] += 1
+                delta[1] += gpa
+                delta[2] += gpa * gpa
+                delta[3] = min(delta[3], gpa)
+                delta[4] = max(delta[4], gpa)
+    return deltas
+
+
+def record_predictions(instances):
+    """Fold newly saved predictions into the running aggregates.
+
+    Call this inside the transaction that inserts ``instances`` so the
+    aggregates commit or roll back with them. Each affected group costs
+    one atomic ``UPDATE ... SET count = count + n`` on one of its
+    ``PREDICTOR_AGGREGATE_SHARDS`` stripes, so concurrent writers (the
+    overall group is in every write) mostly lock different rows. Groups are
+    updated in sorted order so writers sharing a stripe cannot deadlock.
+    """
+    deltas = aggregate_deltas(instances)
+    shard = random.randrange(max(int(getattr(settings, "PREDICTOR_AGGREGATE_SHARDS", DEFAULT_AGGREGATE_SHARDS)), 1))
+    for (dimension, value), delta in sorted(deltas.items()):
+        group = PredictionAggregate.objects.filter(dimension=dimension, value=value, shard=shard)
+        if _increment(group, delta):
+            continue
+
+        # ✅ First prediction in this group; another writer may create it first
+        count, total, total_squares, minimum, maximum = delta
+        try:
+            with transaction.atomic():
+                PredictionAggregate.objects.create(
+                    dimension=dimension, value=value, shard=shard, count=count, total=total,
+                    total_squares=total_squares, minimum=minimum, maximum=maximum,
+                )
+        except IntegrityError:
+            _increment(group, delta)
+
+
+def _increment(group, delta):
+    count, total, total_squares, minimum, maximum = delta
+    return group.update(
+        count=F("count") + count,
+        total=F("total") + total,
+        total_squares=F("total_squares") + total_squares,
+        minimum=Least("minimum", minimum),
+        maximum=Greatest("maximum", maximum),
+    )
+
+
+def save_predictions(instances, batch_size=None):
+    """Insert predictions and update the aggregates in one transaction.
+
+    Once it commits the predictions are pushed to the live dashboards.
+    """
+    # ✅ Import inside function to prevent circular imports
+    from predictor.live import publish_predictions
+
+    with transaction.atomic():
+        if len(instances) == 1:
+            instances[0].save()
+        else:
+            StudentPerformance.objects.bulk_create(instances, batch_size=batch_size)
+        record_predictions(instances)
+        transaction.on_commit(lambda: publish_predictions(instances))
+    return instances
+
+
+def _group_predictions(dimension, value):
+    """Saved predictions counted in the ``(dimension, value)`` aggregate."""
+    predictions = StudentPerformance.objects.exclude(GPA=None)
+    if dimension == OVERALL:
+        return predictions
+    if value != "":
+        return predictions.filter(**{dimension: value})
+    empty = Q(**{f"{dimension}__isnull": True})
+    if isinstance(StudentPerformance._meta.get_field(dimension), models.CharField):
+        empty |= Q(**{dimension: ""})
+    return predictions.filter(empty)
+
+
+def delete_predictions(queryset):
+    """Delete the predictions in ``queryset`` and take them out of the aggregates.
+
+    Counts and sums are decremented in the same transaction, like
+    :func:`record_predictions` increments them. A minimum or maximum cannot
+    be undone that way, so those are re-read from the rows left in each
+    touched group and written to all of its stripes; groups left empty are
+    removed. Returns the number of predictions deleted.
+    """
+    with transaction.atomic():
+        instances = list(queryset.select_for_update().only("id", "GPA", *AGGREGATE_DIMENSIONS))
+        deleted, _ = StudentPerformance.objects.filter(pk__in=[instance.pk for instance in instances]).delete()
+
+        for (dimension, value), delta in sorted(aggregate_deltas(instances).items()):
+            count, total, total_squares, _, _ = delta
+            group = PredictionAggregate.objects.filter(dimension=dimension, value=value)
+            extremes = _group_predictions(dimension, value).aggregate(minimum=Min("GPA"), maximum=Max("GPA"))
+            if extremes["minimum"] is None:
+                group.delete()
+                continue
+            # ✅ Stripes are only ever read summed, so one of them takes the whole decrement
+            stripe = group.order_by("shard").values_list("pk", flat=True).first()
+            PredictionAggregate.objects.filter(pk=stripe).update(
+                count=F("count") - count,
+                total=F("total") - total,
+                total_squares=F("total_squares") - total_squares,
+            )
+            group.update(**extremes)
+    return deleted
+
+
+def rebuild_aggregates():
+    """Recompute every aggregate from ``StudentPerformance`` in the database.
+
+    The grouping runs as SQL ``GROUP BY`` queries, so no rows are loaded
+    into Python. On PostgreSQL inserts are blocked until the rebuild
+    commits so no prediction is missed or counted twice. Each group is
+    collapsed into a single stripe. Returns the number of aggregate rows
+    written.
+    """
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            table = connection.ops.quote_name(StudentPerformance._meta.db_table)
+            with connection.cursor() as cursor:
+                cursor.execute(f"LOCK TABLE {table} IN SHARE MODE")
+
+        PredictionAggregate.objects.all().delete()
+        predictions = StudentPerformance.objects.exclude(GPA=None)
+        statistics = {
+            "count": Count("id"),
+            "total": Sum("GPA"),
+            "total_squares": Sum(F("GPA") * F("GPA")),
+            "minimum": Min("GPA"),
+            "maximum": Max("GPA"),
+        }
+
+        rows = []
+        overall = predictions.aggregate(**statistics)
+        if overall["count"]:
+            rows.append(PredictionAggregate(dimension=OVERALL, value="", **overall))
+        for dimension in AGGREGATE_DIMENSIONS:
+            for group in predictions.values(dimension).annotate(**statistics).order_by():
+                value = group.pop(dimension)
+                rows.append(PredictionAggregate(
+                    dimension=dimension, value="" if value is None else str(value), **group
+                ))
+        PredictionAggregate.objects.bulk_create(rows)
+
+    logger.info(f"✅ Rebuilt {len(rows)} prediction aggregates")
+    return len(rows)
+
+
+def group_aggregates(dimension=None):
+    """One unsaved :class:`PredictionAggregate` per group, its stripes summed in SQL."""
+    stripes = PredictionAggregate.objects.all()
+    if dimension is not None:
+        stripes = stripes.filter(dimension=dimension)
+    groups = stripes.values("dimension", "value").annotate(
+        group_count=Sum("count"),
+        group_total=Sum("total"),
+        group_total_squares=Sum("total_squares"),
+        group_minimum=Min("minimum"),
+        group_maximum=Max("maximum"),
+    ).order_by("dimension", "value")
+    return [
+        PredictionAggregate(
+            dimension=group["dimension"], value=group["value"], count=group["group_count"],
+            total=group["group_total"], total_squares=group["group_total_squares"],
+            minimum=group["group_minimum"], maximum=group["group_maximum"],
+        )
+        for group in groups
+    ]
+
+
+def analytics_summary(dimension=None):
+    """GPA statistics per group, read from the aggregates table only.
+
+    Returns ``{dimension: [{"value", "count", "mean", "std", "min", "max"}]}``;
+    the cost depends on the number of groups (and stripes), not on the
+    number of predictions.
+    """
+    summary = {}
+    for aggregate in group_aggregates(dimension):
+        summary.setdefault(aggregate.dimension, []).append({
+            "value": aggregate.value,
+            "count": aggregate.count,
+            "mean": round(aggregate.mean, 4) if aggregate.count else None,
+            "std": round(aggregate.std, 4) if aggregate.count else None,
+            "min": aggregate.minimum,
+            "max": aggregate.maximum,
+        })
+    return summary
@@ -9,22 +9,20 @@ class PredictorConfig(AppConfig):
     name = 'predictor'
 
     def ready(self):
-        """Train & save model on Django startup if needed."""
-        try:
-            # ✅ Import inside function to prevent circular imports
-            from .ml_model import train_lifestyle_model, train_performance_model
+        """Warn on startup when no trained model bundle exists.
 
-            # ✅ Define Paths
-            MODEL_PATH_LIFESTYLE = os.path.join(os.path.dirname(__file__), "student_lifestyle_model.pkl")
-            MODEL_PATH_PERFORMANCE = os.path.join(os.path.dirname(__file__), "student_performance_model.pkl")
+        Training never runs here: every gunicorn worker and manage.py command
+        goes through ready(). Use ``manage.py train_models`` or the
+        ``train_models_task`` Celery task instead.
+        """
+        # ✅ Import inside function to prevent circular imports
+        from .ml_model import model_bundle_path
 
-            # ✅ Train models only if missing
-            if not os.path.exists(MODEL_PATH_LIFESTYLE) or not os.path.exists(MODEL_PATH_PERFORMANCE):
-                logger.info("🚀 No trained models found! Training new models...")
-                train_lifestyle_model()
-                train_performance_model()
-            else:
-                logger.info("✅ Models are already trained. Skipping training.")
+        from .metrics import register_collector
+        from .shadow import shadow_samples
+        from users.authentication import token_cache_samples
+        register_collector(shadow_samples)
+        register_collector(token_cache_samples)
 
-        except Exception as e:
-            logger.error(f"❌ Model training error: {str(e)}")
+        if not os.path.exists(model_bundle_path()):
+            logger.warning("⚠️ No trained model bundle found! Run `python manage.py train_models`.")
@@ -0,0 +1,98 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+
+from predictor.cache import cached_predict_gpa
+from predictor.metrics import record_error, timed
+from predictor.models import StudentPerformance
+from predictor.registry import get_model_registry
+from predictor.shadow import shadow_predictions
+from predictor.validation import clean_prediction_record, split_prediction_record
+from predictor.writebehind import save_prediction, write_behind_enabled
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_inference_executor():
+    """Bounded thread pool that runs model scoring off the event loop."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, "PREDICTOR_ASYNC_MAX_WORKERS", 4),
+                    thread_name_prefix="predictor-inference",
+                )
+    return _executor
+
+
+def _predict(lifestyle_data, performance_data):
+    # ✅ Registry loads/reloads read from disk, so they also stay off the loop
+    with timed("model_load"):
+        artifacts = get_model_registry().current()
+    start = time.perf_counter()
+    predicted_gpa = cached_predict_gpa(lifestyle_data, performance_data, artifacts=artifacts)
+    shadow_predictions([lifestyle_data], [performance_data], [predicted_gpa], artifacts, time.perf_counter() - start)
+    return artifacts, predicted_gpa
+
+
+async def predict_async(request):
+    """Async counterpart of ``PredictStudentPerformance`` for ASGI servers.
+
+    Scoring runs on a bounded thread pool and the row is saved (or queued
+    in write-behind mode) through ``sync_to_async``, so a slow insert never
+    blocks the event loop. Serve with
+    ``uvicorn student_performance1.asgi:application``.
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": f"Method {request.method} not allowed"}, status=405)
+
+    try:
+        with timed("parsing"):
+            data = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({"error": "Request body must be JSON"}, status=400)
+
+    with timed("validation"):
+        cleaned, error = clean_prediction_record(data)
+    if error:
+        record_error("validation", "InvalidRecord")
+        return JsonResponse({"error": error}, status=400)
+    lifestyle_data, performance_data = split_prediction_record(cleaned)
+
+    try:
+        loop = asyncio.get_running_loop()
+        artifacts, predicted_gpa = await loop.run_in_executor(
+            get_inference_executor(), _predict, lifestyle_data, performance_data
+        )
+
+        # ✅ Save Prediction to Database without blocking the event loop
+        instance = StudentPerformance(GPA=predicted_gpa, **cleaned)
+        with timed("db_insert"):
+            if write_behind_enabled():
+                await sync_to_async(save_prediction, thread_sensitive=False)(instance)
+            else:
+                # ✅ Not ``asave``: the row & its aggregates update share one transaction,
+                #    which Django 4.2's async ORM cannot open
+                await sync_to_async(save_prediction)(instance)
+    except Exception as e:
+        logger.error(f"❌ Async API Error: {str(e)}")
+        return JsonResponse({"error": str(e)}, status=400)
+
+    with timed("serialization"):
+        return JsonResponse({"GPA": round(predicted_gpa, 2), "model_version": artifacts.version})
+
+
+# ✅ JSON API like the DRF views; set directly because Django 4.2's
+#    csrf_exempt decorator would wrap the coroutine in a sync function.
+predict_async.csrf_exempt = True
@@ -0,0 +1,194 @@
+import platform
+import statistics
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import sklearn
+from rest_framework.renderers import JSONRenderer
+
+from predictor import ml_model
+from predictor.registry import get_model_registry
+from predictor.renderers import ArrowIPCRenderer, Columns, MessagePackRenderer, ORJSONRenderer
+from predictor.validation import LIFESTYLE_FIELDS, PERFORMANCE_FIELDS
+
+DEFAULT_SIZES = [1, 100, 10_000, 1_000_000]
+# ✅ Response rendering is only benchmarked up to this many rows (a 1M-row JSON body is ~300 MB)
+MAX_RENDER_ROWS = 100_000
+MAJORS = ["Arts", "Business", "Education", "Engineering", "Science"]
+
+
+def make_records(rows, seed=0, pool_size=1000):
+    """``rows`` (lifestyle, performance) dict pairs like the API receives.
+
+    Records are drawn from a pool of ``pool_size`` distinct profiles so the
+    1M-row case does not spend a gigabyte on identical dicts.
+    """
+    rng = np.random.default_rng(seed)
+    pool = []
+    for _ in range(min(rows, pool_size)):
+        lifestyle = {
+            "Study_Hours_Per_Day": float(rng.integers(1, 11)),
+            "Extracurricular_Hours_Per_Day": float(rng.integers(0, 11)),
+            "Sleep_Hours_Per_Day": float(rng.integers(0, 13)),
+            "Social_Hours_Per_Day": float(rng.integers(0, 11)),
+            "Physical_Activity_Hours_Per_Day": float(rng.integers(0, 11)),
+            "Stress_Level": int(rng.integers(0, 3)),
+        }
+        performance = {
+            "StudyHoursPerWeek": float(rng.integers(0, 51)),
+            "AttendanceRate": float(rng.uniform(0, 100)),
+            "Gender": str(rng.choice(["Male", "Female"])),
+            "Major": str(rng.choice(MAJORS)),
+            "PartTimeJob": str(rng.choice(["Yes", "No"])),
+            "ExtraCurricularActivities": str(rng.choice(["Yes", "No"])),
+        }
+        pool.append((lifestyle, performance))
+    picks = rng.integers(0, len(pool), rows)
+    return [pool[i][0] for i in picks], [pool[i][1] for i in picks]
+
+
+def time_call(func, min_time=0.2, max_repeats=1000):
+    """Run ``func`` until ``min_time`` seconds have passed; return timings."""
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < max_repeats:
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+        if time.perf_counter() - started >= min_time:
+            break
+    return timings
+
+
+def make_history_rows(lifestyle_rows, performance_rows):
+    """History-like ``(names, row tuples, records)`` for the given profiles.
+
+    Records look like ``StudentPerformanceSerializer`` output; each
+    distinct profile is built once and shared, like in :func:`make_records`.
+    """
+    names = ["id", "username", *LIFESTYLE_FIELDS, *PERFORMANCE_FIELDS, "GPA", "created_at"]
+    created_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    pool = {}
+    tuples = []
+    for lifestyle, performance in zip(lifestyle_rows, performance_rows):
+        row = pool.get(id(lifestyle))
+        if row is None:
+            row = pool[id(lifestyle)] = (
+                len(pool) + 1, f"student{len(pool)}", *lifestyle.values(), *performance.values(),
+                round(2.0 + len(pool) % 200 / 100, 2), created_at,
+            )
+        tuples.append(row)
+    records = {}
+    for row in pool.values():
+        record = dict(zip(names, row))
+        record["created_at"] = created_at.isoformat().replace("+00:00", "Z")
+        records[row[0]] = record
+    return names, tuples, [records[row[0]] for row in tuples]
+
+
+def stage_functions(rows, artifacts):
+    """Build the ``{stage: callable}`` map for one batch size."""
+    lifestyle_rows, performance_rows = make_records(rows)
+    lifestyle_df = pd.DataFrame(lifestyle_rows, columns=LIFESTYLE_FIELDS)
+    performance_df = pd.DataFrame(performance_rows, columns=PERFORMANCE_FIELDS)
+
+    encoded = artifacts.feature_schema.encode(performance_rows)
+    lifestyle_scaled = artifacts.lifestyle_scaler.transform(lifestyle_df)
+    performance_scaled = artifacts.performance_scaler.transform(encoded)
+
+    stages = {
+        "dataframe_construction": lambda: (
+            pd.DataFrame(lifestyle_rows, columns=LIFESTYLE_FIELDS),
+            pd.DataFrame(performance_rows, columns=PERFORMANCE_FIELDS),
+        ),
+        "encode_categorical_features": lambda: ml_model.encode_categorical_features(performance_df.copy()),
+        "feature_schema_encode": lambda: artifacts.feature_schema.encode(performance_rows),
+        "scaler_transform": lambda: (
+            artifacts.lifestyle_scaler.transform(lifestyle_df),
+            artifacts.performance_scaler.transform(encoded),
+        ),
+        "model_predict": lambda: (
+            artifacts.lifestyle_model.predict(lifestyle_scaled),
+            artifacts.performance_model.predict(performance_scaled),
+        ),
+        "pipeline_batch": lambda: ml_model.predict_student_performance_batch(
+            lifestyle_rows, performance_rows, artifacts=artifacts
+        ),
+        "compiled_batch": lambda: artifacts.compiled.predict_batch(lifestyle_rows, performance_rows),
+    }
+    if rows <= MAX_RENDER_ROWS:
+        # ✅ Each returns the response body, so the benchmark also reports its size
+        names, tuples, records = make_history_rows(lifestyle_rows, performance_rows)
+        stages["render_drf_json"] = lambda: JSONRenderer().render({"results": records})
+        stages["render_orjson"] = lambda: ORJSONRenderer().render({"results": records})
+        stages["render_arrow"] = lambda: ArrowIPCRenderer().render({"results": Columns.from_rows(names, tuples)})
+        stages["render_msgpack"] = lambda: MessagePackRenderer().render({"results": Columns.from_rows(names, tuples)})
+    if rows == 1:
+        stages["predict_student_performance"] = lambda: ml_model.predict_student_performance(
+            lifestyle_rows[0], performance_rows[0], artifacts=artifacts
+        )
+        stages["compiled_single"] = lambda: artifacts.compiled.predict(lifestyle_rows[0], performance_rows[0])
+    return stages
+
+
+def run_benchmarks(sizes=None, stages=None, min_time=0.2, max_repeats=1000, artifacts=None, log=None):
+    """Time every hot-path stage for each batch size.
+
+    Returns a JSON-serialisable dict with environment metadata and one
+    result per (stage, rows) pair.
+    """
+    sizes = sizes or DEFAULT_SIZES
+    if artifacts is None:
+        artifacts = get_model_registry().current()
+
+    results = []
+    for rows in sizes:
+        for stage, func in stage_functions(rows, artifacts).items():
+            if stages and stage not in stages:
+                continue
+            output = func()  # ✅ warm-up
+            timings = time_call(func, min_time=min_time, max_repeats=max_repeats)
+            median = statistics.median(timings)
+            result = {
+                "stage": stage,
+                "rows": rows,
+                "repeats": len(timings),
+                "min_s": min(timings),
+                "median_s": median,
+                "per_row_us": median / rows * 1e6,
+            }
+            if isinstance(output, bytes):
+                result["bytes"] = len(output)
+            results.append(result)
+            if log:
+                log(result)
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "sklearn": sklearn.__version__,
+            "model_version": artifacts.version,
+        },
+        "results": results,
+    }
+
+
+def find_regressions(current, baseline, threshold):
+    """Results whose median got slower than ``baseline`` by more than ``threshold``.
+
+    ``threshold`` is relative (0.2 = 20% slower). Stages missing from either
+    run are ignored.
+    """
+    baseline_medians = {(r["stage"], r["rows"]): r["median_s"] for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        reference = baseline_medians.get((result["stage"], result["rows"]))
+        if reference and result["median_s"] > reference * (1 + threshold):
+            regressions.append(dict(result, baseline_median_s=reference,
+                                    slowdown=result["median_s"] / reference - 1))
+    return regressions
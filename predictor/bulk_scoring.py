@@ -0,0 +1,158 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from django.conf import settings
+
+from predictor import ml_model
+from predictor.features import UnknownCategoryError
+from predictor.registry import get_model_registry
+from predictor.renderers import ARROW_STREAM_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, ArrowStreamWriter, Columns, msgpack_dumps
+from predictor.validation import FLOAT_FIELDS, LIFESTYLE_FIELDS, PERFORMANCE_FIELDS
+
+# ✅ Output format -> content type of the streamed response
+OUTPUT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "arrow": ARROW_STREAM_MEDIA_TYPE,
+    "msgpack": MSGPACK_MEDIA_TYPE,
+}
+# ✅ Formats rendered as bytes rather than text
+BINARY_OUTPUT_FORMATS = {"arrow", "msgpack"}
+
+# ✅ Identifier columns copied through to the output when present
+ID_COLUMNS = ["username", "Student_ID", "StudentID"]
+
+INPUT_COLUMNS = LIFESTYLE_FIELDS + PERFORMANCE_FIELDS
+
+
+def default_chunk_size():
+    return getattr(settings, "PREDICTOR_CSV_CHUNK_SIZE", 5000)
+
+
+def read_csv_chunks(source, chunk_size=None):
+    """Iterate over the raw input chunks of a scoring CSV.
+
+    The header and first chunk are read eagerly, so an unreadable file or
+    missing input columns raise ``ValueError`` here.
+    """
+    chunk_size = int(chunk_size or default_chunk_size())
+    if chunk_size <= 0:
+        raise ValueError("❌ Chunk size must be positive")
+
+    try:
+        reader = pd.read_csv(source, chunksize=chunk_size)
+        first_chunk = next(reader, None)
+    except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError) as e:
+        raise ValueError(f"❌ Could not parse CSV: {str(e)}")
+    if first_chunk is None:
+        raise ValueError("❌ CSV file has no rows")
+
+    missing_columns = [column for column in INPUT_COLUMNS if column not in first_chunk.columns]
+    if missing_columns:
+        raise ValueError(f"❌ Missing columns: {', '.join(missing_columns)}")
+
+    return itertools.chain([first_chunk], reader)
+
+
+def score_csv(source, chunk_size=None, artifacts=None):
+    """Score a CSV file chunk by chunk.
+
+    ``source`` is a path or binary/text file object with the columns of
+    ``student_lifestyle_dataset.csv`` and ``student_performance_data.csv``
+    side by side. Only one chunk of ``chunk_size`` rows is in memory at a
+    time. The header and first chunk are read eagerly so a malformed file
+    raises ``ValueError`` here rather than halfway through a response.
+
+    Returns an iterator of DataFrames with the id columns, ``GPA`` and
+    ``error`` for every input row.
+    """
+    chunks = read_csv_chunks(source, chunk_size=chunk_size)
+
+    # ✅ Pin one model snapshot for the whole file
+    if artifacts is None:
+        artifacts = get_model_registry().current()
+
+    return _score_chunks(chunks, artifacts)
+
+
+def _score_chunks(chunks, artifacts):
+    row_offset = 0
+    for chunk in chunks:
+        yield score_chunk(chunk, artifacts, row_offset=row_offset)
+        row_offset += len(chunk)
+
+
+def score_chunk(chunk, artifacts, row_offset=0):
+    """Score one raw input chunk whose first row is row ``row_offset + 1`` of the file."""
+    chunk.index = pd.RangeIndex(row_offset + 1, row_offset + 1 + len(chunk), name="row")
+    raw_stress_levels = chunk["Stress_Level"]
+
+    # ✅ Rows with non-numeric or empty inputs are reported, not scored
+    for column in FLOAT_FIELDS + ["Stress_Level"]:
+        chunk[column] = pd.to_numeric(chunk[column], errors="coerce")
+    valid = chunk[INPUT_COLUMNS].notna().all(axis=1).to_numpy()
+    errors = np.where(valid, None, "Missing or invalid input values").astype(object)
+
+    # ✅ Same rule as clean_prediction_record: Stress_Level must be a whole number
+    fractional = valid & (chunk["Stress_Level"] % 1 != 0).to_numpy()
+    errors[fractional] = [f"Invalid integer for Stress_Level: {value!r}" for value in raw_stress_levels[fractional]]
+    valid &= ~fractional
+
+    gpa = np.full(len(chunk), np.nan)
+    if valid.any():
+        try:
+            gpa[valid] = _predict_rows(chunk.loc[valid], artifacts)
+        except UnknownCategoryError:
+            # ✅ "error" policy: report the rows with unseen categories and score the rest
+            for column, categories in artifacts.feature_schema.vocabularies.items():
+                unseen = valid & ~chunk[column].isin(categories).to_numpy()
+                errors[unseen] = [f"Unknown {column}: {value}" for value in chunk[column][unseen]]
+                valid &= ~unseen
+            if valid.any():
+                gpa[valid] = _predict_rows(chunk.loc[valid], artifacts)
+
+    scored = chunk[[column for column in ID_COLUMNS if column in chunk.columns]].copy()
+    scored["GPA"] = np.round(gpa, 2)
+    scored["error"] = errors
+    return scored
+
+
+def _predict_rows(rows, artifacts):
+    return ml_model.predict_gpa_batch(rows[LIFESTYLE_FIELDS], rows[PERFORMANCE_FIELDS], artifacts=artifacts)
+
+
+def _arrow_chunk(chunk):
+    table = pa.Table.from_pandas(chunk.reset_index(), preserve_index=False)
+    # ✅ A chunk without errors infers a null column; every chunk must share one schema
+    return table.set_column(table.schema.get_field_index("error"), "error", table["error"].cast(pa.string()))
+
+
+def render_chunks(chunks, output_format="csv"):
+    """Serialise scored chunks to ``output_format``, one piece per chunk.
+
+    CSV & NDJSON yield text. Arrow yields one IPC stream (a record batch
+    per chunk) and MessagePack one ``{column: [values]}`` map per chunk,
+    both as bytes.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"❌ Unknown output format: {output_format}")
+
+    if output_format == "arrow":
+        writer = ArrowStreamWriter()
+        for chunk in chunks:
+            yield writer.write(_arrow_chunk(chunk))
+        yield writer.close()
+        return
+
+    for index, chunk in enumerate(chunks):
+        if output_format == "csv":
+            yield chunk.to_csv(header=index == 0)
+        elif output_format == "msgpack":
+            yield msgpack_dumps(Columns({
+                chunk.index.name: chunk.index.to_numpy(),
+                **{column: chunk[column].to_numpy() for column in chunk.columns},
+            }))
+        else:
+            yield chunk.reset_index().to_json(orient="records", lines=True) + "\n"
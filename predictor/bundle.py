@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import struct
+import tempfile
+
+import numpy as np
+
+# ✅ File layout:
+#    MAGIC | u32 format version | u64 header length | JSON header | arrays
+#    Every array is raw little-endian float64, aligned to ALIGNMENT bytes, and
+#    described in the header by offset/shape so it can be memory-mapped.
+MAGIC = b"SPMODEL\0"
+BUNDLE_FORMAT_VERSION = 1
+ALIGNMENT = 64
+_PREFIX = struct.Struct("<8sIQ")
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class ArrayScaler:
+    """``StandardScaler.transform`` backed by (memory-mapped) arrays."""
+
+    with_mean = True
+    with_std = True
+
+    def __init__(self, mean, scale, feature_names=None):
+        self.mean_ = mean
+        self.scale_ = scale
+        self.feature_names_in_ = feature_names
+
+    def transform(self, X):
+        return (np.asarray(X, dtype=float) - self.mean_) / self.scale_
+
+
+class ArrayLinearModel:
+    """``LinearRegression.predict`` backed by (memory-mapped) arrays."""
+
+    def __init__(self, coef, intercept):
+        self.coef_ = coef
+        self.intercept_ = float(intercept)
+
+    def predict(self, X):
+        return np.asarray(X, dtype=float) @ self.coef_ + self.intercept_
+
+
+class ModelBundle:
+    """A loaded bundle: its JSON ``metadata`` and read-only ``arrays``.
+
+    The arrays are views into one read-only ``np.memmap`` of the file, so
+    every process mapping the same bundle shares the same page-cache pages.
+    """
+
+    def __init__(self, path, metadata, arrays):
+        self.path = path
+        self.metadata = metadata
+        self.arrays = arrays
+
+    @property
+    def version(self):
+        return self.metadata["version"]
+
+
+def write_model_bundle(path, arrays, metadata):
+    """Write ``arrays`` (name -> ndarray) and ``metadata`` as one bundle.
+
+    The model version is a hash of the arrays and metadata and is stored in
+    the header. The file is written next to ``path`` and renamed over it,
+    so processes that still map the previous bundle are never affected.
+    Returns the version.
+    """
+    arrays = {name: np.ascontiguousarray(value, dtype="<f8") for name, value in arrays.items()}
+
+    digest = hashlib.sha256(json.dumps(metadata, sort_keys=True).encode())
+    for name in sorted(arrays):
+        digest.update(name.encode())
+        digest.update(arrays[name].tobytes())
+    version = digest.hexdigest()[:12]
+
+    # ✅ Offsets are relative to the first aligned byte after the header
+    layout = {}
+    offset = 0
+    for name in sorted(arrays):
+        offset = _align(offset)
+        layout[name] = {"offset": offset, "shape": list(arrays[name].shape), "dtype": "<f8"}
+        offset += arrays[name].nbytes
+
+    header = dict(metadata, format=BUNDLE_FORMAT_VERSION, version=version, arrays=layout)
+    header_bytes = json.dumps(header, indent=1).encode()
+    data_start = _align(_PREFIX.size + len(header_bytes))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".bundle-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(_PREFIX.pack(MAGIC, BUNDLE_FORMAT_VERSION, len(header_bytes)))
+            fh.write(header_bytes)
+            for name in sorted(arrays):
+                fh.seek(data_start + layout[name]["offset"])
+                fh.write(arrays[name].tobytes())
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    return version
+
+
+def read_model_bundle(path):
+    """Memory-map a bundle written by :func:`write_model_bundle`."""
+    with open(path, "rb") as fh:
+        magic, format_version, header_length = _PREFIX.unpack(fh.read(_PREFIX.size))
+        if magic != MAGIC:
+            raise ValueError(f"❌ {path} is not a model bundle")
+        if format_version != BUNDLE_FORMAT_VERSION:
+            raise ValueError(f"❌ Unsupported model bundle format {format_version} in {path}")
+        metadata = json.loads(fh.read(header_length))
+
+    data_start = _align(_PREFIX.size + header_length)
+    mapped = np.memmap(path, dtype=np.uint8, mode="r")
+    arrays = {}
+    for name, spec in metadata["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"], dtype=np.int64))
+        start = data_start + spec["offset"]
+        arrays[name] = np.frombuffer(mapped, dtype=dtype, count=count, offset=start).reshape(spec["shape"])
+
+    return ModelBundle(path, metadata, arrays)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
@@ -0,0 +1,180 @@
+import hashlib
+import threading
+
+from cachetools import TTLCache
+from django.conf import settings
+from django.core.cache import caches
+
+from predictor import ml_model
+from predictor.ml_model import BINARY_COLUMNS, BINARY_MAPPING
+from predictor.registry import get_model_registry
+from predictor.validation import LIFESTYLE_FIELDS, PERFORMANCE_FIELDS
+
+DEFAULT_CACHE_CONFIG = {
+    "BACKEND": "inprocess",  # "inprocess", "django" or None to disable
+    "MAX_ENTRIES": 10000,
+    "TIMEOUT": 3600,
+    "CACHE_ALIAS": "default",
+}
+
+_MISSING = object()
+
+
+def normalize_profile(lifestyle_data, performance_data):
+    """Canonical copies of one input profile.
+
+    Numbers become floats (``3`` == ``3.0``), binary flags 1/0 whether they
+    arrived as ``Yes``/``No`` or already converted, and text fields are
+    stripped. The cache key and the prediction both use the result, so
+    requests sharing an entry are also scored identically.
+    """
+    lifestyle = {field: float(lifestyle_data[field]) for field in LIFESTYLE_FIELDS}
+    performance = {}
+    for field in PERFORMANCE_FIELDS:
+        value = performance_data[field]
+        if field in BINARY_COLUMNS:
+            value = BINARY_MAPPING.get(value, value)
+        elif isinstance(value, str):
+            value = value.strip()
+        else:
+            value = float(value)
+        performance[field] = value
+    return lifestyle, performance
+
+
+def canonical_features(lifestyle_data, performance_data):
+    """Hashable tuple identifying a :func:`normalize_profile`-d input profile."""
+    return (tuple(lifestyle_data[field] for field in LIFESTYLE_FIELDS)
+            + tuple(performance_data[field] for field in PERFORMANCE_FIELDS))
+
+
+class InProcessCacheBackend:
+    """Per-process LRU cache whose entries also expire after ``timeout`` seconds."""
+
+    name = "inprocess"
+
+    def __init__(self, max_entries, timeout):
+        self._cache = TTLCache(maxsize=max_entries, ttl=timeout)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            return self._cache.get(key, _MISSING)
+
+    def set(self, key, value):
+        with self._lock:
+            self._cache[key] = value
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+class DjangoCacheBackend:
+    """Stores predictions in one of Django's ``CACHES`` (shared across workers)."""
+
+    name = "django"
+
+    def __init__(self, alias, timeout):
+        self._cache = caches[alias]
+        self._timeout = timeout
+
+    @staticmethod
+    def _make_key(key):
+        return "predictor:gpa:" + hashlib.sha1(repr(key).encode()).hexdigest()
+
+    def get(self, key):
+        return self._cache.get(self._make_key(key), _MISSING)
+
+    def set(self, key, value):
+        self._cache.set(self._make_key(key), value, self._timeout)
+
+    def clear(self):
+        self._cache.clear()
+
+
+class PredictionCache:
+    """Memoises GPA predictions per model version and canonical input profile.
+
+    The model version is part of every key, so a retrain (new artifacts →
+    new version) makes old entries unreachable without an explicit flush.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_predict(self, lifestyle_data, performance_data, artifacts=None):
+        if artifacts is None:
+            artifacts = get_model_registry().current()
+
+        lifestyle_data, performance_data = normalize_profile(lifestyle_data, performance_data)
+        key = (artifacts.version,) + canonical_features(lifestyle_data, performance_data)
+        value = self.backend.get(key)
+        if value is not _MISSING:
+            with self._lock:
+                self.hits += 1
+            return value
+
+        with self._lock:
+            self.misses += 1
+        value = float(ml_model.predict_gpa(lifestyle_data, performance_data, artifacts=artifacts))
+        self.backend.set(key, value)
+        return value
+
+    def stats(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            "backend": self.backend.name,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else 0.0,
+        }
+
+    def clear(self):
+        self.backend.clear()
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+
+def build_prediction_cache(config=None):
+    """Create a :class:`PredictionCache` from a ``PREDICTOR_CACHE``-style dict.
+
+    Returns ``None`` when caching is disabled.
+    """
+    config = dict(DEFAULT_CACHE_CONFIG, **(config or {}))
+    backend = config["BACKEND"]
+    if not backend:
+        return None
+    if backend == "inprocess":
+        return PredictionCache(InProcessCacheBackend(config["MAX_ENTRIES"], config["TIMEOUT"]))
+    if backend == "django":
+        return PredictionCache(DjangoCacheBackend(config["CACHE_ALIAS"], config["TIMEOUT"]))
+    raise ValueError(f"❌ Unknown prediction cache backend: {backend}")
+
+
+_prediction_cache = _MISSING
+_prediction_cache_lock = threading.Lock()
+
+
+def get_prediction_cache():
+    """Process-wide cache configured by ``settings.PREDICTOR_CACHE`` (or ``None``)."""
+    global _prediction_cache
+    if _prediction_cache is _MISSING:
+        with _prediction_cache_lock:
+            if _prediction_cache is _MISSING:
+                _prediction_cache = build_prediction_cache(getattr(settings, "PREDICTOR_CACHE", None))
+    return _prediction_cache
+
+
+def cached_predict_gpa(lifestyle_data, performance_data, artifacts=None):
+    """:func:`predictor.ml_model.predict_gpa` behind the configured cache."""
+    cache = get_prediction_cache()
+    if cache is None:
+        return ml_model.predict_gpa(lifestyle_data, performance_data, artifacts=artifacts)
+    return cache.get_or_predict(lifestyle_data, performance_data, artifacts=artifacts)
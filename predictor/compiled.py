@@ -0,0 +1,110 @@
+import numpy as np
+
+from predictor.features import BINARY_COLUMNS, BINARY_MAPPING, CATEGORICAL_COLUMNS, _column
+from predictor.validation import LIFESTYLE_FIELDS, PERFORMANCE_FIELDS
+
+LIFESTYLE_GPA_FEATURE = "Predicted_Lifestyle_GPA"
+
+
+def scaler_moments(scaler, size):
+    """Return ``(mean, scale)`` arrays that reproduce ``scaler.transform``."""
+    mean = np.zeros(size)
+    scale = np.ones(size)
+    if getattr(scaler, "with_mean", True) and getattr(scaler, "mean_", None) is not None:
+        mean = np.asarray(scaler.mean_, dtype=float)
+    if getattr(scaler, "with_std", True) and getattr(scaler, "scale_", None) is not None:
+        scale = np.asarray(scaler.scale_, dtype=float)
+    return mean, scale
+
+
+class CompiledPredictor:
+    """The lifestyle -> performance chain folded into one affine function.
+
+    Both stages are ``StandardScaler`` + ``LinearRegression``, so the whole
+    chain is ``bias + weights . x`` over the raw inputs, where one-hot
+    columns become per-category weights. Prediction is a plain dot product
+    with no pandas or sklearn involved.
+    """
+
+    def __init__(self, numeric_weights, category_weights, bias, source_version=None):
+        # ✅ [(field, weight), ...] for lifestyle + numeric/binary performance inputs
+        self.numeric_weights = [(name, float(weight)) for name, weight in numeric_weights]
+        # ✅ {"Major": {"Science": weight, ...}, ...}; unseen categories weigh 0
+        self.category_weights = {
+            column: {category: float(weight) for category, weight in weights.items()}
+            for column, weights in category_weights.items()
+        }
+        self.bias = float(bias)
+        self.source_version = source_version
+
+        self.numeric_fields = [name for name, _ in self.numeric_weights]
+        self.weights = np.array([weight for _, weight in self.numeric_weights])
+
+    @classmethod
+    def from_pipeline(cls, lifestyle_model, lifestyle_scaler, performance_model,
+                      performance_scaler, features_list, source_version=None):
+        """Fold the two fitted scaler/model pairs into one weight vector."""
+        features_list = list(features_list)
+
+        performance_mean, performance_scale = scaler_moments(performance_scaler, len(features_list))
+        performance_weights = np.asarray(performance_model.coef_, dtype=float).ravel() / performance_scale
+        bias = float(performance_model.intercept_) - float(performance_weights @ performance_mean)
+
+        # ✅ The lifestyle stage only contributes through its GPA column
+        lifestyle_weights = np.zeros(len(LIFESTYLE_FIELDS))
+        if LIFESTYLE_GPA_FEATURE in features_list:
+            gpa_weight = performance_weights[features_list.index(LIFESTYLE_GPA_FEATURE)]
+            lifestyle_mean, lifestyle_scale = scaler_moments(lifestyle_scaler, len(LIFESTYLE_FIELDS))
+            lifestyle_coef = np.asarray(lifestyle_model.coef_, dtype=float).ravel() / lifestyle_scale
+            lifestyle_weights = gpa_weight * lifestyle_coef
+            bias += gpa_weight * (float(lifestyle_model.intercept_) - float(lifestyle_coef @ lifestyle_mean))
+
+        numeric_weights = list(zip(LIFESTYLE_FIELDS, lifestyle_weights))
+        category_weights = {column: {} for column in CATEGORICAL_COLUMNS}
+        for feature, weight in zip(features_list, performance_weights):
+            if feature == LIFESTYLE_GPA_FEATURE:
+                continue
+            if feature in PERFORMANCE_FIELDS:
+                numeric_weights.append((feature, weight))
+                continue
+            prefix, _, category = feature.partition("_")
+            if prefix in category_weights:
+                category_weights[prefix][category] = weight
+            # ✅ Anything else (e.g. StudentID, Age) is always 0 at inference,
+            #    so it only shifts the bias through the scaler mean above.
+
+        return cls(numeric_weights, category_weights, bias, source_version=source_version)
+
+    def predict(self, lifestyle_data, performance_data):
+        """Predict the GPA of one student from the raw input dicts."""
+        total = self.bias
+        for name, weight in self.numeric_weights:
+            value = lifestyle_data[name] if name in lifestyle_data else performance_data[name]
+            if name in BINARY_COLUMNS:
+                value = BINARY_MAPPING.get(value, 0)
+            total += weight * float(value)
+        for column, weights in self.category_weights.items():
+            total += weights.get(performance_data.get(column), 0.0)
+        return total
+
+    def predict_batch(self, lifestyle_rows, performance_rows):
+        """Predict many students; rows are sequences of dicts or DataFrames."""
+        size = len(lifestyle_rows)
+        if len(performance_rows) != size:
+            raise ValueError("❌ Lifestyle and performance rows must have the same length")
+
+        matrix = np.empty((size, len(self.numeric_fields)))
+        for index, name in enumerate(self.numeric_fields):
+            rows = lifestyle_rows if name in LIFESTYLE_FIELDS else performance_rows
+            values = _column(rows, name)
+            if name in BINARY_COLUMNS:
+                values = [BINARY_MAPPING.get(value, 0) for value in values]
+            matrix[:, index] = values
+
+        predictions = matrix @ self.weights + self.bias
+        for column, weights in self.category_weights.items():
+            predictions += np.fromiter(
+                (weights.get(value, 0.0) for value in _column(performance_rows, column)),
+                dtype=float, count=size,
+            )
+        return predictions
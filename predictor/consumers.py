@@ -0,0 +1,42 @@
+import asyncio
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from predictor.aggregates import analytics_summary
+from predictor.live import DASHBOARD_GROUP, get_live_publisher, major_group
+
+
+class DashboardConsumer(AsyncJsonWebsocketConsumer):
+    """Pushes new predictions & cohort aggregates to professor dashboards.
+
+    Connect to ``ws/predictor/dashboard/`` (optionally ``?major=<Major>``
+    to only get that major's predictions) with a session or ``?token=``.
+    The first message is a ``snapshot`` of the aggregates; after that the
+    dashboard receives coalesced ``update`` frames, at most one per
+    ``PREDICTOR_LIVE_UPDATES["MIN_INTERVAL"]`` seconds.
+    """
+
+    async def connect(self):
+        user = self.scope.get("user")
+        if user is None or not user.is_authenticated or not user.can_view_cohort:
+            await self.close()
+            return
+
+        major = parse_qs(self.scope.get("query_string", b"").decode()).get("major", [None])[0]
+        self.group_name = major_group(major) if major else DASHBOARD_GROUP
+        publisher = get_live_publisher()
+        if publisher is not None:
+            publisher.bind_loop(asyncio.get_running_loop())
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+        await self.send_json({"type": "snapshot", "aggregates": await database_sync_to_async(analytics_summary)()})
+
+    async def disconnect(self, code):
+        if hasattr(self, "group_name"):
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def dashboard_update(self, event):
+        await self.send_json(dict(event, type="update"))
+
@@ -0,0 +1,203 @@
+import glob
+import json
+import logging
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from django.conf import settings
+
+from predictor.bundle import file_sha256
+from predictor.features import BINARY_COLUMNS, CATEGORICAL_COLUMNS, FeatureSchema
+
+logger = logging.getLogger(__name__)
+
+DATASET_FORMAT_VERSION = 1
+LIFESTYLE = "lifestyle"
+PERFORMANCE = "performance"
+
+# ✅ Explicit source schemas: CSV text is parsed into exactly these types
+SOURCE_SCHEMAS = {
+    LIFESTYLE: pa.schema([
+        ("Student_ID", pa.int64()),
+        ("Study_Hours_Per_Day", pa.float64()),
+        ("Extracurricular_Hours_Per_Day", pa.float64()),
+        ("Sleep_Hours_Per_Day", pa.float64()),
+        ("Social_Hours_Per_Day", pa.float64()),
+        ("Physical_Activity_Hours_Per_Day", pa.float64()),
+        ("GPA", pa.float64()),
+        ("Stress_Level", pa.int64()),
+    ]),
+    PERFORMANCE: pa.schema([
+        ("StudentID", pa.int64()),
+        ("Gender", pa.string()),
+        ("Age", pa.int64()),
+        ("StudyHoursPerWeek", pa.float64()),
+        ("AttendanceRate", pa.float64()),
+        ("GPA", pa.float64()),
+        ("Major", pa.string()),
+        ("PartTimeJob", pa.string()),
+        ("ExtraCurricularActivities", pa.string()),
+    ]),
+}
+# ✅ Source columns that never reach the cached, encoded dataset
+DROPPED_COLUMNS = ["Student_ID"]
+
+# (path, size, mtime) -> SHA-256, so a training run hashes each source once
+_source_hashes = {}
+
+
+def _pandas_dtypes(schema):
+    return {field.name: str if field.type == pa.string() else field.type.to_pandas_dtype()
+            for field in schema}
+
+
+def cache_dir():
+    return getattr(settings, "PREDICTOR_DATASET_CACHE_DIR", None) or os.path.join(
+        settings.BASE_DIR, "predictor", "dataset_cache"
+    )
+
+
+def source_path(name):
+    # ✅ Import inside function to prevent circular imports
+    from predictor import ml_model
+
+    return {LIFESTYLE: ml_model.DATA_LIFESTYLE_PATH, PERFORMANCE: ml_model.DATA_PERFORMANCE_PATH}[name]
+
+
+def source_sha256(name):
+    """SHA-256 of the source CSV of dataset ``name``."""
+    path = source_path(name)
+    stat = os.stat(path)
+    key = (path, stat.st_size, stat.st_mtime_ns)
+    if key not in _source_hashes:
+        _source_hashes[key] = file_sha256(path)
+    return _source_hashes[key]
+
+
+def _vocabularies(path, chunk_size):
+    """Sorted categories of every categorical column, in one streaming pass."""
+    seen = {col: set() for col in CATEGORICAL_COLUMNS}
+    for chunk in pd.read_csv(path, usecols=CATEGORICAL_COLUMNS, dtype=str, chunksize=chunk_size):
+        for col in CATEGORICAL_COLUMNS:
+            seen[col].update(chunk[col].dropna().unique())
+    return {col: sorted(values) for col, values in seen.items()}
+
+
+def feature_schema(name, vocabularies=None):
+    """:class:`FeatureSchema` encoding the source columns into the cached layout."""
+    columns = [field.name for field in SOURCE_SCHEMAS[name] if field.name not in DROPPED_COLUMNS]
+    return FeatureSchema.from_vocabularies(columns, vocabularies or {})
+
+
+def encoded_schema(name, vocabularies=None):
+    """Schema of the cached dataset: the source minus dropped columns, with
+    binary columns as 0/1 and categoricals one-hot encoded like training
+    (sorted categories, first one dropped)."""
+    source = SOURCE_SCHEMAS[name]
+    fields = []
+    for feature in feature_schema(name, vocabularies).features:
+        if feature in BINARY_COLUMNS or feature not in source.names:
+            fields.append(pa.field(feature, pa.int8()))
+        else:
+            fields.append(source.field(feature))
+    return pa.schema(fields)
+
+
+def build_dataset(name, path, cache_path, chunk_size=None):
+    """Convert the CSV at ``path`` into a Parquet file at ``cache_path``.
+
+    The CSV is parsed ``chunk_size`` rows at a time with the explicit
+    schema and every chunk becomes one row group, so neither the build nor
+    a later :func:`iter_dataset` holds the whole file in memory. The file
+    is written to a temporary name and renamed into place.
+    """
+    chunk_size = chunk_size or getattr(settings, "PREDICTOR_DATASET_ROW_GROUP_SIZE", 100000)
+    header = pd.read_csv(path, nrows=0).columns
+    missing = [field.name for field in SOURCE_SCHEMAS[name] if field.name not in header]
+    if missing:
+        raise ValueError(f"❌ Missing columns in {path}: {', '.join(missing)}")
+
+    sha256 = file_sha256(path)
+    vocabularies = _vocabularies(path, chunk_size) if name == PERFORMANCE else {}
+    encoder = feature_schema(name, vocabularies)
+    schema = encoded_schema(name, vocabularies).with_metadata({
+        "format_version": str(DATASET_FORMAT_VERSION),
+        "source_sha256": sha256,
+        "vocabularies": json.dumps(vocabularies),
+    })
+
+    directory = os.path.dirname(os.path.abspath(cache_path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".dataset-", suffix=".parquet")
+    os.close(fd)
+    rows = 0
+    # ✅ One encode buffer reused by every full chunk
+    buffer = np.empty((chunk_size, len(encoder.features)))
+    try:
+        with pq.ParquetWriter(tmp_path, schema) as writer:
+            reader = pd.read_csv(path, dtype=_pandas_dtypes(SOURCE_SCHEMAS[name]), chunksize=chunk_size)
+            for chunk in reader:
+                encoded = encoder.encode(chunk, out=buffer[:len(chunk)])
+                writer.write_table(pa.Table.from_arrays(
+                    [pa.array(encoded[:, index]).cast(field.type) for index, field in enumerate(schema)],
+                    schema=schema,
+                ))
+                rows += len(chunk)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    logger.info(f"✅ Cached {rows} {name} rows at {cache_path}")
+    return cache_path
+
+
+def dataset_path(name, rebuild=False):
+    """Path of the Parquet cache of dataset ``name``, building it if needed.
+
+    Files are named after the source CSV's SHA-256, so a changed CSV gets a
+    fresh cache and caches of older contents are removed.
+    """
+    cache_path = os.path.join(
+        cache_dir(), f"{name}-{source_sha256(name)[:16]}-v{DATASET_FORMAT_VERSION}.parquet"
+    )
+    if rebuild or not os.path.exists(cache_path):
+        build_dataset(name, source_path(name), cache_path)
+        for stale in glob.glob(os.path.join(cache_dir(), f"{name}-*.parquet")):
+            if stale != cache_path:
+                os.remove(stale)
+    return cache_path
+
+
+def dataset_metadata(name):
+    """``source_sha256`` & category ``vocabularies`` stored with the cached dataset."""
+    metadata = pq.read_schema(dataset_path(name)).metadata
+    return {
+        "source_sha256": metadata[b"source_sha256"].decode(),
+        "vocabularies": json.loads(metadata[b"vocabularies"]),
+    }
+
+
+def dataset_row_count(name):
+    return pq.ParquetFile(dataset_path(name)).metadata.num_rows
+
+
+def read_dataset(name, columns=None):
+    """The whole cached dataset (or just ``columns``) as a DataFrame."""
+    return pq.read_table(dataset_path(name), columns=columns).to_pandas()
+
+
+def iter_dataset(name, columns=None, batch_size=None):
+    """Yield the cached dataset as DataFrames, one row group (or ``batch_size`` rows) at a time."""
+    parquet_file = pq.ParquetFile(dataset_path(name))
+    if batch_size is None:
+        for index in range(parquet_file.num_row_groups):
+            yield parquet_file.read_row_group(index, columns=columns).to_pandas()
+    else:
+        for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+            yield batch.to_pandas()
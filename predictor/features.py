@@ -0,0 +1,152 @@
+import numpy as np
+
+BINARY_COLUMNS = ["PartTimeJob", "ExtraCurricularActivities"]
+CATEGORICAL_COLUMNS = ["Gender", "Major"]
+
+# ✅ Binary values may arrive as 'Yes'/'No' (CSV) or already as 1/0 (API)
+BINARY_MAPPING = {'Yes': 1, 'No': 0, 1: 1, 0: 0}
+
+# ✅ What to do with a category the models were not trained on
+UNKNOWN_REFERENCE = "reference"  # encode like the reference (dropped) category: all dummies 0
+UNKNOWN_ERROR = "error"  # raise UnknownCategoryError
+UNKNOWN_POLICIES = (UNKNOWN_REFERENCE, UNKNOWN_ERROR)
+
+_REFERENCE = -1
+_UNSEEN = -2
+
+
+class UnknownCategoryError(ValueError):
+    pass
+
+
+def _column(rows, name):
+    """Values of ``name`` across ``rows`` (a DataFrame or a list of dicts)."""
+    if hasattr(rows, "columns"):
+        return rows[name].tolist()
+    return [row[name] for row in rows]
+
+
+def _has_column(rows, name):
+    """Whether the rows carry ``name``; raises when only some records have it."""
+    if hasattr(rows, "columns"):
+        return name in rows.columns
+    present = sum(name in row for row in rows)
+    if present and present < len(rows):
+        index = next(index for index, row in enumerate(rows) if name not in row)
+        raise ValueError(f"❌ Row {index} has no {name} column")
+    return bool(present)
+
+
+class FeatureSchema:
+    """Fitted encoder from raw rows to the trained feature matrix.
+
+    Holds the feature order, the category vocabularies and, for every input
+    column, the index it writes to. :meth:`encode` fills a (preallocated)
+    float array directly from a DataFrame or a list of dicts, so the layout
+    never depends on the categories present in the rows being encoded.
+
+    Categoricals are one-hot encoded like ``pd.get_dummies(drop_first=True)``
+    at training time: the first (sorted) category of each column is the
+    reference and has no dummy column. Binary columns map Yes/No to 1/0 and
+    trained columns absent from the rows encode as 0.
+    """
+
+    def __init__(self, features, vocabularies=None, unknown=UNKNOWN_REFERENCE):
+        if unknown not in UNKNOWN_POLICIES:
+            raise ValueError(f"❌ Unknown category policy must be one of {', '.join(UNKNOWN_POLICIES)}")
+        self.features = list(features)
+        self.unknown = unknown
+
+        # ✅ [(index, column, is_binary)] and {column: {category: index or _REFERENCE}}
+        self._numeric = []
+        self._categories = {column: {} for column in (vocabularies or {})}
+        for column, categories in (vocabularies or {}).items():
+            for category in categories:
+                self._categories[column][category] = _REFERENCE
+        for index, feature in enumerate(self.features):
+            prefix, _, category = feature.partition("_")
+            if prefix in CATEGORICAL_COLUMNS:
+                self._categories.setdefault(prefix, {})[category] = index
+            else:
+                self._numeric.append((index, feature, feature in BINARY_COLUMNS))
+
+    @classmethod
+    def from_vocabularies(cls, columns, vocabularies, unknown=UNKNOWN_REFERENCE):
+        """Layout of the raw ``columns`` after one-hot encoding ``vocabularies``.
+
+        Non-categorical columns keep their order and the dummy columns of
+        each categorical follow, with the first sorted category dropped.
+        """
+        vocabularies = {column: sorted(categories) for column, categories in vocabularies.items()}
+        features = [column for column in columns if column not in CATEGORICAL_COLUMNS]
+        for column, categories in vocabularies.items():
+            features.extend(f"{column}_{category}" for category in categories[1:])
+        return cls(features, vocabularies, unknown=unknown)
+
+    @classmethod
+    def fit(cls, df, unknown=UNKNOWN_REFERENCE):
+        """Learn the vocabularies & layout from the raw training rows in ``df``."""
+        vocabularies = {
+            column: sorted(df[column].dropna().astype(str).unique().tolist())
+            for column in CATEGORICAL_COLUMNS if column in df.columns
+        }
+        return cls.from_vocabularies(df.columns, vocabularies, unknown=unknown)
+
+    @property
+    def vocabularies(self):
+        return {column: sorted(categories) for column, categories in self._categories.items()}
+
+    def to_dict(self):
+        return {"features": self.features, "vocabularies": self.vocabularies, "unknown": self.unknown}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["features"], data.get("vocabularies"), unknown=data.get("unknown", UNKNOWN_REFERENCE))
+
+    def _positions(self, rows, column, lookup):
+        positions = np.fromiter(
+            (lookup.get(value, _UNSEEN) for value in _column(rows, column)), dtype=np.intp, count=len(rows)
+        )
+        if self.unknown == UNKNOWN_ERROR and (positions == _UNSEEN).any():
+            unseen = sorted({str(value) for value, position in zip(_column(rows, column), positions)
+                             if position == _UNSEEN})
+            raise UnknownCategoryError(f"Unknown {column}: {', '.join(unseen)}")
+        return positions
+
+    def check_categories(self, rows):
+        """Raise :class:`UnknownCategoryError` for unseen categories under the ``error`` policy."""
+        if self.unknown != UNKNOWN_ERROR or not len(rows):
+            return
+        for column, lookup in self._categories.items():
+            if _has_column(rows, column):
+                self._positions(rows, column, lookup)
+
+    def encode(self, rows, out=None):
+        """Encode ``rows`` into ``out`` (or a new array) of shape ``(len(rows), len(features))``."""
+        size = len(rows)
+        if out is None:
+            out = np.zeros((size, len(self.features)))
+        else:
+            if out.shape != (size, len(self.features)):
+                raise ValueError(f"❌ Output array must have shape {(size, len(self.features))}")
+            out.fill(0.0)
+        if not size:
+            return out
+
+        for index, column, is_binary in self._numeric:
+            if not _has_column(rows, column):
+                continue
+            if is_binary:
+                out[:, index] = [BINARY_MAPPING.get(value, 0) for value in _column(rows, column)]
+            elif hasattr(rows, "columns"):
+                out[:, index] = rows[column].to_numpy()
+            else:
+                out[:, index] = _column(rows, column)
+
+        for column, lookup in self._categories.items():
+            if not _has_column(rows, column):
+                continue
+            positions = self._positions(rows, column, lookup)
+            hit = np.flatnonzero(positions >= 0)
+            out[hit, positions[hit]] = 1.0
+        return out
@@ -0,0 +1,251 @@
+import json
+import logging
+import os
+import tempfile
+
+import numpy as np
+from django.conf import settings
+
+from predictor import datasets, ml_model
+from predictor.bundle import ArrayLinearModel, ArrayScaler
+from predictor.features import FeatureSchema
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("lifestyle", "performance")
+
+
+class RunningOLS:
+    """Sufficient statistics of a ``StandardScaler`` + ``LinearRegression`` fit.
+
+    Keeps the row count, the means of ``[X, y]`` and their centered
+    co-moment matrix (``XᵀX``/``Xᵀy`` about the mean). Both the scaler
+    moments and the least-squares coefficients follow from these, so a
+    batch is absorbed in O(batch · features²) without the earlier rows and
+    coefficients are re-solved in O(features²) memory. Batches are merged
+    with the pairwise (Chan et al.) update, which stays accurate where raw
+    ``XᵀX`` sums lose precision to large feature means.
+    """
+
+    def __init__(self, features, count=0, mean=None, comoments=None):
+        self.features = list(features)
+        size = len(self.features) + 1
+        self.count = int(count)
+        self.mean = np.zeros(size) if mean is None else np.array(mean, dtype=float)
+        self.comoments = np.zeros((size, size)) if comoments is None else np.array(comoments, dtype=float)
+
+    def absorb(self, X, y):
+        """Fold the rows of ``X`` (in ``features`` order) and targets ``y`` in."""
+        Z = np.column_stack([np.asarray(X, dtype=float), np.asarray(y, dtype=float)])
+        if Z.shape[1] != len(self.features) + 1:
+            raise ValueError(f"❌ Expected {len(self.features)} feature columns, got {Z.shape[1] - 1}")
+        if not len(Z):
+            return self
+        if not np.isfinite(Z).all():
+            raise ValueError("❌ Training rows contain missing or non-finite values")
+
+        batch_count = len(Z)
+        batch_mean = Z.mean(axis=0)
+        centered = Z - batch_mean
+        batch_comoments = centered.T @ centered
+
+        total = self.count + batch_count
+        delta = batch_mean - self.mean
+        self.mean = self.mean + delta * (batch_count / total)
+        self.comoments = self.comoments + batch_comoments + np.outer(delta, delta) * (self.count * batch_count / total)
+        self.count = total
+        return self
+
+    def solve(self):
+        """Scaler & model equal to ``StandardScaler`` + ``LinearRegression`` on every absorbed row."""
+        if self.count < 2:
+            raise ValueError("❌ At least two training rows are needed to fit a model")
+
+        size = len(self.features)
+        Sxx = self.comoments[:size, :size]
+        Sxy = self.comoments[:size, size]
+
+        # ✅ Population variance like StandardScaler; constant columns keep scale 1
+        scale = np.sqrt(np.clip(np.diag(Sxx) / self.count, 0, None))
+        scale[scale < 10 * np.finfo(float).eps] = 1.0
+
+        # ✅ Normal equations of the standardized, centered problem (min-norm like lstsq)
+        coef, *_ = np.linalg.lstsq(Sxx / np.outer(scale, scale), Sxy / scale, rcond=None)
+        scaler = ArrayScaler(self.mean[:size].copy(), scale, np.asarray(self.features, dtype=object))
+        model = ArrayLinearModel(coef, self.mean[size])
+        return scaler, model
+
+    def training_metrics(self, model, scaler):
+        """In-sample fit of ``model`` over every absorbed row, from the statistics alone."""
+        size = len(self.features)
+        total_squares = self.comoments[size, size]
+        residual_squares = max(total_squares - model.coef_ @ (self.comoments[:size, size] / scaler.scale_), 0.0)
+        return {
+            "train_rows": self.count,
+            "train_r2": float(1 - residual_squares / total_squares) if total_squares else 0.0,
+            "train_rmse": float(np.sqrt(residual_squares / self.count)),
+        }
+
+
+def training_stats_path(bundle_path=None):
+    path = getattr(settings, "PREDICTOR_TRAINING_STATS_PATH", None)
+    return path or f"{bundle_path or ml_model.model_bundle_path()}.stats.npz"
+
+
+def _dataset_statistics(name):
+    """Absorb the training split of a cached dataset one row group at a time."""
+    rows = datasets.dataset_row_count(name)
+    train_index = ml_model.split_training_data(np.arange(rows), np.arange(rows))[0]
+    in_train = np.zeros(rows, dtype=bool)
+    in_train[train_index] = True
+
+    running = None
+    offset = 0
+    for chunk in datasets.iter_dataset(name):
+        y = chunk.pop("GPA").to_numpy(dtype=float)
+        if running is None:
+            running = RunningOLS(chunk.columns)
+        mask = in_train[offset:offset + len(chunk)]
+        running.absorb(chunk.to_numpy(dtype=float)[mask], y[mask])
+        offset += len(chunk)
+    return running
+
+
+def source_hashes():
+    """SHA-256 of the lifestyle & performance CSVs the statistics start from."""
+    return {
+        "lifestyle": datasets.source_sha256(datasets.LIFESTYLE),
+        "performance": datasets.source_sha256(datasets.PERFORMANCE),
+    }
+
+
+def initial_statistics():
+    """Statistics of the rows the full training run fits on (CSV train split)."""
+    return {
+        "lifestyle": _dataset_statistics(datasets.LIFESTYLE),
+        "performance": _dataset_statistics(datasets.PERFORMANCE),
+        "vocabularies": datasets.dataset_metadata(datasets.PERFORMANCE)["vocabularies"],
+        "data_sha256": source_hashes(),
+    }
+
+
+def save_statistics(statistics, path):
+    """Write ``statistics`` as one ``.npz``, replacing ``path`` atomically."""
+    arrays = {}
+    for stage in STAGES:
+        running = statistics[stage]
+        arrays[f"{stage}_count"] = np.array([running.count])
+        arrays[f"{stage}_mean"] = running.mean
+        arrays[f"{stage}_comoments"] = running.comoments
+    metadata = {
+        "features": {stage: statistics[stage].features for stage in STAGES},
+        "vocabularies": statistics["vocabularies"],
+        "data_sha256": statistics["data_sha256"],
+    }
+    arrays["metadata"] = np.array(json.dumps(metadata))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".stats-", suffix=".npz")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            np.savez(fh, **arrays)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_statistics(path):
+    with np.load(path, allow_pickle=False) as data:
+        metadata = json.loads(str(data["metadata"]))
+        statistics = {
+            stage: RunningOLS(
+                metadata["features"][stage],
+                count=int(data[f"{stage}_count"][0]),
+                mean=data[f"{stage}_mean"],
+                comoments=data[f"{stage}_comoments"],
+            )
+            for stage in STAGES
+        }
+    statistics["vocabularies"] = metadata.get("vocabularies", {})
+    statistics["data_sha256"] = metadata.get("data_sha256", {})
+    return statistics
+
+
+def absorb_labelled_rows(statistics, lifestyle_rows=None, performance_rows=None):
+    """Fold labelled DataFrames (raw columns + ``GPA``) into ``statistics``.
+
+    Performance rows are encoded into the trained layout, so categories the
+    models were never trained on encode like the reference category.
+    Returns the number of rows absorbed per stage.
+    """
+    absorbed = {}
+    for stage, rows in (("lifestyle", lifestyle_rows), ("performance", performance_rows)):
+        if rows is None or not len(rows):
+            continue
+        if "GPA" not in rows.columns:
+            raise ValueError(f"❌ 'GPA' column is missing from the {stage} rows!")
+        running = statistics[stage]
+        missing = [feature for feature in running.features
+                   if feature not in rows.columns and feature.partition("_")[0] not in rows.columns]
+        if missing:
+            raise ValueError(f"❌ Missing columns in the {stage} rows: {', '.join(missing)}")
+        X = FeatureSchema(running.features, statistics["vocabularies"]).encode(rows)
+        running.absorb(X, rows["GPA"].to_numpy(dtype=float))
+        absorbed[stage] = len(rows)
+    return absorbed
+
+
+def statistics_stages(statistics):
+    """Solve both models into the stage dicts :func:`ml_model.save_model_bundle` takes."""
+    stages = {}
+    for stage in STAGES:
+        running = statistics[stage]
+        scaler, model = running.solve()
+        stages[stage] = {
+            "model": model,
+            "scaler": scaler,
+            "features": running.features,
+            "metrics": running.training_metrics(model, scaler),
+            "data_sha256": statistics["data_sha256"].get(stage),
+        }
+    stages["performance"]["vocabularies"] = statistics["vocabularies"]
+    return stages
+
+
+def retrain_incrementally(lifestyle_rows=None, performance_rows=None, bundle_path=None,
+                          stats_path=None, reset=False, lock_timeout=None):
+    """Absorb labelled rows and publish a bundle re-solved from the statistics.
+
+    The statistics start from the CSV training split the first time (or
+    with ``reset``) and are persisted next to the bundle, so each call only
+    reads the new rows. If either CSV changed since the statistics were
+    built they are rebuilt from it, dropping the rows absorbed so far. Runs under the same ``<bundle>.lock`` as full
+    training. Returns ``(version, absorbed)``.
+    """
+    # ✅ Import inside function to prevent circular imports
+    from predictor.training import FileLock
+
+    bundle_path = bundle_path or ml_model.model_bundle_path()
+    stats_path = stats_path or training_stats_path(bundle_path)
+
+    with FileLock(f"{bundle_path}.lock", timeout=lock_timeout):
+        if reset or not os.path.exists(stats_path):
+            logger.info("🚀 Building training statistics from the CSV datasets...")
+            statistics = initial_statistics()
+        else:
+            statistics = load_statistics(stats_path)
+            if statistics["data_sha256"] != source_hashes():
+                logger.warning("⚠️ Training CSVs changed since the statistics were built, rebuilding them...")
+                statistics = initial_statistics()
+
+        absorbed = absorb_labelled_rows(statistics, lifestyle_rows, performance_rows)
+        stages = statistics_stages(statistics)
+        save_statistics(statistics, stats_path)
+        version = ml_model.save_model_bundle(stages["lifestyle"], stages["performance"], bundle_path)
+
+    logger.info(f"✅ Model bundle {version} re-solved after absorbing {absorbed or 'no new'} rows")
+    return version, absorbed
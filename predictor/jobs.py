@@ -0,0 +1,210 @@
+import logging
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from predictor.bulk_scoring import read_csv_chunks, score_chunk
+from predictor.models import PredictionJob
+from predictor.registry import get_model_registry
+
+logger = logging.getLogger(__name__)
+
+
+# ✅ Every worker must see the same job directory (local disk for one host, a shared volume otherwise)
+def jobs_dir():
+    return getattr(settings, "PREDICTOR_JOBS_DIR", None) or os.path.join(settings.BASE_DIR, "prediction_jobs")
+
+
+def job_dir(job_id):
+    return os.path.join(jobs_dir(), str(job_id))
+
+
+def _chunk_path(job_id, index):
+    return os.path.join(job_dir(job_id), "chunks", f"chunk-{index:06d}.csv")
+
+
+def _part_path(job_id, index):
+    return os.path.join(job_dir(job_id), "results", f"part-{index:06d}.csv")
+
+
+def result_path(job_id):
+    return os.path.join(job_dir(job_id), "result.csv")
+
+
+def resolve_dataset(reference):
+    """Absolute path of a dataset reference inside ``PREDICTOR_JOB_DATASETS_DIR``."""
+    base = getattr(settings, "PREDICTOR_JOB_DATASETS_DIR", None)
+    if not base:
+        raise ValueError("Dataset references are disabled (PREDICTOR_JOB_DATASETS_DIR is not set)")
+    base = os.path.realpath(base)
+    path = os.path.realpath(os.path.join(base, str(reference)))
+    if not path.startswith(base + os.sep) or not os.path.isfile(path):
+        raise ValueError(f"Unknown dataset: {reference}")
+    return path
+
+
+def input_path(job):
+    if job.uploaded:
+        return os.path.join(job_dir(job.id), "input.csv")
+    return resolve_dataset(job.source)
+
+
+def create_job(owner, chunk_size, upload=None, dataset=None):
+    """Register a job for an uploaded file or a dataset reference and queue it.
+
+    The job is started once the transaction creating it commits, so a
+    worker can never pick it up before its row exists.
+    """
+    # ✅ Import inside function to prevent circular imports
+    from predictor.tasks import start_prediction_job
+
+    if upload is None:
+        resolve_dataset(dataset)
+    job = PredictionJob.objects.create(
+        owner=owner, chunk_size=chunk_size, uploaded=upload is not None,
+        source=upload.name if upload is not None else str(dataset),
+    )
+    os.makedirs(job_dir(job.id), exist_ok=True)
+    if upload is not None:
+        with open(input_path(job), "wb") as fh:
+            for block in upload.chunks():
+                fh.write(block)
+
+    transaction.on_commit(lambda: start_prediction_job.delay(str(job.id)))
+    return job
+
+
+def fail_job(job_id, message):
+    logger.error(f"❌ Prediction job {job_id} failed: {message}")
+    PredictionJob.objects.filter(pk=job_id).exclude(status=PredictionJob.SUCCEEDED).update(
+        status=PredictionJob.FAILED, error=str(message), finished_at=timezone.now(),
+    )
+
+
+def split_job(job_id):
+    """Split the job's input into chunk files; returns ``[(index, row_offset)]``.
+
+    The input is parsed once, one ``chunk_size`` slice at a time. A model
+    that cannot be loaded or a file that cannot be read fails the job and
+    returns no chunks.
+    """
+    try:
+        model_version = get_model_registry().current().version
+    except ValueError as e:
+        fail_job(job_id, str(e))
+        return []
+
+    # ✅ One conditional UPDATE, so a redelivered start task cannot split the job twice
+    claimed = PredictionJob.objects.filter(pk=job_id, status=PredictionJob.PENDING).update(
+        status=PredictionJob.RUNNING, started_at=timezone.now(), model_version=model_version,
+    )
+    if not claimed:
+        return []
+    job = PredictionJob.objects.get(pk=job_id)
+
+    chunks = []
+    row_offset = 0
+    try:
+        os.makedirs(os.path.dirname(_chunk_path(job_id, 0)), exist_ok=True)
+        os.makedirs(os.path.dirname(_part_path(job_id, 0)), exist_ok=True)
+        for index, chunk in enumerate(read_csv_chunks(input_path(job), chunk_size=job.chunk_size)):
+            chunk.to_csv(_chunk_path(job_id, index), index=False)
+            chunks.append((index, row_offset))
+            row_offset += len(chunk)
+    except (OSError, ValueError) as e:
+        fail_job(job_id, str(e))
+        return []
+
+    PredictionJob.objects.filter(pk=job_id).update(total_chunks=len(chunks), total_rows=row_offset)
+    logger.info(f"🚀 Prediction job {job_id}: {row_offset} rows in {len(chunks)} chunks")
+    return chunks
+
+
+def score_job_chunk(job_id, index, row_offset):
+    """Score one chunk file; returns True when it was the job's last chunk.
+
+    Completed chunk indexes are recorded under a row lock, so a redelivered
+    task is counted once and exactly one chunk sees the job complete and
+    triggers the merge. Every chunk must be scored by the model version the
+    job started on; if the model changes mid-job the job fails instead of
+    mixing versions in one result.
+    """
+    job = PredictionJob.objects.get(pk=job_id)
+    if job.status != PredictionJob.RUNNING or index in job.completed_chunk_ids:
+        return False
+
+    artifacts = get_model_registry().current()
+    if artifacts.version != job.model_version:
+        fail_job(job_id, f"Model changed from {job.model_version} to {artifacts.version} while the job was running")
+        return False
+
+    scored = score_chunk(pd.read_csv(_chunk_path(job_id, index)), artifacts, row_offset=row_offset)
+    scored.to_csv(_part_path(job_id, index))
+    invalid = int(scored["error"].notna().sum())
+
+    with transaction.atomic():
+        job = PredictionJob.objects.select_for_update().get(pk=job_id)
+        if job.status != PredictionJob.RUNNING or index in job.completed_chunk_ids:
+            return False
+        job.completed_chunk_ids.append(index)
+        job.scored_rows += len(scored) - invalid
+        job.invalid_rows += invalid
+        job.save(update_fields=["completed_chunk_ids", "scored_rows", "invalid_rows"])
+        last_chunk = job.completed_chunks == job.total_chunks
+
+    # ✅ Removed only once recorded, so a task that died before that can be redelivered
+    os.remove(_chunk_path(job_id, index))
+    return last_chunk
+
+
+def merge_job(job_id):
+    """Concatenate the scored parts (in row order) into the job's result file."""
+    job = PredictionJob.objects.get(pk=job_id)
+    if job.status != PredictionJob.RUNNING:
+        return
+
+    fd, tmp_path = tempfile.mkstemp(dir=job_dir(job_id), prefix=".result-", suffix=".csv")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            for index in range(job.total_chunks):
+                with open(_part_path(job_id, index), "rb") as part:
+                    if index:
+                        part.readline()  # header is written once
+                    shutil.copyfileobj(part, out)
+        os.replace(tmp_path, result_path(job_id))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    shutil.rmtree(os.path.join(job_dir(job_id), "chunks"), ignore_errors=True)
+    shutil.rmtree(os.path.join(job_dir(job_id), "results"), ignore_errors=True)
+    if job.uploaded:
+        os.remove(input_path(job))
+    PredictionJob.objects.filter(pk=job_id).update(status=PredictionJob.SUCCEEDED, finished_at=timezone.now())
+    logger.info(f"✅ Prediction job {job_id} finished: {job.total_rows} rows")
+
+
+def job_summary(job):
+    """JSON-serialisable status of ``job``."""
+    return {
+        "id": str(job.id),
+        "source": job.source,
+        "status": job.status,
+        "progress": round(job.progress, 4),
+        "total_chunks": job.total_chunks,
+        "completed_chunks": job.completed_chunks,
+        "total_rows": job.total_rows,
+        "scored_rows": job.scored_rows,
+        "invalid_rows": job.invalid_rows,
+        "model_version": job.model_version or None,
+        "error": job.error or None,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
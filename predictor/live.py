@@ -0,0 +1,216 @@
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from predictor.aggregates import analytics_summary
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIVE_UPDATES_CONFIG = {
+    "ENABLED": False,    # needs a channel layer shared by every worker (Redis) to reach all dashboards
+    "MIN_INTERVAL": 1.0,     # seconds between two frames sent to the same group
+    "MAX_PREDICTIONS": 50,   # newest predictions carried by one frame; older ones are only counted
+}
+
+# ✅ Every professor dashboard joins this group; filtered dashboards also join one per Major
+DASHBOARD_GROUP = "predictor.dashboard"
+
+
+def live_updates_config():
+    return dict(DEFAULT_LIVE_UPDATES_CONFIG, **getattr(settings, "PREDICTOR_LIVE_UPDATES", {}))
+
+
+def major_group(major):
+    # ✅ Channel group names are ASCII-only and < 100 chars, Major values are free text
+    return f"{DASHBOARD_GROUP}.major.{hashlib.sha1(str(major).encode()).hexdigest()[:16]}"
+
+
+def prediction_groups(instance):
+    yield DASHBOARD_GROUP
+    if instance.Major:
+        yield major_group(instance.Major)
+
+
+def serialize_prediction(instance):
+    return {
+        "id": instance.pk,
+        "username": instance.username,
+        "Major": instance.Major,
+        "Gender": instance.Gender,
+        "Stress_Level": instance.Stress_Level,
+        "GPA": instance.GPA,
+        "created_at": instance.created_at.isoformat() if instance.created_at else None,
+    }
+
+
+class _PendingUpdate:
+    def __init__(self):
+        self.predictions = []
+        self.count = 0
+
+
+class LiveUpdatePublisher:
+    """Coalesces saved predictions into rate-limited dashboard frames.
+
+    ``publish`` only buffers the predictions per channel group. A group
+    that has been quiet for ``min_interval`` seconds is sent right away on
+    a timer thread; everything arriving within ``min_interval`` of its last
+    frame is merged into the next one, so a group gets at most one frame
+    per interval however bursty the writes are. Each frame carries the
+    newest ``max_predictions`` predictions and how many were coalesced;
+    the aggregates are read once per flush, whatever the number of groups.
+
+    Rate limits are per process: with several web workers each one sends
+    its own frames, through a channel layer shared by all of them (Redis)
+    rather than the in-memory one. The in-memory layer only works from the
+    event loop serving the sockets, so consumers :meth:`bind_loop` it and
+    frames are sent there.
+    """
+
+    def __init__(self, min_interval=1.0, max_predictions=50, channel_layer=None):
+        self.min_interval = min_interval
+        self.max_predictions = max_predictions
+        self.channel_layer = channel_layer
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._last_sent = {}
+        self._timer = None
+        self._timer_due = None
+        self._loop = None
+        self.frames = 0
+        self.failed = 0
+
+    def bind_loop(self, loop):
+        """Send frames on ``loop``, the event loop of this process's sockets."""
+        self._loop = loop
+
+    def publish(self, instances):
+        with self._lock:
+            for instance in instances:
+                for group in prediction_groups(instance):
+                    pending = self._pending.get(group)
+                    if pending is None:
+                        pending = self._pending[group] = _PendingUpdate()
+                    pending.count += 1
+                    pending.predictions.append(instance)
+                    del pending.predictions[:-self.max_predictions]
+            self._schedule()
+
+    def flush(self):
+        """Send every pending frame now (used by tests & shutdown)."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            updates = self._take(list(self._pending))
+        self._send(updates)
+
+    def _due(self, group):
+        return self._last_sent.get(group, float("-inf")) + self.min_interval
+
+    def _schedule(self):
+        # ✅ One timer for all groups, armed for the earliest group due (caller holds the lock)
+        if not self._pending:
+            return
+        due = min(self._due(group) for group in self._pending)
+        if self._timer is not None and self._timer_due <= due:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer_due = due
+        self._timer = threading.Timer(max(due - time.monotonic(), 0.0), self._run)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _take(self, groups):
+        now = time.monotonic()
+        updates = {}
+        for group in groups:
+            updates[group] = self._pending.pop(group)
+            self._last_sent[group] = now
+        return updates
+
+    def _run(self):
+        try:
+            with self._lock:
+                self._timer = None
+                now = time.monotonic()
+                updates = self._take([group for group in self._pending if self._due(group) <= now + 0.001])
+                self._schedule()
+            self._send(updates)
+        finally:
+            # ✅ Every timer is a new thread with its own connection: close it before the thread ends
+            connection.close()
+
+    def _send(self, updates):
+        if not updates:
+            return
+        layer = self.channel_layer or get_channel_layer()
+        if layer is None:
+            return
+        try:
+            aggregates = analytics_summary()
+            sent_at = timezone.now().isoformat()
+        except Exception as e:
+            logger.warning(f"⚠️ Live dashboard update failed: {str(e)}")
+            with self._lock:
+                self.failed += len(updates)
+            return
+
+        loop = self._loop
+        frames = failed = 0
+        for group, pending in updates.items():
+            message = {
+                "type": "dashboard.update",
+                "predictions": [serialize_prediction(instance) for instance in pending.predictions],
+                "coalesced": pending.count,
+                "aggregates": aggregates,
+                "sent_at": sent_at,
+            }
+            try:
+                if loop is not None and loop.is_running():
+                    asyncio.run_coroutine_threadsafe(layer.group_send(group, message), loop).result(timeout=10)
+                else:
+                    async_to_sync(layer.group_send)(group, message)
+                frames += 1
+            except Exception as e:
+                logger.warning(f"⚠️ Live dashboard update to {group} failed: {str(e)}")
+                failed += 1
+        # ✅ Timer threads and flush() may send at the same time
+        with self._lock:
+            self.frames += frames
+            self.failed += failed
+
+
+_publisher = None
+_publisher_lock = threading.Lock()
+
+
+def get_live_publisher():
+    """Process-wide :class:`LiveUpdatePublisher`, or ``None`` when live updates are off."""
+    global _publisher
+    config = live_updates_config()
+    if not config["ENABLED"]:
+        return None
+    if _publisher is None:
+        with _publisher_lock:
+            if _publisher is None:
+                _publisher = LiveUpdatePublisher(
+                    min_interval=config["MIN_INTERVAL"], max_predictions=config["MAX_PREDICTIONS"],
+                )
+    return _publisher
+
+
+def publish_predictions(instances):
+    """Queue newly committed predictions for the subscribed dashboards."""
+    publisher = get_live_publisher()
+    if publisher is not None and instances:
+        publisher.publish(instances)
@@ -0,0 +1,55 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from predictor.benchmarks import DEFAULT_SIZES, find_regressions, run_benchmarks
+
+
+class Command(BaseCommand):
+    help = ("Time each stage of the predictor hot path for several batch sizes and "
+            "optionally fail on regressions against a saved baseline.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                            help="Comma-separated batch sizes")
+        parser.add_argument("--stages", help="Comma-separated stage names (default: all)")
+        parser.add_argument("--min-time", type=float, default=0.2, help="Seconds to spend per stage")
+        parser.add_argument("--max-repeats", type=int, default=1000)
+        parser.add_argument("--output", help="Write the results as JSON to this file")
+        parser.add_argument("--baseline", help="Results JSON from an earlier run to compare against")
+        parser.add_argument("--threshold", type=float, default=0.2,
+                            help="Allowed relative slowdown against the baseline (0.2 = 20%%)")
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options["sizes"].split(",") if size.strip()]
+        except ValueError:
+            raise CommandError("--sizes must be comma-separated integers")
+        stages = [stage.strip() for stage in options["stages"].split(",")] if options["stages"] else None
+
+        def log(result):
+            self.stdout.write(
+                f"{result['stage']:30} {result['rows']:>9} rows  median {result['median_s'] * 1000:>10.3f} ms  "
+                f"{result['per_row_us']:>10.3f} us/row  ({result['repeats']} runs)"
+                + (f"  {result['bytes']:,} bytes" if "bytes" in result else "")
+            )
+
+        results = run_benchmarks(sizes=sizes, stages=stages, min_time=options["min_time"],
+                                 max_repeats=options["max_repeats"], log=log)
+
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                json.dump(results, fh, indent=2)
+
+        if options["baseline"]:
+            with open(options["baseline"]) as fh:
+                baseline = json.load(fh)
+            regressions = find_regressions(results, baseline, options["threshold"])
+            for regression in regressions:
+                self.stderr.write(
+                    f"❌ {regression['stage']} @ {regression['rows']} rows: {regression['median_s'] * 1000:.3f} ms "
+                    f"vs {regression['baseline_median_s'] * 1000:.3f} ms (+{regression['slowdown']:.0%})"
+                )
+            if regressions:
+                raise CommandError(f"{len(regressions)} benchmark(s) regressed beyond {options['threshold']:.0%}")
+            self.stdout.write(self.style.SUCCESS("✅ No regressions against the baseline"))
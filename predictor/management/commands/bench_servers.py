@@ -0,0 +1,146 @@
+import itertools
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+PAYLOAD = {
+    "Study_Hours_Per_Day": 3,
+    "Extracurricular_Hours_Per_Day": 1,
+    "Sleep_Hours_Per_Day": 8,
+    "Social_Hours_Per_Day": 2,
+    "Physical_Activity_Hours_Per_Day": 1,
+    "Stress_Level": 1,
+    "StudyHoursPerWeek": 30,
+    "AttendanceRate": 80,
+    "Gender": "Male",
+    "Major": "Science",
+    "PartTimeJob": "Yes",
+    "ExtraCurricularActivities": "No",
+}
+
+
+def server_command(target, workers, port):
+    if target == "wsgi":
+        return [sys.executable, "-m", "gunicorn", "student_performance1.wsgi",
+                "--workers", str(workers), "--bind", f"127.0.0.1:{port}", "--log-level", "warning"]
+    return [sys.executable, "-m", "uvicorn", "student_performance1.asgi:application",
+            "--workers", str(workers), "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"]
+
+
+TARGET_PATHS = {
+    "wsgi": "/api/predictor/predict/",
+    "asgi": "/api/predictor/predict/async/",
+}
+
+
+def wait_for_port(port, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def run_load(url, total, concurrency):
+    """Send ``total`` predict requests from ``concurrency`` keep-alive clients."""
+    counter = itertools.count()
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+
+    def client(worker):
+        session = requests.Session()
+        local = []
+        local_errors = 0
+        while next(counter) < total:
+            payload = dict(PAYLOAD, username=f"bench-{worker}")
+            start = time.perf_counter()
+            try:
+                response = session.post(url, json=payload, timeout=30)
+                ok = response.status_code == 200
+            except requests.RequestException:
+                ok = False
+            local.append(time.perf_counter() - start)
+            local_errors += not ok
+        with lock:
+            latencies.extend(local)
+            errors[0] += local_errors
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(client, range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(quantiles[49] * 1000, 2),
+        "p95_ms": round(quantiles[94] * 1000, 2),
+        "p99_ms": round(quantiles[98] * 1000, 2),
+    }
+
+
+class Command(BaseCommand):
+    help = ("Benchmark the sync predict endpoint under gunicorn (WSGI) against the async one "
+            "under uvicorn (ASGI) with the same number of worker processes.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--targets", default="wsgi,asgi", help="Comma-separated: wsgi, asgi")
+        parser.add_argument("--workers", type=int, default=2, help="Worker processes per server")
+        parser.add_argument("--concurrency", type=int, default=32, help="Concurrent client connections")
+        parser.add_argument("--requests", type=int, default=2000, help="Measured requests per target")
+        parser.add_argument("--warmup", type=int, default=100, help="Unmeasured requests per target")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--output", help="Write the results as JSON to this file")
+
+    def handle(self, *args, **options):
+        targets = [target.strip() for target in options["targets"].split(",") if target.strip()]
+        unknown = [target for target in targets if target not in TARGET_PATHS]
+        if unknown:
+            raise CommandError(f"Unknown targets: {', '.join(unknown)}")
+        if options["requests"] < 2:
+            raise CommandError("--requests must be at least 2")
+
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get("DJANGO_SETTINGS_MODULE", "student_performance1.settings"))
+        results = {"workers": options["workers"], "concurrency": options["concurrency"], "targets": {}}
+
+        for target in targets:
+            port = options["port"]
+            self.stderr.write(f"🚀 Starting {target} server with {options['workers']} workers...")
+            server = subprocess.Popen(server_command(target, options["workers"], port), cwd=settings.BASE_DIR, env=env)
+            try:
+                if not wait_for_port(port, timeout=60):
+                    raise CommandError(f"{target} server did not start on port {port}")
+                url = f"http://127.0.0.1:{port}{TARGET_PATHS[target]}"
+                run_load(url, options["warmup"], options["concurrency"])
+                results["targets"][target] = run_load(url, options["requests"], options["concurrency"])
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+
+        for target, stats in results["targets"].items():
+            self.stdout.write(
+                f"{target:5} {stats['throughput_rps']:>8} req/s  p50 {stats['p50_ms']:>8} ms  "
+                f"p95 {stats['p95_ms']:>8} ms  p99 {stats['p99_ms']:>8} ms  errors {stats['errors']}"
+            )
+
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                json.dump(results, fh, indent=2)
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from predictor import datasets
+
+
+class Command(BaseCommand):
+    help = ("Convert the training CSVs into the columnar (Parquet) dataset cache, "
+            "keyed by the CSV content hash.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rebuild", action="store_true",
+                            help="Rebuild the cache even when it matches the current CSVs")
+
+    def handle(self, *args, **options):
+        for name in (datasets.LIFESTYLE, datasets.PERFORMANCE):
+            try:
+                path = datasets.dataset_path(name, rebuild=options["rebuild"])
+            except (OSError, ValueError) as e:
+                raise CommandError(str(e))
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ {name}: {datasets.dataset_row_count(name)} rows cached at {path}"
+            ))
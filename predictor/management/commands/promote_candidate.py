@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from predictor.shadow import promote_candidate
+
+
+class Command(BaseCommand):
+    help = ("Publish the shadow-mode candidate bundle as the live model bundle. "
+            "Train a candidate with `manage.py train_models --bundle <live bundle>.candidate`.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--candidate", help="Candidate bundle (default: PREDICTOR_SHADOW['BUNDLE_PATH'])")
+        parser.add_argument("--bundle", help="Live bundle path (default: PREDICTOR_MODEL_BUNDLE_PATH)")
+        parser.add_argument("--lock-timeout", type=float,
+                            help="Seconds to wait for a running training (default: wait forever)")
+
+    def handle(self, *args, **options):
+        try:
+            version = promote_candidate(
+                candidate_path=options["candidate"],
+                bundle_path=options["bundle"],
+                lock_timeout=options["lock_timeout"],
+            )
+        except (OSError, ValueError, TimeoutError) as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(f"✅ Promoted model bundle {version}"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from predictor.aggregates import rebuild_aggregates
+
+
+class Command(BaseCommand):
+    help = "Recompute the analytics aggregates from every saved prediction."
+
+    def handle(self, *args, **options):
+        rows = rebuild_aggregates()
+        self.stdout.write(self.style.SUCCESS(f"✅ Rebuilt {rows} aggregate rows"))
@@ -0,0 +1,37 @@
+import pandas as pd
+from django.core.management.base import BaseCommand, CommandError
+
+from predictor.incremental import retrain_incrementally
+
+
+class Command(BaseCommand):
+    help = ("Fold labelled rows (raw columns + GPA) into the saved training statistics "
+            "and publish a re-solved model bundle without refitting from scratch.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lifestyle", help="CSV of new labelled lifestyle rows")
+        parser.add_argument("--performance", help="CSV of new labelled performance rows")
+        parser.add_argument("--reset", action="store_true",
+                            help="Rebuild the statistics from the training datasets first")
+        parser.add_argument("--bundle", help="Bundle path (default: PREDICTOR_MODEL_BUNDLE_PATH)")
+        parser.add_argument("--stats", help="Statistics path (default: PREDICTOR_TRAINING_STATS_PATH)")
+        parser.add_argument("--lock-timeout", type=float,
+                            help="Seconds to wait for another training run (default: wait forever)")
+
+    def handle(self, *args, **options):
+        try:
+            lifestyle = pd.read_csv(options["lifestyle"]) if options["lifestyle"] else None
+            performance = pd.read_csv(options["performance"]) if options["performance"] else None
+            version, absorbed = retrain_incrementally(
+                lifestyle_rows=lifestyle,
+                performance_rows=performance,
+                bundle_path=options["bundle"],
+                stats_path=options["stats"],
+                reset=options["reset"],
+                lock_timeout=options["lock_timeout"],
+            )
+        except (OSError, ValueError, TimeoutError) as e:
+            raise CommandError(str(e))
+
+        rows = ", ".join(f"{count} {stage}" for stage, count in absorbed.items()) or "no new"
+        self.stdout.write(self.style.SUCCESS(f"✅ Absorbed {rows} rows; published model bundle {version}"))
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from predictor.bulk_scoring import BINARY_OUTPUT_FORMATS, OUTPUT_FORMATS, render_chunks, score_csv
+
+
+class Command(BaseCommand):
+    help = "Score a student CSV export chunk by chunk and write GPAs as CSV, NDJSON, Arrow or MessagePack."
+
+    def add_arguments(self, parser):
+        parser.add_argument("input", help="CSV with the lifestyle and performance columns")
+        parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+        parser.add_argument("--format", choices=sorted(OUTPUT_FORMATS), default="csv")
+        parser.add_argument("--chunk-size", type=int, help="Rows per chunk (default: PREDICTOR_CSV_CHUNK_SIZE)")
+
+    def handle(self, *args, **options):
+        binary = options["format"] in BINARY_OUTPUT_FORMATS
+        if binary and not options["output"]:
+            raise CommandError(f"--output is required for {options['format']} output")
+        try:
+            chunks = score_csv(options["input"], chunk_size=options["chunk_size"])
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        rows = [0]
+
+        def counted(chunks):
+            for chunk in chunks:
+                rows[0] += len(chunk)
+                yield chunk
+
+        if binary:
+            out = open(options["output"], "wb")
+        else:
+            out = open(options["output"], "w", newline="") if options["output"] else self.stdout
+        try:
+            for text in render_chunks(counted(chunks), options["format"]):
+                out.write(text)
+        finally:
+            if out is not self.stdout:
+                out.close()
+
+        self.stderr.write(self.style.SUCCESS(f"✅ Scored {rows[0]} rows"))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from predictor.training import train_models_locked
+
+
+class Command(BaseCommand):
+    help = "Train the lifestyle & performance models and publish them as one model bundle."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--if-missing", action="store_true",
+                            help="Only train when no model bundle exists yet")
+        parser.add_argument("--bundle", help="Bundle path (default: PREDICTOR_MODEL_BUNDLE_PATH)")
+        parser.add_argument("--lock-timeout", type=float,
+                            help="Seconds to wait for another training run (default: wait forever)")
+        parser.add_argument("--select", action="store_true",
+                            help="Pick each model by k-fold CV over several regressors & hyperparameters")
+        parser.add_argument("--folds", type=int, help="CV folds for --select (default: 5)")
+        parser.add_argument("--jobs", type=int,
+                            help="Parallel CV workers for --select (-1 = all cores, default: PREDICTOR_SELECTION_N_JOBS)")
+
+    def handle(self, *args, **options):
+        try:
+            version = train_models_locked(
+                bundle_path=options["bundle"],
+                force=not options["if_missing"],
+                lock_timeout=options["lock_timeout"],
+                select=options["select"],
+                folds=options["folds"],
+                n_jobs=options["jobs"],
+            )
+        except (TimeoutError, ValueError) as e:
+            raise CommandError(str(e))
+
+        if version is None:
+            self.stdout.write("✅ Model bundle already present. Skipping training.")
+        else:
+            self.stdout.write(self.style.SUCCESS(f"✅ Trained model bundle {version}"))
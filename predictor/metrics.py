@@ -0,0 +1,235 @@
+import threading
+import time
+from bisect import bisect_left
+
+# ✅ Latency buckets in seconds, from 50us up to 10s
+DEFAULT_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _format_labels(label_names, label_values, extra=None):
+    pairs = list(zip(label_names, label_values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (
+        name + '="' + str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for name, value in pairs
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _HistogramSeries:
+    __slots__ = ("_bounds", "_counts", "_sum", "_lock")
+
+    def __init__(self, bounds):
+        self._bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self):
+        with self._lock:
+            return list(self._counts), self._sum
+
+
+class Histogram:
+    """Prometheus-style histogram with fixed buckets and optional labels.
+
+    ``observe`` is a bisect plus one uncontended lock per labelled series,
+    cheap enough to leave on for every request.
+    """
+
+    metric_type = "histogram"
+
+    def __init__(self, name, documentation, label_names=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *label_values):
+        series = self._series.get(label_values)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(label_values, _HistogramSeries(self.buckets))
+        return series
+
+    def observe(self, value, *label_values):
+        self.labels(*label_values).observe(value)
+
+    def render(self):
+        # ✅ Snapshot first: labels() may add a series while we iterate
+        with self._lock:
+            items = sorted(self._series.items())
+        lines = []
+        for label_values, series in items:
+            counts, total = series.snapshot()
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(self.label_names, label_values, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    metric_type = "counter"
+
+    def __init__(self, name, documentation, label_names=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values):
+        return self._values.get(label_values, 0)
+
+    def render(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}"
+                for labels, value in items]
+
+
+STAGE_LATENCY = Histogram(
+    "predictor_stage_duration_seconds",
+    "Time spent in each stage of the prediction path.",
+    label_names=("stage",),
+)
+ERRORS = Counter(
+    "predictor_errors_total",
+    "Errors raised in the prediction path, by stage and exception type.",
+    label_names=("stage", "type"),
+)
+WRITE_BEHIND_FLUSH_LATENCY = Histogram(
+    "predictor_write_behind_flush_duration_seconds",
+    "Time taken by one write-behind bulk_create flush.",
+)
+
+SHADOW_LATENCY = Histogram(
+    "predictor_shadow_duration_seconds",
+    "Scoring time of requests replayed in shadow mode, by model role (live or candidate).",
+    label_names=("model",),
+)
+
+METRICS = [STAGE_LATENCY, ERRORS, WRITE_BEHIND_FLUSH_LATENCY, SHADOW_LATENCY]
+
+
+class timed:
+    """Context manager recording the wrapped block under ``stage``.
+
+    Exceptions escaping the block are counted in ``ERRORS`` by type and
+    re-raised unchanged.
+    """
+
+    __slots__ = ("_series", "_stage", "_start")
+
+    def __init__(self, stage):
+        self._stage = stage
+        self._series = STAGE_LATENCY.labels(stage)
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self._series.observe(time.perf_counter() - self._start)
+        if exc_type is not None:
+            ERRORS.inc(self._stage, exc_type.__name__)
+        return False
+
+
+def observe_stage(stage, seconds):
+    """Record a duration measured by the caller (e.g. summed over two steps)."""
+    STAGE_LATENCY.labels(stage).observe(seconds)
+
+
+def record_error(stage, error_type):
+    """Count an error that was handled without an exception (e.g. a 400)."""
+    ERRORS.inc(stage, error_type)
+
+
+def _runtime_samples():
+    """Gauges & counters read from the cache, write-behind buffer and registry."""
+    # ✅ Import inside function to prevent circular imports
+    from predictor import writebehind
+    from predictor.cache import get_prediction_cache
+    from predictor.registry import get_model_registry
+
+    samples = []
+    version = get_model_registry().version
+    if version is not None:
+        samples.append(("predictor_model_info", "gauge", "Active model bundle version.",
+                        [({"version": version}, 1)]))
+
+    cache = get_prediction_cache()
+    if cache is not None:
+        stats = cache.stats()
+        samples.append(("predictor_cache_hits_total", "counter", "Prediction cache hits.",
+                        [({"backend": stats["backend"]}, stats["hits"])]))
+        samples.append(("predictor_cache_misses_total", "counter", "Prediction cache misses.",
+                        [({"backend": stats["backend"]}, stats["misses"])]))
+
+    if writebehind.write_behind_enabled():
+        stats = writebehind.get_write_behind_buffer().stats()
+        samples.append(("predictor_write_behind_queue_depth", "gauge", "Predictions waiting to be flushed.",
+                        [({}, stats["queue_depth"])]))
+        for key in ("enqueued", "flushed", "failed", "sync_fallbacks"):
+            samples.append((f"predictor_write_behind_{key}_total", "counter",
+                            f"Write-behind rows {key.replace('_', ' ')}.", [({}, stats[key])]))
+    return samples
+
+
+_collectors = [_runtime_samples]
+
+
+def register_collector(collector):
+    """Add ``collector() -> [(name, type, help, [(labels, value)])]`` to the scrape output."""
+    if collector not in _collectors:
+        _collectors.append(collector)
+
+
+def render_prometheus():
+    """All predictor metrics of this process in Prometheus text format 0.0.4."""
+    lines = []
+    for metric in METRICS:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.metric_type}")
+        lines.extend(metric.render())
+
+    samples = [sample for collector in _collectors for sample in collector()]
+    for name, metric_type, documentation, values in samples:
+        lines.append(f"# HELP {name} {documentation}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for labels, value in values:
+            label_text = _format_labels(tuple(labels), tuple(labels.values()))
+            lines.append(f"{name}{label_text} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,56 @@
+# Generated by Django 4.2.18 on 2026-10-18 18:13
+
+from django.db import migrations, models
+from django.db.models import Count, F, Max, Min, Sum
+
+
+def build_aggregates(apps, schema_editor):
+    # ✅ Seed the aggregates from the predictions saved before this migration
+    StudentPerformance = apps.get_model('predictor', 'StudentPerformance')
+    PredictionAggregate = apps.get_model('predictor', 'PredictionAggregate')
+
+    predictions = StudentPerformance.objects.exclude(GPA=None)
+    statistics = {
+        'count': Count('id'),
+        'total': Sum('GPA'),
+        'total_squares': Sum(F('GPA') * F('GPA')),
+        'minimum': Min('GPA'),
+        'maximum': Max('GPA'),
+    }
+    rows = []
+    overall = predictions.aggregate(**statistics)
+    if overall['count']:
+        rows.append(PredictionAggregate(dimension='all', value='', **overall))
+    for dimension in ['Major', 'Gender', 'Stress_Level']:
+        for group in predictions.values(dimension).annotate(**statistics).order_by():
+            value = group.pop(dimension)
+            rows.append(PredictionAggregate(dimension=dimension, value='' if value is None else str(value), **group))
+    PredictionAggregate.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictor', '0002_studentperformance_attendancerate_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PredictionAggregate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(max_length=50)),
+                ('value', models.CharField(blank=True, max_length=255)),
+                ('count', models.BigIntegerField(default=0)),
+                ('total', models.FloatField(default=0.0)),
+                ('total_squares', models.FloatField(default=0.0)),
+                ('minimum', models.FloatField(blank=True, null=True)),
+                ('maximum', models.FloatField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='predictionaggregate',
+            constraint=models.UniqueConstraint(fields=('dimension', 'value'), name='unique_prediction_aggregate'),
+        ),
+        migrations.RunPython(build_aggregates, migrations.RunPython.noop),
+    ]
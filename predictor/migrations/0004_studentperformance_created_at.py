@@ -0,0 +1,28 @@
+# Generated by Django 4.2.18 on 2026-10-18 18:14
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictor', '0003_predictionaggregate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentperformance',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='studentperformance',
+            index=models.Index(fields=['username', 'created_at', 'id'], name='prediction_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentperformance',
+            index=models.Index(fields=['Major', 'created_at', 'id'], name='prediction_major_created_idx'),
+        ),
+    ]
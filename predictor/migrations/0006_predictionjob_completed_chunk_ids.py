@@ -0,0 +1,22 @@
+# Generated by Django 4.2.18 on 2026-10-18 21:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictor', '0005_predictionjob'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='predictionjob',
+            name='completed_chunks',
+        ),
+        migrations.AddField(
+            model_name='predictionjob',
+            name='completed_chunk_ids',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.18 on 2026-10-18 21:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictor', '0006_predictionjob_completed_chunk_ids'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='predictionaggregate',
+            name='unique_prediction_aggregate',
+        ),
+        migrations.AddField(
+            model_name='predictionaggregate',
+            name='shard',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddConstraint(
+            model_name='predictionaggregate',
+            constraint=models.UniqueConstraint(fields=('dimension', 'value', 'shard'), name='unique_prediction_aggregate'),
+        ),
+    ]
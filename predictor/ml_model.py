@@ -1,20 +1,23 @@
 import os
-import joblib
-# import numpy as np
+import time
+import numpy as np
 import pandas as pd
+import sklearn
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 from sklearn.linear_model import LinearRegression
 from django.conf import settings
 
-# ✅ Define Paths
-MODEL_PATH_LIFESTYLE = os.path.join(settings.BASE_DIR, "predictor", "student_lifestyle_model.pkl")
-SCALER_PATH_LIFESTYLE = os.path.join(settings.BASE_DIR, "predictor", "student_lifestyle_scaler.pkl")
-
-MODEL_PATH_PERFORMANCE = os.path.join(settings.BASE_DIR, "predictor", "student_performance_model.pkl")
-SCALER_PATH_PERFORMANCE = os.path.join(settings.BASE_DIR, "predictor", "student_performance_scaler.pkl")
+from predictor import datasets
+from predictor.bundle import write_model_bundle
+from predictor.compiled import LIFESTYLE_GPA_FEATURE, CompiledPredictor, scaler_moments
+from predictor.features import BINARY_COLUMNS, BINARY_MAPPING, CATEGORICAL_COLUMNS
+from predictor.metrics import observe_stage, timed
 
-FEATURES_PATH = os.path.join(settings.BASE_DIR, "predictor", "performance_features.pkl")
+# ✅ Define Paths
+# Both trained models, their scalers, feature order & metadata (see predictor.bundle)
+MODEL_BUNDLE_PATH = os.path.join(settings.BASE_DIR, "predictor", "student_model.bundle")
 
 DATA_LIFESTYLE_PATH = os.path.join(settings.BASE_DIR, "predictor", "student_lifestyle_dataset.csv")
 DATA_PERFORMANCE_PATH = os.path.join(settings.BASE_DIR, "predictor", "student_performance_data.csv")
@@ -24,34 +27,48 @@ def encode_categorical_features(df):
     """Convert categorical columns into numeric values using one-hot encoding."""
 
     # ✅ Convert binary categorical values ('Yes'/'No') to numeric (1/0)
-    binary_columns = ["PartTimeJob", "ExtraCurricularActivities"]
-    for col in binary_columns:
+    for col in BINARY_COLUMNS:
         if col in df.columns:
-            df[col] = df[col].map({'Yes': 1, 'No': 0}).fillna(0).astype(int)
+            df[col] = df[col].map(BINARY_MAPPING).fillna(0).astype(int)
 
     # ✅ Apply One-Hot Encoding to categorical variables (Gender, Major)
-    df = pd.get_dummies(df, columns=["Gender", "Major"], drop_first=True)
+    df = pd.get_dummies(df, columns=CATEGORICAL_COLUMNS, drop_first=True)
 
     return df
 
 
+def load_lifestyle_dataset():
+    """Lifestyle features & GPA target, from the columnar cache of the lifestyle CSV."""
+    # ✅ ID column is dropped & the GPA column guaranteed by the cached schema
+    df = datasets.read_dataset(datasets.LIFESTYLE)
+    y = df.pop('GPA')
+    return df, y
+
+
+def load_performance_dataset():
+    """Encoded performance features, GPA target & category vocabularies, from the
+    columnar cache of the performance CSV (categoricals are already one-hot encoded)."""
+    df_performance = datasets.read_dataset(datasets.PERFORMANCE)
+    vocabularies = datasets.dataset_metadata(datasets.PERFORMANCE)["vocabularies"]
+
+    # ✅ Ensure `GPA` is removed before saving feature names
+    y = df_performance.pop('GPA')
+    return df_performance, y, vocabularies
+
+
+def split_training_data(X, y):
+    """The fixed train/test split every training mode uses."""
+    return train_test_split(X, y, test_size=0.2, random_state=42)
+
+
 def train_lifestyle_model():
     """Train model based on lifestyle dataset"""
     print("🚀 Training lifestyle model...")
 
-    df = pd.read_csv(DATA_LIFESTYLE_PATH)
-
-    # ✅ Drop ID column if it exists
-    df.drop(columns=['Student_ID'], errors='ignore', inplace=True)
-
-    # ✅ Ensure `GPA` is removed from features
-    if 'GPA' in df.columns:
-        y = df.pop('GPA')
-    else:
-        raise ValueError("❌ 'GPA' column is missing from lifestyle dataset!")
+    df, y = load_lifestyle_dataset()
 
     # ✅ Train/Test Split
-    X_train, X_test, y_train, y_test = train_test_split(df, y, test_size=0.2, random_state=42)
+    X_train, X_test, y_train, y_test = split_training_data(df, y)
 
     # ✅ Normalize features
     scaler = StandardScaler()
@@ -62,39 +79,31 @@ def train_lifestyle_model():
     model = LinearRegression()
     model.fit(X_train_scaled, y_train)
 
-    # ✅ Save model & scaler
-    joblib.dump(model, MODEL_PATH_LIFESTYLE)
-    joblib.dump(scaler, SCALER_PATH_LIFESTYLE)
+    metrics = evaluate_model(model, X_train_scaled, X_test_scaled, y_test)
+    print(f"✅ Lifestyle Model trained: {metrics}")
 
-    print(f"✅ Lifestyle Model saved at: {MODEL_PATH_LIFESTYLE}")
+    return {
+        "model": model,
+        "scaler": scaler,
+        "features": df.columns.tolist(),
+        "metrics": metrics,
+        "data_sha256": datasets.source_sha256(datasets.LIFESTYLE),
+    }
 
 
 def train_performance_model():
     """Train model based on performance dataset"""
     print("🚀 Training performance model...")
 
-    df_performance = pd.read_csv(DATA_PERFORMANCE_PATH)
-
-    # ✅ Drop ID columns if they exist
-    df_performance.drop(columns=['Student_ID'], errors='ignore', inplace=True)
+    df_performance, y, vocabularies = load_performance_dataset()
 
-    # ✅ Encode categorical variables using One-Hot Encoding
-    df_performance = encode_categorical_features(df_performance)
-
-    # ✅ Ensure `GPA` is removed before saving feature names
-    if 'GPA' in df_performance.columns:
-        y = df_performance.pop('GPA')
-    else:
-        raise ValueError("❌ 'GPA' column is missing from dataset!")
-
-    # ✅ Save updated feature names
+    # ✅ Keep updated feature names
     trained_features = df_performance.columns.tolist()
-    joblib.dump(trained_features, FEATURES_PATH)
 
-    print("🔹 Saved Training Feature Names (Ordered):", trained_features)
+    print("🔹 Training Feature Names (Ordered):", trained_features)
 
     # ✅ Train/Test Split
-    X_train, X_test, y_train, y_test = train_test_split(df_performance, y, test_size=0.2, random_state=42)
+    X_train, X_test, y_train, y_test = split_training_data(df_performance, y)
 
     # ✅ Normalize features
     scaler = StandardScaler()
@@ -105,61 +114,213 @@ def train_performance_model():
     model = LinearRegression()
     model.fit(X_train_scaled, y_train)
 
-    # ✅ Save model & scaler
-    joblib.dump(model, MODEL_PATH_PERFORMANCE)
-    joblib.dump(scaler, SCALER_PATH_PERFORMANCE)
+    metrics = evaluate_model(model, X_train_scaled, X_test_scaled, y_test)
+    print(f"✅ Performance Model trained: {metrics}")
 
-    print(f"✅ Performance Model saved successfully at: {MODEL_PATH_PERFORMANCE}")
+    return {
+        "model": model,
+        "scaler": scaler,
+        "features": trained_features,
+        "vocabularies": vocabularies,
+        "metrics": metrics,
+        "data_sha256": datasets.source_sha256(datasets.PERFORMANCE),
+    }
 
 
-def predict_student_performance(lifestyle_data, performance_data):
-    """Predicts GPA using both lifestyle and performance models."""
+def evaluate_model(model, X_train_scaled, X_test_scaled, y_test):
+    """Score a fitted model on the held-out split."""
+    predictions = model.predict(X_test_scaled)
+    return {
+        "train_rows": int(len(X_train_scaled)),
+        "test_rows": int(len(X_test_scaled)),
+        "r2": float(r2_score(y_test, predictions)),
+        "mae": float(mean_absolute_error(y_test, predictions)),
+        "rmse": float(np.sqrt(mean_squared_error(y_test, predictions))),
+    }
 
-    try:
-        # ✅ Load models & scalers
-        lifestyle_model = joblib.load(MODEL_PATH_LIFESTYLE)
-        lifestyle_scaler = joblib.load(SCALER_PATH_LIFESTYLE)
-        performance_model = joblib.load(MODEL_PATH_PERFORMANCE)
-        performance_scaler = joblib.load(SCALER_PATH_PERFORMANCE)
-        features_list = joblib.load(FEATURES_PATH)  # Ensure correct feature order
-    except Exception as e:
-        raise ValueError(f"❌ Model loading failed: {str(e)}")
-
-    # ✅ Convert lifestyle data into DataFrame
-    lifestyle_df = pd.DataFrame([lifestyle_data])
 
-    # ✅ Convert performance data into DataFrame & encode categorical features
-    performance_df = pd.DataFrame([performance_data])
-    performance_df = encode_categorical_features(performance_df)
+def model_bundle_path():
+    return getattr(settings, "PREDICTOR_MODEL_BUNDLE_PATH", None) or MODEL_BUNDLE_PATH
 
-    # ✅ Normalize lifestyle features
-    lifestyle_scaled = lifestyle_scaler.transform(lifestyle_df)
 
-    # ✅ Predict lifestyle impact on performance
-    lifestyle_gpa_prediction = lifestyle_model.predict(lifestyle_scaled)
+def train_models(bundle_path=None, select=False, folds=None, n_jobs=None):
+    """Train both models and save them together as one model bundle.
 
-    # ✅ Add predicted GPA as a new feature to performance data
-    performance_df["Predicted_Lifestyle_GPA"] = lifestyle_gpa_prediction
+    With ``select`` each model is picked by parallel k-fold CV over the
+    candidates of :mod:`predictor.model_selection` instead of a plain
+    ``LinearRegression``.
+    """
+    bundle_path = bundle_path or model_bundle_path()
 
-    # ✅ Ensure performance_df has the correct feature order
-    missing_features = [col for col in features_list if col not in performance_df.columns]
-    for feature in missing_features:
-        performance_df[feature] = 0  # Add missing features with default values
+    if select:
+        # ✅ Import inside function to prevent circular imports
+        from predictor.model_selection import DEFAULT_FOLDS, select_lifestyle_model, select_performance_model
 
-    # ✅ Normalize performance data
-    performance_scaled = performance_scaler.transform(performance_df[features_list])
+        lifestyle = select_lifestyle_model(folds=folds or DEFAULT_FOLDS, n_jobs=n_jobs)
+        performance = select_performance_model(folds=folds or DEFAULT_FOLDS, n_jobs=n_jobs)
+    else:
+        lifestyle = train_lifestyle_model()
+        performance = train_performance_model()
+    version = save_model_bundle(lifestyle, performance, bundle_path)
+
+    print(f"✅ Model bundle {version} saved at: {bundle_path}")
+    return version
+
+
+def save_model_bundle(lifestyle, performance, bundle_path):
+    """Write trained stages (as returned by the train functions) to a bundle.
+
+    Scaler moments and coefficients are stored as raw arrays, together with
+    the compiled affine predictor; feature order, category vocabularies,
+    training data hashes and metrics go in the header.
+    """
+    compiled = CompiledPredictor.from_pipeline(
+        lifestyle["model"], lifestyle["scaler"],
+        performance["model"], performance["scaler"], performance["features"],
+    )
+
+    arrays = {
+        "lifestyle_mean": lifestyle["scaler"].mean_,
+        "lifestyle_scale": lifestyle["scaler"].scale_,
+        "lifestyle_coef": lifestyle["model"].coef_,
+        "lifestyle_intercept": [lifestyle["model"].intercept_],
+        "performance_mean": performance["scaler"].mean_,
+        "performance_scale": performance["scaler"].scale_,
+        "performance_coef": performance["model"].coef_,
+        "performance_intercept": [performance["model"].intercept_],
+        "compiled_weights": compiled.weights,
+        "compiled_bias": [compiled.bias],
+    }
+    metadata = {
+        "lifestyle_features": list(lifestyle["features"]),
+        "performance_features": list(performance["features"]),
+        "category_vocabularies": performance.get("vocabularies", {}),
+        "compiled": {
+            "numeric_fields": compiled.numeric_fields,
+            "category_weights": compiled.category_weights,
+        },
+        "training_data": {
+            "lifestyle_sha256": lifestyle.get("data_sha256"),
+            "performance_sha256": performance.get("data_sha256"),
+        },
+        "metrics": {
+            "lifestyle": lifestyle.get("metrics", {}),
+            "performance": performance.get("metrics", {}),
+        },
+        "sklearn_version": sklearn.__version__,
+    }
+    if lifestyle.get("selection") or performance.get("selection"):
+        metadata["model_selection"] = {
+            "lifestyle": lifestyle.get("selection"),
+            "performance": performance.get("selection"),
+        }
+    return write_model_bundle(bundle_path, arrays, metadata)
+
+
+def _resolve_artifacts(artifacts):
+    if artifacts is None:
+        # ✅ Import inside function to prevent circular imports
+        from predictor.registry import get_model_registry
+        with timed("model_load"):
+            artifacts = get_model_registry().current()
+    return artifacts
+
+
+def predict_student_performance(lifestyle_data, performance_data, artifacts=None):
+    """Predicts GPA using both lifestyle and performance models.
+
+    ``artifacts`` is a :class:`predictor.registry.ModelArtifacts` snapshot;
+    when omitted the registry's active snapshot is used.
+    """
+
+    predictions = predict_student_performance_batch([lifestyle_data], [performance_data], artifacts=artifacts)
+
+    return predictions[0]  # Return single predicted GPA value
+
+
+def predict_student_performance_batch(lifestyle_rows, performance_rows, artifacts=None):
+    """Predicts GPA for many students in one vectorized pass.
+
+    ``lifestyle_rows`` and ``performance_rows`` are equally long sequences of
+    dicts (or DataFrames) with the raw input fields. Returns a numpy array
+    with one GPA per row.
+    """
+
+    # ✅ Models & scalers are loaded once per process by the registry
+    artifacts = _resolve_artifacts(artifacts)
+
+    with timed("categorical_encoding"):
+        if len(lifestyle_rows) != len(performance_rows):
+            raise ValueError("❌ Lifestyle and performance rows must have the same length")
+        if not len(lifestyle_rows):
+            return np.empty(0)
+
+        # ✅ Encode straight into the trained feature order (no DataFrames);
+        #    the lifestyle GPA column stays 0 until it is filled in below
+        lifestyle_matrix = artifacts.lifestyle_schema.encode(lifestyle_rows)
+        performance_matrix = artifacts.feature_schema.encode(performance_rows)
+
+    # ✅ Normalize lifestyle features (in place) & predict lifestyle impact for all rows at once
+    start = time.perf_counter()
+    lifestyle_scaled = _scale_in_place(lifestyle_matrix, artifacts.lifestyle_scaler)
+    scaling_seconds = time.perf_counter() - start
+
+    with timed("lifestyle_predict"):
+        lifestyle_gpa_prediction = artifacts.lifestyle_model.predict(lifestyle_scaled)
+
+    # ✅ Add predicted GPA as a feature to performance data & normalize
+    start = time.perf_counter()
+    if LIFESTYLE_GPA_FEATURE in artifacts.features_list:
+        performance_matrix[:, artifacts.features_list.index(LIFESTYLE_GPA_FEATURE)] = lifestyle_gpa_prediction
+    performance_scaled = _scale_in_place(performance_matrix, artifacts.performance_scaler)
+    observe_stage("scaling", scaling_seconds + time.perf_counter() - start)
 
     # ✅ Predict final GPA
-    final_gpa_prediction = performance_model.predict(performance_scaled)
+    with timed("performance_predict"):
+        return artifacts.performance_model.predict(performance_scaled)
+
+
+def _scale_in_place(matrix, scaler):
+    """``scaler.transform(matrix)``, overwriting the freshly encoded ``matrix``."""
+    mean, scale = scaler_moments(scaler, matrix.shape[1])
+    matrix -= mean
+    matrix /= scale
+    return matrix
+
+
+def predict_gpa(lifestyle_data, performance_data, artifacts=None):
+    """Predicts one GPA with the configured inference backend.
+
+    By default this is the compiled affine predictor (a dot product);
+    set ``PREDICTOR_USE_COMPILED = False`` to run the sklearn pipeline.
+    """
+    artifacts = _resolve_artifacts(artifacts)
+    if getattr(settings, "PREDICTOR_USE_COMPILED", True):
+        # ✅ Encoding, scaling & both models collapse into one dot product here
+        with timed("compiled_predict"):
+            artifacts.feature_schema.check_categories([performance_data])
+            predicted_gpa = artifacts.compiled.predict(lifestyle_data, performance_data)
+    else:
+        predicted_gpa = predict_student_performance(lifestyle_data, performance_data, artifacts=artifacts)
+    return predicted_gpa
+
 
-    return final_gpa_prediction[0]  # Return single predicted GPA value
+def predict_gpa_batch(lifestyle_rows, performance_rows, artifacts=None):
+    """Batch counterpart of :func:`predict_gpa`; returns a numpy array."""
+    artifacts = _resolve_artifacts(artifacts)
+    if getattr(settings, "PREDICTOR_USE_COMPILED", True):
+        with timed("compiled_predict"):
+            artifacts.feature_schema.check_categories(performance_rows)
+            predictions = artifacts.compiled.predict_batch(lifestyle_rows, performance_rows)
+    else:
+        predictions = predict_student_performance_batch(lifestyle_rows, performance_rows, artifacts=artifacts)
+    return predictions
 
 
 # ✅ Train models only when this file is run directly
 if __name__ == "__main__":
     try:
         print("🚀 Training Models on Startup...")
-        train_lifestyle_model()
-        train_performance_model()
+        train_models()
     except Exception as e:
         print(f"❌ Model training error: {str(e)}")
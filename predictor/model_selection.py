@@ -0,0 +1,156 @@
+import itertools
+import logging
+import time
+
+import numpy as np
+from django.conf import settings
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.linear_model import ElasticNet, Lasso, LinearRegression, Ridge
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import KFold
+from sklearn.preprocessing import StandardScaler
+
+from predictor import datasets, ml_model
+
+logger = logging.getLogger(__name__)
+
+# ✅ Linear regressors only: the bundle & compiled predictor store coef_ / intercept_
+CANDIDATES = [
+    ("LinearRegression", LinearRegression(), {}),
+    ("Ridge", Ridge(), {"alpha": [0.1, 1.0, 10.0, 100.0]}),
+    ("Lasso", Lasso(max_iter=10000), {"alpha": [0.0001, 0.001, 0.01, 0.1]}),
+    ("ElasticNet", ElasticNet(max_iter=10000), {"alpha": [0.001, 0.01, 0.1], "l1_ratio": [0.2, 0.5, 0.8]}),
+]
+DEFAULT_FOLDS = 5
+# ✅ joblib workers scoring the (candidate, fold) pairs; -1 = all cores
+DEFAULT_N_JOBS = -1
+
+
+def candidate_grid(candidates=None):
+    """Every ``(name, estimator)`` combination of the candidates' parameter grids."""
+    grid = []
+    for name, estimator, params in candidates or CANDIDATES:
+        keys = sorted(params)
+        for values in itertools.product(*(params[key] for key in keys)):
+            grid.append((name, clone(estimator).set_params(**dict(zip(keys, values)))))
+    return grid
+
+
+def fold_matrices(X, y, folds=DEFAULT_FOLDS, random_state=42):
+    """Scaled ``(X_train, y_train, X_val, y_val)`` per CV fold, computed once.
+
+    The scaler is fitted on each training fold only, so validation rows never
+    leak into the preprocessing. Every candidate reuses these matrices, and
+    joblib memory-maps the large ones into the worker processes.
+    """
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+    matrices = []
+    for train_index, val_index in KFold(n_splits=folds, shuffle=True, random_state=random_state).split(X):
+        scaler = StandardScaler().fit(X[train_index])
+        matrices.append((
+            scaler.transform(X[train_index]), y[train_index],
+            scaler.transform(X[val_index]), y[val_index],
+        ))
+    return matrices
+
+
+def _score_fold(estimator, X_train, y_train, X_val, y_val):
+    start = time.perf_counter()
+    model = clone(estimator).fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+    predictions = model.predict(X_val)
+    return {
+        "r2": float(r2_score(y_val, predictions)),
+        "mae": float(mean_absolute_error(y_val, predictions)),
+        "rmse": float(np.sqrt(mean_squared_error(y_val, predictions))),
+        "fit_seconds": fit_seconds,
+    }
+
+
+def cross_validate_candidates(X, y, candidates=None, folds=DEFAULT_FOLDS, n_jobs=None):
+    """Score every candidate on every fold in parallel.
+
+    ``n_jobs`` defaults to ``PREDICTOR_SELECTION_N_JOBS`` (all cores).
+    Returns one report per candidate, best (lowest mean validation RMSE)
+    first, with the fold-averaged metrics and the summed fit wall time.
+    """
+    if n_jobs is None:
+        n_jobs = getattr(settings, "PREDICTOR_SELECTION_N_JOBS", DEFAULT_N_JOBS)
+    grid = candidate_grid(candidates)
+    matrices = fold_matrices(X, y, folds=folds)
+    scores = Parallel(n_jobs=n_jobs)(
+        delayed(_score_fold)(estimator, *fold) for _, estimator in grid for fold in matrices
+    )
+
+    reports = []
+    for index, (name, estimator) in enumerate(grid):
+        fold_scores = scores[index * len(matrices):(index + 1) * len(matrices)]
+        rmse = [score["rmse"] for score in fold_scores]
+        reports.append({
+            "name": name,
+            "params": {key: value for key, value in estimator.get_params().items()
+                       if key in ("alpha", "l1_ratio")},
+            "estimator": estimator,
+            "cv_r2": float(np.mean([score["r2"] for score in fold_scores])),
+            "cv_mae": float(np.mean([score["mae"] for score in fold_scores])),
+            "cv_rmse": float(np.mean(rmse)),
+            "cv_rmse_std": float(np.std(rmse)),
+            "fit_seconds": float(sum(score["fit_seconds"] for score in fold_scores)),
+        })
+    reports.sort(key=lambda report: report["cv_rmse"])
+    return reports
+
+
+def select_model(X, y, candidates=None, folds=DEFAULT_FOLDS, n_jobs=None):
+    """Pick the best candidate by CV on the training split and refit it.
+
+    Returns a stage dict like :func:`ml_model.train_lifestyle_model`, whose
+    metrics are scored on the untouched test split and which carries the
+    per-candidate ``selection`` report.
+    """
+    X_train, X_test, y_train, y_test = ml_model.split_training_data(X, y)
+
+    start = time.perf_counter()
+    reports = cross_validate_candidates(X_train, y_train, candidates=candidates, folds=folds, n_jobs=n_jobs)
+    search_seconds = time.perf_counter() - start
+    best = reports[0]
+
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train)
+    model = clone(best["estimator"]).fit(X_train_scaled, y_train)
+    metrics = ml_model.evaluate_model(model, X_train_scaled, scaler.transform(X_test), y_test)
+
+    return {
+        "model": model,
+        "scaler": scaler,
+        "features": X.columns.tolist(),
+        "metrics": metrics,
+        "selection": {
+            "folds": folds,
+            "search_seconds": search_seconds,
+            "selected": {"name": best["name"], "params": best["params"]},
+            "candidates": [{key: value for key, value in report.items() if key != "estimator"}
+                           for report in reports],
+        },
+    }
+
+
+def select_lifestyle_model(folds=DEFAULT_FOLDS, n_jobs=None):
+    logger.info("🚀 Selecting lifestyle model...")
+    X, y = ml_model.load_lifestyle_dataset()
+    stage = select_model(X, y, folds=folds, n_jobs=n_jobs)
+    stage["data_sha256"] = datasets.source_sha256(datasets.LIFESTYLE)
+    logger.info(f"✅ Lifestyle model: {stage['selection']['selected']} {stage['metrics']}")
+    return stage
+
+
+def select_performance_model(folds=DEFAULT_FOLDS, n_jobs=None):
+    logger.info("🚀 Selecting performance model...")
+    X, y, vocabularies = ml_model.load_performance_dataset()
+    stage = select_model(X, y, folds=folds, n_jobs=n_jobs)
+    stage["vocabularies"] = vocabularies
+    stage["data_sha256"] = datasets.source_sha256(datasets.PERFORMANCE)
+    logger.info(f"✅ Performance model: {stage['selection']['selected']} {stage['metrics']}")
+    return stage
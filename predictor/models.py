@@ -1,3 +1,6 @@
+import uuid
+
+from django.conf import settings
 from django.db import models
 
 class StudentPerformance(models.Model):
@@ -22,5 +25,110 @@ class StudentPerformance(models.Model):
     # ✅ Predicted GPA
     GPA = models.FloatField(null=True, blank=True)
 
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        # ✅ History is read newest first per user / per major; ``id`` breaks timestamp ties
+        indexes = [
+            models.Index(fields=["username", "created_at", "id"], name="prediction_user_created_idx"),
+            models.Index(fields=["Major", "created_at", "id"], name="prediction_major_created_idx"),
+        ]
+
     def __str__(self):
         return f"{self.username} - Predicted GPA: {self.GPA if self.GPA else 'N/A'}"
+
+
+class PredictionAggregate(models.Model):
+    """Running GPA statistics for one group of saved predictions.
+
+    Groups are keyed by (dimension, value), e.g. ("Major", "Science") or
+    ("all", "") for every prediction, and striped over up to
+    ``PREDICTOR_AGGREGATE_SHARDS`` rows so concurrent inserts rarely wait on
+    the same row lock; a group's statistics are the sum of its stripes.
+    Rows are updated in the same transaction that inserts predictions (see
+    ``predictor.aggregates``), so analytics read a handful of rows instead
+    of scanning the table.
+    """
+    dimension = models.CharField(max_length=50)
+    value = models.CharField(max_length=255, blank=True)
+    shard = models.PositiveSmallIntegerField(default=0)
+
+    count = models.BigIntegerField(default=0)
+    total = models.FloatField(default=0.0)  # sum of GPA
+    total_squares = models.FloatField(default=0.0)  # sum of GPA²
+    minimum = models.FloatField(null=True, blank=True)
+    maximum = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["dimension", "value", "shard"], name="unique_prediction_aggregate"),
+        ]
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    @property
+    def std(self):
+        """Population standard deviation of GPA in this group."""
+        if not self.count:
+            return None
+        variance = self.total_squares / self.count - self.mean ** 2
+        return max(variance, 0.0) ** 0.5
+
+    def __str__(self):
+        return f"{self.dimension}={self.value or 'N/A'} - {self.count} predictions"
+
+
+class PredictionJob(models.Model):
+    """A large CSV scoring job fanned out over Celery workers (see ``predictor.jobs``)."""
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (SUCCEEDED, "Succeeded"),
+        (FAILED, "Failed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL,
+                              related_name="prediction_jobs")
+    source = models.CharField(max_length=255)  # dataset reference or uploaded file name
+    uploaded = models.BooleanField(default=False)  # input was uploaded into the job directory
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    error = models.TextField(blank=True)
+    model_version = models.CharField(max_length=64, blank=True)
+
+    chunk_size = models.PositiveIntegerField()
+    total_chunks = models.PositiveIntegerField(default=0)
+    completed_chunk_ids = models.JSONField(default=list, blank=True)  # chunk indexes, so redelivered tasks count once
+    total_rows = models.BigIntegerField(default=0)
+    scored_rows = models.BigIntegerField(default=0)
+    invalid_rows = models.BigIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["owner", "created_at"], name="prediction_job_owner_idx"),
+        ]
+
+    @property
+    def completed_chunks(self):
+        return len(self.completed_chunk_ids)
+
+    @property
+    def progress(self):
+        """Fraction of chunks scored (0-1)."""
+        if self.status == self.SUCCEEDED:
+            return 1.0
+        return self.completed_chunks / self.total_chunks if self.total_chunks else 0.0
+
+    def __str__(self):
+        return f"Prediction job {self.id} - {self.status}"
+
@@ -0,0 +1,42 @@
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+
+
+def encode_cursor(created_at, pk):
+    """Opaque cursor pointing just after the row (``created_at``, ``pk``)."""
+    raw = f"{created_at.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, pk = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), int(pk)
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+def keyset_page(queryset, cursor=None, limit=50):
+    """One page of ``queryset``, newest first, continuing after ``cursor``.
+
+    Rows are ordered by ``(created_at, id)`` descending and the next page is
+    selected with ``WHERE (created_at, id) < cursor`` instead of ``OFFSET``,
+    so with a matching index every page costs the same however deep it is.
+    Returns ``(rows, next_cursor)``; ``next_cursor`` is ``None`` on the last page.
+    """
+    queryset = queryset.order_by("-created_at", "-id")
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        # ✅ The ``created_at <= ...`` bound lets the database seek into the index
+        queryset = queryset.filter(created_at__lte=created_at).filter(
+            Q(created_at__lt=created_at) | Q(id__lt=pk)
+        )
+
+    rows = list(queryset[:limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+    last = rows[limit - 1]
+    return rows[:limit], encode_cursor(last.created_at, last.pk)
@@ -0,0 +1,180 @@
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+
+from predictor import ml_model
+from predictor.bundle import ArrayLinearModel, ArrayScaler, read_model_bundle
+from predictor.compiled import CompiledPredictor
+from predictor.features import UNKNOWN_REFERENCE, FeatureSchema
+from predictor.validation import LIFESTYLE_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# ✅ Seconds between two stat() checks of the artifact files
+DEFAULT_RELOAD_INTERVAL = 5.0
+
+
+class ModelArtifacts:
+    """Immutable snapshot of every artifact needed to serve a prediction.
+
+    A request keeps a reference to the snapshot it started with, so a hot
+    reload swapping in a new snapshot never changes the models under it.
+    """
+
+    __slots__ = (
+        "version",
+        "lifestyle_model",
+        "lifestyle_scaler",
+        "performance_model",
+        "performance_scaler",
+        "features_list",
+        "compiled",
+        "feature_schema",
+        "lifestyle_schema",
+        "metadata",
+        "loaded_at",
+    )
+
+    def __init__(self, version, lifestyle_model, lifestyle_scaler,
+                 performance_model, performance_scaler, features_list,
+                 compiled=None, metadata=None):
+        self.version = version
+        self.lifestyle_model = lifestyle_model
+        self.lifestyle_scaler = lifestyle_scaler
+        self.performance_model = performance_model
+        self.performance_scaler = performance_scaler
+        self.features_list = list(features_list)
+        if compiled is None:
+            compiled = CompiledPredictor.from_pipeline(
+                lifestyle_model, lifestyle_scaler, performance_model,
+                performance_scaler, self.features_list, source_version=version,
+            )
+        self.compiled = compiled
+        self.metadata = metadata or {}
+        # ✅ Encoders into the trained layouts, shared by every request on this snapshot
+        self.feature_schema = FeatureSchema(
+            self.features_list, self.metadata.get("category_vocabularies"),
+            unknown=getattr(settings, "PREDICTOR_UNKNOWN_CATEGORY", UNKNOWN_REFERENCE),
+        )
+        self.lifestyle_schema = FeatureSchema(LIFESTYLE_FIELDS)
+        self.loaded_at = time.time()
+
+    @classmethod
+    def from_bundle(cls, bundle):
+        """Build a snapshot on the memory-mapped arrays of a :class:`ModelBundle`."""
+        arrays = bundle.arrays
+        metadata = bundle.metadata
+        compiled_layout = metadata["compiled"]
+        return cls(
+            version=bundle.version,
+            lifestyle_model=ArrayLinearModel(arrays["lifestyle_coef"], arrays["lifestyle_intercept"][0]),
+            lifestyle_scaler=ArrayScaler(arrays["lifestyle_mean"], arrays["lifestyle_scale"],
+                                         metadata["lifestyle_features"]),
+            performance_model=ArrayLinearModel(arrays["performance_coef"], arrays["performance_intercept"][0]),
+            performance_scaler=ArrayScaler(arrays["performance_mean"], arrays["performance_scale"],
+                                           metadata["performance_features"]),
+            features_list=metadata["performance_features"],
+            compiled=CompiledPredictor(
+                numeric_weights=zip(compiled_layout["numeric_fields"], arrays["compiled_weights"]),
+                category_weights=compiled_layout["category_weights"],
+                bias=arrays["compiled_bias"][0],
+                source_version=bundle.version,
+            ),
+            metadata={key: value for key, value in metadata.items() if key != "arrays"},
+        )
+
+    def __repr__(self):
+        return f"<ModelArtifacts version={self.version}>"
+
+
+class ModelRegistry:
+    """Thread-safe, process-wide cache of the trained model artifacts.
+
+    The model bundle is memory-mapped once per process. Every
+    ``reload_interval`` seconds the file is stat()ed and, when it was
+    replaced, a new snapshot is loaded next to the old one and swapped in
+    atomically.
+    """
+
+    def __init__(self, bundle_path=None, reload_interval=None):
+        self._bundle_path = bundle_path or ml_model.model_bundle_path()
+        if reload_interval is None:
+            reload_interval = getattr(settings, "PREDICTOR_MODEL_RELOAD_INTERVAL", DEFAULT_RELOAD_INTERVAL)
+        self._reload_interval = float(reload_interval)
+        self._lock = threading.Lock()
+        self._artifacts = None
+        self._signature = None
+        self._last_check = 0.0
+
+    @property
+    def version(self):
+        """Version of the active snapshot, or ``None`` before the first load."""
+        artifacts = self._artifacts
+        return artifacts.version if artifacts is not None else None
+
+    def current(self):
+        """Return the active snapshot, reloading it if the files changed."""
+        artifacts = self._artifacts
+        if artifacts is not None and time.monotonic() - self._last_check < self._reload_interval:
+            return artifacts
+
+        # ✅ Only the first load blocks; later checks let concurrent requests
+        #    keep serving the old snapshot while one thread reloads.
+        if not self._lock.acquire(blocking=artifacts is None):
+            return artifacts
+        try:
+            if self._artifacts is None or time.monotonic() - self._last_check >= self._reload_interval:
+                self._last_check = time.monotonic()
+                signature = self._stat_signature()
+                if self._artifacts is None or signature != self._signature:
+                    self._load(signature)
+            return self._artifacts
+        finally:
+            self._lock.release()
+
+    def reload(self):
+        """Force a reload from disk regardless of the file signatures."""
+        with self._lock:
+            self._last_check = time.monotonic()
+            self._load(self._stat_signature())
+            return self._artifacts
+
+    def _stat_signature(self):
+        try:
+            stat = os.stat(self._bundle_path)
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _load(self, signature):
+        try:
+            artifacts = ModelArtifacts.from_bundle(read_model_bundle(self._bundle_path))
+        except Exception as e:
+            # ✅ Keep serving the previous snapshot; the unchanged signature
+            #    makes us retry on the next check.
+            if self._artifacts is None:
+                raise ValueError(f"❌ Model loading failed: {str(e)}")
+            logger.error(f"❌ Model reload failed, keeping version {self._artifacts.version}: {str(e)}")
+            return
+
+        if self._artifacts is None or artifacts.version != self._artifacts.version:
+            logger.info(f"✅ Loaded model bundle version {artifacts.version}")
+        self._artifacts = artifacts
+        self._signature = signature
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry():
+    """Return the process-wide :class:`ModelRegistry`."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+    return _registry
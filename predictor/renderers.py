@@ -0,0 +1,201 @@
+import io
+from operator import attrgetter
+
+import msgpack
+import numpy as np
+import orjson
+import pyarrow as pa
+from rest_framework.renderers import BaseRenderer, BrowsableAPIRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+_json_encoder = JSONEncoder()
+
+
+class Columns:
+    """Column-oriented result rows: ``{name: list or numpy array}``.
+
+    Views put one in their response data (usually under ``results``) when a
+    columnar renderer was negotiated. Arrow and MessagePack serialise the
+    column buffers directly; JSON still gets one object per row.
+    """
+
+    def __init__(self, columns):
+        self.columns = dict(columns)
+
+    @classmethod
+    def from_rows(cls, names, rows):
+        """Transpose row tuples (e.g. ``values_list``) without a dict per row."""
+        names = list(names)
+        transposed = list(zip(*rows))
+        if not transposed:
+            return cls({name: [] for name in names})
+        return cls(dict(zip(names, (list(values) for values in transposed))))
+
+    @classmethod
+    def from_objects(cls, objects, names):
+        """Columns of the ``names`` attributes of ``objects`` (model instances)."""
+        names = list(names)
+        getter = attrgetter(*names)
+        if len(names) == 1:
+            return cls({names[0]: [getter(obj) for obj in objects]})
+        return cls.from_rows(names, map(getter, objects))
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()), []))
+
+    def to_records(self):
+        names = list(self.columns)
+        values = [column.tolist() if isinstance(column, np.ndarray) else column
+                  for column in self.columns.values()]
+        return [dict(zip(names, row)) for row in zip(*values)]
+
+    def to_arrow(self):
+        # ✅ NumPy columns are wrapped without copying; NaN becomes null
+        return pa.table({
+            name: pa.array(column, from_pandas=True) if isinstance(column, np.ndarray) else pa.array(column)
+            for name, column in self.columns.items()
+        })
+
+
+def columns_requested(request):
+    """Whether the negotiated renderer wants :class:`Columns` results."""
+    return getattr(getattr(request, "accepted_renderer", None), "columnar", False)
+
+
+def _json_default(obj):
+    if isinstance(obj, Columns):
+        return obj.to_records()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return _json_encoder.default(obj)
+
+
+class ORJSONRenderer(BaseRenderer):
+    """Drop-in for DRF's ``JSONRenderer`` encoding with orjson.
+
+    Same compact UTF-8 output; datetimes render with a ``Z`` suffix like
+    DRF's serializers, NumPy arrays natively and NaN as ``null``.
+    """
+
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        option = orjson.OPT_UTC_Z | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        # ✅ The browsable API asks for indented JSON
+        if (renderer_context or {}).get("indent") or "indent=" in (accepted_media_type or ""):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_json_default, option=option)
+
+
+def _split_columns(data):
+    """``(Columns or None, other top-level values)`` of a response payload."""
+    if isinstance(data, Columns):
+        return data, {}
+    if not isinstance(data, dict):
+        return None, {"data": data}
+    table = next((value for value in data.values() if isinstance(value, Columns)), None)
+    return table, {key: value for key, value in data.items() if value is not table}
+
+
+def arrow_stream(table):
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+class ArrowIPCRenderer(BaseRenderer):
+    """Renders the response's :class:`Columns` as an Arrow IPC stream.
+
+    Every other top-level value (``model_version``, ``next_cursor``,
+    ``error`` ...) is stored JSON-encoded in the schema metadata, so error
+    responses are a table without columns.
+    """
+
+    media_type = ARROW_STREAM_MEDIA_TYPE
+    format = "arrow"
+    charset = None
+    render_style = "binary"
+    columnar = True
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        columns, metadata = _split_columns(data)
+        table = columns.to_arrow() if columns is not None else pa.table({})
+        return arrow_stream(table.replace_schema_metadata({
+            key: orjson.dumps(value, default=_json_default, option=orjson.OPT_UTC_Z)
+            for key, value in metadata.items()
+        }))
+
+
+def _msgpack_default(obj):
+    if isinstance(obj, Columns):
+        return {name: column.tolist() if isinstance(column, np.ndarray) else column
+                for name, column in obj.columns.items()}
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return _json_encoder.default(obj)
+
+
+def msgpack_dumps(data):
+    return msgpack.packb(data, default=_msgpack_default, datetime=True, use_bin_type=True)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Renders responses as MessagePack; :class:`Columns` become ``{name: [values]}`` maps.
+
+    Datetimes use the MessagePack timestamp extension.
+    """
+
+    media_type = MSGPACK_MEDIA_TYPE
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+    columnar = True
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack_dumps(data)
+
+
+# ✅ JSON (orjson) first so it stays the default; binary formats via Accept or ?format=
+DEFAULT_RENDERERS = [ORJSONRenderer, BrowsableAPIRenderer]
+COLUMNAR_RENDERERS = DEFAULT_RENDERERS + [ArrowIPCRenderer, MessagePackRenderer]
+
+
+class ArrowStreamWriter:
+    """Incremental Arrow IPC stream: feed tables, get the bytes to send so far."""
+
+    def __init__(self):
+        self._sink = io.BytesIO()
+        self._writer = None
+        self.schema = None
+
+    def _drain(self):
+        data = self._sink.getvalue()
+        self._sink.seek(0)
+        self._sink.truncate()
+        return data
+
+    def write(self, table):
+        if self._writer is None:
+            self.schema = table.schema
+            self._writer = pa.ipc.new_stream(self._sink, self.schema)
+        self._writer.write_table(table.cast(self.schema))
+        return self._drain()
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        return self._drain()
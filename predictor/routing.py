@@ -0,0 +1,7 @@
+from django.urls import path
+
+from predictor.consumers import DashboardConsumer
+
+websocket_urlpatterns = [
+    path("ws/predictor/dashboard/", DashboardConsumer.as_asgi(), name="predictor-dashboard"),
+]
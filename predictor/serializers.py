@@ -2,6 +2,17 @@ from rest_framework import serializers
 from .models import StudentPerformance
 
 class StudentPerformanceSerializer(serializers.ModelSerializer):
+    """Prediction serializer; pass ``fields=[...]`` to return only those fields."""
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+
+        # ✅ Sparse field selection: drop every field that was not asked for
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
     class Meta:
         model = StudentPerformance
         fields = '__all__'  # Include all fields
@@ -0,0 +1,294 @@
+import logging
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from django.conf import settings
+
+from predictor import ml_model
+from predictor.bundle import read_model_bundle
+from predictor.metrics import SHADOW_LATENCY
+from predictor.registry import ModelArtifacts, ModelRegistry, get_model_registry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHADOW_CONFIG = {
+    "ENABLED": False,
+    "BUNDLE_PATH": None,     # candidate bundle (default: <live bundle>.candidate)
+    "SAMPLE_RATE": 1.0,      # fraction of scored requests replayed against the candidate
+    "MAX_WORKERS": 1,
+    "MAX_PENDING": 1000,     # shadow jobs queued at most; more are dropped, never waited for
+    "LATENCY_WINDOW": 10000,  # recent latencies kept per model for the report's percentiles
+}
+
+# ✅ |candidate - live| GPA buckets of the report's delta distribution
+DELTA_BUCKETS = (0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+def shadow_config():
+    return dict(DEFAULT_SHADOW_CONFIG, **getattr(settings, "PREDICTOR_SHADOW", {}))
+
+
+def shadow_enabled():
+    return bool(shadow_config()["ENABLED"])
+
+
+def candidate_bundle_path():
+    return shadow_config()["BUNDLE_PATH"] or f"{ml_model.model_bundle_path()}.candidate"
+
+
+def _score(artifacts, lifestyle_rows, performance_rows):
+    # ✅ Same backend as the live path, but not recorded under the live stage metrics
+    if getattr(settings, "PREDICTOR_USE_COMPILED", True):
+        return np.asarray(artifacts.compiled.predict_batch(lifestyle_rows, performance_rows))
+    return ml_model.predict_student_performance_batch(lifestyle_rows, performance_rows, artifacts=artifacts)
+
+
+class _Comparison:
+    """Running delta & latency statistics of one (live, candidate) version pair."""
+
+    def __init__(self, latency_window):
+        self.requests = 0
+        self.rows = 0
+        self.delta_sum = 0.0
+        self.abs_delta_sum = 0.0
+        self.squared_delta_sum = 0.0
+        self.max_abs_delta = 0.0
+        self.delta_counts = [0] * (len(DELTA_BUCKETS) + 1)
+        self.latencies = {"live": deque(maxlen=latency_window), "candidate": deque(maxlen=latency_window)}
+
+    def add(self, deltas, live_seconds, candidate_seconds):
+        abs_deltas = np.abs(deltas)
+        self.requests += 1
+        self.rows += len(deltas)
+        self.delta_sum += float(deltas.sum())
+        self.abs_delta_sum += float(abs_deltas.sum())
+        self.squared_delta_sum += float(deltas @ deltas)
+        self.max_abs_delta = max(self.max_abs_delta, float(abs_deltas.max()))
+        for index, count in enumerate(np.bincount(np.searchsorted(DELTA_BUCKETS, abs_deltas),
+                                                  minlength=len(self.delta_counts))):
+            self.delta_counts[index] += int(count)
+        self.latencies["live"].append(live_seconds)
+        self.latencies["candidate"].append(candidate_seconds)
+
+    def summary(self):
+        rows = self.rows or 1
+        latency = {}
+        for model, values in self.latencies.items():
+            values = np.asarray(values) * 1000
+            latency[model] = {
+                "samples": len(values),
+                "mean_ms": float(values.mean()) if len(values) else None,
+                "p50_ms": float(np.percentile(values, 50)) if len(values) else None,
+                "p95_ms": float(np.percentile(values, 95)) if len(values) else None,
+                "p99_ms": float(np.percentile(values, 99)) if len(values) else None,
+            }
+        return {
+            "requests": self.requests,
+            "rows": self.rows,
+            "mean_delta": self.delta_sum / rows,
+            "mean_abs_delta": self.abs_delta_sum / rows,
+            "rmse_delta": float(np.sqrt(self.squared_delta_sum / rows)),
+            "max_abs_delta": self.max_abs_delta,
+            "abs_delta_buckets": {
+                **{f"<={bound}": count for bound, count in zip(DELTA_BUCKETS, self.delta_counts)},
+                f">{DELTA_BUCKETS[-1]}": self.delta_counts[-1],
+            },
+            "latency": latency,
+        }
+
+
+class ShadowScorer:
+    """Replays scored requests against a candidate bundle off the response path.
+
+    ``submit`` hands the rows, the live predictions and the live latency to
+    a small thread pool and returns immediately; when ``max_pending`` jobs
+    are already queued the request is dropped (and counted) instead of
+    waiting. The candidate bundle is loaded through its own
+    :class:`ModelRegistry`, so replacing the file swaps the candidate
+    without a restart. Candidate latency is measured in the shadow thread
+    and so includes any contention with request threads.
+    """
+
+    def __init__(self, bundle_path, sample_rate=1.0, max_workers=1, max_pending=1000, latency_window=10000):
+        self.bundle_path = bundle_path
+        self.sample_rate = sample_rate
+        self.latency_window = latency_window
+        self.registry = ModelRegistry(bundle_path=bundle_path)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="predictor-shadow")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._comparisons = {}
+        self.dropped = 0
+        self.failed = 0
+        self.last_error = None
+
+    def submit(self, lifestyle_rows, performance_rows, live_predictions, live_version, live_seconds):
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return False
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.dropped += 1
+            return False
+        try:
+            self._executor.submit(self._run, lifestyle_rows, performance_rows,
+                                  np.array(live_predictions, dtype=float, ndmin=1), live_version, live_seconds)
+        except RuntimeError:  # executor shut down
+            self._slots.release()
+            return False
+        return True
+
+    def _run(self, lifestyle_rows, performance_rows, live_predictions, live_version, live_seconds):
+        try:
+            candidate = self.registry.current()
+            start = time.perf_counter()
+            predictions = _score(candidate, lifestyle_rows, performance_rows)
+            candidate_seconds = time.perf_counter() - start
+        except Exception as e:
+            logger.warning(f"⚠️ Shadow scoring failed: {str(e)}")
+            with self._lock:
+                self.failed += 1
+                self.last_error = str(e)
+            return
+        finally:
+            self._slots.release()
+
+        SHADOW_LATENCY.observe(live_seconds, "live")
+        SHADOW_LATENCY.observe(candidate_seconds, "candidate")
+        with self._lock:
+            key = (live_version, candidate.version)
+            comparison = self._comparisons.get(key)
+            if comparison is None:
+                comparison = self._comparisons[key] = _Comparison(self.latency_window)
+            comparison.add(predictions - live_predictions, live_seconds, candidate_seconds)
+
+    def report(self):
+        with self._lock:
+            comparisons = [
+                dict(live_version=live_version, candidate_version=candidate_version, **comparison.summary())
+                for (live_version, candidate_version), comparison in self._comparisons.items()
+            ]
+            return {
+                "candidate_version": self.registry.version,
+                "sample_rate": self.sample_rate,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "last_error": self.last_error,
+                "comparisons": comparisons,
+            }
+
+    def reset(self):
+        with self._lock:
+            self._comparisons.clear()
+            self.dropped = self.failed = 0
+            self.last_error = None
+
+    def wait(self, timeout=None):
+        """Block until every submitted job finished (used by tests & shutdown)."""
+        self._executor.submit(lambda: None).result(timeout)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+_scorer = None
+_scorer_lock = threading.Lock()
+
+
+def get_shadow_scorer():
+    """Process-wide :class:`ShadowScorer`, or ``None`` when shadow mode is off."""
+    global _scorer
+    if not shadow_enabled():
+        return None
+    if _scorer is None:
+        with _scorer_lock:
+            if _scorer is None:
+                config = shadow_config()
+                _scorer = ShadowScorer(
+                    candidate_bundle_path(),
+                    sample_rate=config["SAMPLE_RATE"],
+                    max_workers=config["MAX_WORKERS"],
+                    max_pending=config["MAX_PENDING"],
+                    latency_window=config["LATENCY_WINDOW"],
+                )
+    return _scorer
+
+
+def shadow_predictions(lifestyle_rows, performance_rows, live_predictions, artifacts, live_seconds):
+    """Queue a request served by a prediction endpoint for shadow scoring when shadow mode is on.
+
+    Called by the views after the cache lookup, so cache hits are replayed
+    too; sweeps, CSV exports & jobs never call it and stay out of the report.
+    """
+    scorer = get_shadow_scorer()
+    if scorer is not None and len(live_predictions):
+        scorer.submit(lifestyle_rows, performance_rows, live_predictions, artifacts.version, live_seconds)
+
+
+def shadow_report():
+    scorer = get_shadow_scorer()
+    if scorer is None:
+        return {"enabled": False}
+    return dict(enabled=True, live_version=get_model_registry().current().version, **scorer.report())
+
+
+def promote_candidate(candidate_path=None, bundle_path=None, lock_timeout=None):
+    """Publish the candidate bundle as the live bundle.
+
+    The candidate is loaded once to make sure it is servable, then copied
+    next to the live bundle and renamed over it under the training lock,
+    so every worker's registry hot-reloads a complete file. Returns the
+    promoted version.
+    """
+    # ✅ Import inside function to prevent circular imports
+    from predictor.training import FileLock
+
+    candidate_path = candidate_path or candidate_bundle_path()
+    bundle_path = bundle_path or ml_model.model_bundle_path()
+    if not os.path.exists(candidate_path):
+        raise ValueError(f"❌ No candidate bundle at {candidate_path}")
+    version = ModelArtifacts.from_bundle(read_model_bundle(candidate_path)).version
+
+    with FileLock(f"{bundle_path}.lock", timeout=lock_timeout):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(bundle_path)), prefix=".bundle-")
+        try:
+            with os.fdopen(fd, "wb") as fh, open(candidate_path, "rb") as source:
+                shutil.copyfileobj(source, fh)
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp_path, bundle_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    logger.info(f"✅ Promoted candidate model bundle {version} to {bundle_path}")
+    return version
+
+
+def shadow_samples():
+    """Shadow comparison gauges for :func:`predictor.metrics.register_collector`."""
+    scorer = get_shadow_scorer()
+    if scorer is None:
+        return []
+    report = scorer.report()
+    labelled = [({"live": c["live_version"], "candidate": c["candidate_version"]}, c) for c in report["comparisons"]]
+    return [
+        ("predictor_shadow_dropped_total", "counter", "Shadow jobs dropped because the shadow executor was full.",
+         [({}, report["dropped"])]),
+        ("predictor_shadow_failed_total", "counter", "Shadow jobs whose candidate scoring raised.",
+         [({}, report["failed"])]),
+        ("predictor_shadow_rows_total", "counter", "Rows scored by both the live and the candidate model.",
+         [(labels, c["rows"]) for labels, c in labelled]),
+        ("predictor_shadow_mean_abs_delta", "gauge", "Mean |candidate - live| GPA.",
+         [(labels, c["mean_abs_delta"]) for labels, c in labelled]),
+        ("predictor_shadow_max_abs_delta", "gauge", "Largest |candidate - live| GPA seen.",
+         [(labels, c["max_abs_delta"]) for labels, c in labelled]),
+    ]
+
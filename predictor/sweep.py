@@ -0,0 +1,99 @@
+import math
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+from predictor import ml_model
+from predictor.validation import (
+    FLOAT_FIELDS,
+    LIFESTYLE_FIELDS,
+    PERFORMANCE_FIELDS,
+    clean_prediction_record,
+)
+
+# ✅ Numeric inputs a what-if sweep can vary
+SWEEP_FIELDS = FLOAT_FIELDS + ["Stress_Level"]
+MAX_SWEEP_FEATURES = 2
+
+
+def max_sweep_points():
+    return getattr(settings, "PREDICTOR_SWEEP_MAX_POINTS", 10000)
+
+
+def _axis_values(spec):
+    """Grid values of one sweep axis: ``values`` or ``start``/``stop``/``steps``."""
+    feature = spec.get("feature")
+    if feature not in SWEEP_FIELDS:
+        raise ValueError(f"Cannot sweep {feature!r} (use one of {', '.join(SWEEP_FIELDS)})")
+
+    if spec.get("values") is not None:
+        values = np.asarray(spec["values"], dtype=float)
+    else:
+        start, stop = float(spec["start"]), float(spec["stop"])
+        steps = int(spec.get("steps", 11))
+        if not 2 <= steps <= max_sweep_points():
+            raise ValueError(f"steps for {feature} must be between 2 and {max_sweep_points()}")
+        values = np.linspace(start, stop, steps)
+
+    if values.ndim != 1 or not len(values) or not np.isfinite(values).all():
+        raise ValueError(f"Invalid sweep values for {feature}")
+    if feature == "Stress_Level":
+        values = np.unique(np.round(values))
+    return feature, values
+
+
+def sweep_profile(profile, axes, artifacts):
+    """Score ``profile`` over the grid of one or two feature ``axes``.
+
+    ``axes`` is a list of ``{"feature", "start", "stop", "steps"}`` (or
+    ``{"feature", "values"}``) dicts. The grid is built as one DataFrame per
+    model and scored in a single :func:`predictor.ml_model.predict_gpa_batch`
+    call, together with the unchanged profile as a baseline. Nothing is saved.
+
+    Returns ``{"features", "axes", "GPA", "baseline_GPA"}`` where ``GPA`` is a
+    list for one feature and a ``len(x) x len(y)`` nested list for two.
+    """
+    if not isinstance(profile, dict):
+        raise ValueError("Expected a profile object with student fields")
+    if not isinstance(axes, list) or not 1 <= len(axes) <= MAX_SWEEP_FEATURES:
+        raise ValueError(f"Sweep 1 to {MAX_SWEEP_FEATURES} features")
+    try:
+        axes = [_axis_values(spec) for spec in axes]
+    except (AttributeError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid sweep axis: {str(e)}")
+    features = [feature for feature, _ in axes]
+    if len(set(features)) != len(features):
+        raise ValueError("Each feature can only be swept once")
+
+    shape = tuple(len(values) for _, values in axes)
+    points = math.prod(shape)
+    if points > max_sweep_points():
+        raise ValueError(f"Sweep grid too large: {points} points (max {max_sweep_points()})")
+
+    cleaned, error = clean_prediction_record(dict(profile, username=profile.get("username") or "sweep"))
+    if error:
+        raise ValueError(error)
+
+    # ✅ Base profile repeated for every grid point (+1 baseline row), swept columns overwritten
+    grids = np.meshgrid(*[values for _, values in axes], indexing="ij")
+    columns = {field: np.full(points + 1, cleaned[field], dtype=object)
+               for field in LIFESTYLE_FIELDS + PERFORMANCE_FIELDS}
+    for (feature, _), grid in zip(axes, grids):
+        column = np.empty(points + 1)
+        column[:points] = grid.ravel()
+        column[points] = cleaned[feature]
+        columns[feature] = column
+    for field in SWEEP_FIELDS:
+        columns[field] = columns[field].astype(float)
+
+    lifestyle_df = pd.DataFrame({field: columns[field] for field in LIFESTYLE_FIELDS})
+    performance_df = pd.DataFrame({field: columns[field] for field in PERFORMANCE_FIELDS})
+    predictions = ml_model.predict_gpa_batch(lifestyle_df, performance_df, artifacts=artifacts)
+
+    return {
+        "features": features,
+        "axes": {feature: values.tolist() for feature, values in axes},
+        "GPA": np.round(predictions[:points], 4).reshape(shape).tolist(),
+        "baseline_GPA": round(float(predictions[points]), 4),
+    }
@@ -1,22 +1,51 @@
 from celery import shared_task
-from .models import Student
-import pandas as pd
+
+from predictor import jobs
+from predictor.aggregates import analytics_summary
+from predictor.training import train_models_locked
+
+
+@shared_task
+def train_models_task(force=True):
+    """Retrain the models on a Celery worker and publish a new bundle."""
+    return train_models_locked(force=force)
+
 
 @shared_task
 def calculate_real_time_analytics():
-    students = Student.objects.all().values()
-    df = pd.DataFrame(students)
-
-    if not df.empty:
-        avg_studytime = df['study_time'].mean()
-        avg_absences = df['absences'].mean()
-        avg_failures = df['failures'].mean()
-        avg_g3_predicted = df['g3_predicted'].mean()
-
-        return {
-            'avg_studytime': round(avg_studytime, 2),
-            'avg_absences': round(avg_absences, 2),
-            'avg_failures': round(avg_failures, 2),
-            'avg_predicted_g3': round(avg_g3_predicted, 2)
-        }
-    return {}
+    """GPA statistics per Major, Gender & stress level from the running aggregates."""
+    return analytics_summary()
+
+
+@shared_task
+def start_prediction_job(job_id):
+    """Split a prediction job into chunks and fan them out, one task per chunk."""
+    try:
+        for index, row_offset in jobs.split_job(job_id):
+            score_prediction_chunk.delay(job_id, index, row_offset)
+    except Exception as e:
+        jobs.fail_job(job_id, f"Start: {str(e)}")
+        raise
+
+
+@shared_task
+def score_prediction_chunk(job_id, index, row_offset):
+    """Score one chunk of a prediction job; the last chunk to finish queues the merge."""
+    try:
+        last_chunk = jobs.score_job_chunk(job_id, index, row_offset)
+    except Exception as e:
+        jobs.fail_job(job_id, f"Chunk {index}: {str(e)}")
+        raise
+    if last_chunk:
+        merge_prediction_job.delay(job_id)
+
+
+@shared_task
+def merge_prediction_job(job_id):
+    """Merge the scored chunks of a prediction job into its downloadable result."""
+    try:
+        jobs.merge_job(job_id)
+    except Exception as e:
+        jobs.fail_job(job_id, f"Merge: {str(e)}")
+        raise
+
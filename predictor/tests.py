@@ -1,3 +1,971 @@
-from django.test import TestCase
+import io
+import json
+import os
+import random
+import shutil
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from asgiref.sync import async_to_sync, sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import OperationalError
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import StandardScaler
+
+from predictor import datasets, incremental, jobs, ml_model, model_selection
+from predictor.bulk_scoring import score_csv
+from predictor.cache import build_prediction_cache, get_prediction_cache
+from predictor.aggregates import (
+    analytics_summary, delete_predictions, group_aggregates, rebuild_aggregates, save_predictions,
+)
+from predictor.features import BINARY_MAPPING, UNKNOWN_ERROR, FeatureSchema, UnknownCategoryError
+from predictor.live import get_live_publisher
+from predictor.metrics import STAGE_LATENCY, Histogram
+from predictor.models import PredictionAggregate, PredictionJob, StudentPerformance
+from predictor.renderers import ARROW_STREAM_MEDIA_TYPE
+from predictor.registry import ModelArtifacts, ModelRegistry
+from predictor.shadow import ShadowScorer, get_shadow_scorer, promote_candidate
+from predictor.training import FileLock, train_models_locked
+from predictor.validation import LIFESTYLE_FIELDS, PERFORMANCE_FIELDS
+from predictor.writebehind import WriteBehindBuffer, get_write_behind_buffer
+from rest_framework.authtoken.models import Token
+from student_performance1.asgi import application
+
+MAJORS = ["Arts", "Business", "Education", "Engineering", "Science", "General"]
+
+
+def random_profiles(count, seed=0):
+    """Random (lifestyle_data, performance_data) pairs like the dashboard sends."""
+    rng = random.Random(seed)
+    profiles = []
+    for _ in range(count):
+        lifestyle = {
+            "Study_Hours_Per_Day": rng.randint(1, 10),
+            "Extracurricular_Hours_Per_Day": rng.randint(0, 10),
+            "Sleep_Hours_Per_Day": rng.randint(0, 12),
+            "Social_Hours_Per_Day": rng.randint(0, 10),
+            "Physical_Activity_Hours_Per_Day": rng.randint(0, 10),
+            "Stress_Level": rng.randint(0, 2),
+        }
+        performance = {
+            "StudyHoursPerWeek": rng.randint(0, 50),
+            "AttendanceRate": rng.uniform(0, 100),
+            "Gender": rng.choice(["Male", "Female"]),
+            "Major": rng.choice(MAJORS),
+            "PartTimeJob": rng.choice([0, 1, "Yes", "No"]),
+            "ExtraCurricularActivities": rng.choice([0, 1, "Yes", "No"]),
+        }
+        profiles.append((lifestyle, performance))
+    return profiles
+
+
+def prediction_rows(username, count, seed=0):
+    """Unsaved ``StudentPerformance`` rows for ``username`` with GPAs 2.5, 2.6, ..."""
+    return [
+        StudentPerformance(username=username, GPA=round(2.5 + index / 10, 2), **lifestyle, **dict(
+            performance, PartTimeJob=BINARY_MAPPING[performance["PartTimeJob"]],
+            ExtraCurricularActivities=BINARY_MAPPING[performance["ExtraCurricularActivities"]],
+        ))
+        for index, (lifestyle, performance) in enumerate(random_profiles(count, seed=seed))
+    ]
+
+
+def create_user(username, role="student"):
+    return get_user_model().objects.create_user(username, f"{username}@example.com", password="secret", role=role)
+
+
+def chained_artifacts(seed=0, version="synthetic"):
+    """Small synthetic pipeline whose performance model uses the lifestyle GPA."""
+    rng = np.random.default_rng(seed)
+    lifestyle_df = pd.DataFrame(rng.uniform(0, 10, (200, len(LIFESTYLE_FIELDS))), columns=LIFESTYLE_FIELDS)
+    lifestyle_scaler = StandardScaler().fit(lifestyle_df)
+    lifestyle_model = LinearRegression().fit(lifestyle_scaler.transform(lifestyle_df), rng.uniform(2, 4, 200))
+
+    features_list = [
+        "StudentID", "StudyHoursPerWeek", "AttendanceRate", "PartTimeJob", "ExtraCurricularActivities",
+        "Gender_Male", "Major_Business", "Major_Science", "Predicted_Lifestyle_GPA",
+    ]
+    performance_df = pd.DataFrame(rng.uniform(0, 100, (200, len(features_list))), columns=features_list)
+    performance_scaler = StandardScaler().fit(performance_df)
+    performance_model = LinearRegression().fit(performance_scaler.transform(performance_df), rng.uniform(2, 4, 200))
+
+    return ModelArtifacts(version, lifestyle_model, lifestyle_scaler,
+                          performance_model, performance_scaler, features_list)
+
+
+class CompiledPredictorTests(SimpleTestCase):
+    def setUp(self):
+        self.artifacts = ModelRegistry().current()
+
+    def assert_equivalent(self, artifacts, profiles):
+        for lifestyle, performance in profiles:
+            expected = ml_model.predict_student_performance(lifestyle, performance, artifacts=artifacts)
+            actual = artifacts.compiled.predict(lifestyle, performance)
+            self.assertAlmostEqual(actual, expected, places=9)
+
+    def test_matches_pipeline_on_trained_artifacts(self):
+        self.assert_equivalent(self.artifacts, random_profiles(200))
+
+    def test_matches_pipeline_when_lifestyle_gpa_is_a_feature(self):
+        artifacts = chained_artifacts()
+        self.assertTrue(any(weight for _, weight in artifacts.compiled.numeric_weights[:len(LIFESTYLE_FIELDS)]))
+        self.assert_equivalent(artifacts, random_profiles(200, seed=1))
+
+    def test_batch_matches_pipeline_batch(self):
+        profiles = random_profiles(500, seed=2)
+        lifestyle_rows = [lifestyle for lifestyle, _ in profiles]
+        performance_rows = [performance for _, performance in profiles]
+        expected = ml_model.predict_student_performance_batch(lifestyle_rows, performance_rows, artifacts=self.artifacts)
+        actual = self.artifacts.compiled.predict_batch(lifestyle_rows, performance_rows)
+        np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-9)
+
+    def test_bundle_round_trip_matches_trained_models(self):
+        lifestyle = ml_model.train_lifestyle_model()
+        performance = ml_model.train_performance_model()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "model.bundle")
+            version = ml_model.save_model_bundle(lifestyle, performance, path)
+            artifacts = ModelRegistry(bundle_path=path).current()
+
+            self.assertEqual(artifacts.version, version)
+            self.assertIsInstance(artifacts.lifestyle_scaler.mean_, np.ndarray)
+            self.assertEqual(artifacts.features_list, performance["features"])
+            self.assertIn("r2", artifacts.metadata["metrics"]["performance"])
+
+            reference = ModelArtifacts(
+                "sklearn", lifestyle["model"], lifestyle["scaler"],
+                performance["model"], performance["scaler"], performance["features"],
+            )
+            for lifestyle_data, performance_data in random_profiles(50, seed=3):
+                expected = ml_model.predict_student_performance(lifestyle_data, performance_data, artifacts=reference)
+                self.assertAlmostEqual(
+                    ml_model.predict_student_performance(lifestyle_data, performance_data, artifacts=artifacts),
+                    expected, places=9,
+                )
+                self.assertAlmostEqual(artifacts.compiled.predict(lifestyle_data, performance_data), expected, places=9)
+
+
+class ModelRegistryTests(SimpleTestCase):
+    def test_reloads_replaced_bundle_and_keeps_old_snapshot_on_errors(self):
+        statistics = incremental.initial_statistics()
+        shifted = pd.read_csv(ml_model.DATA_PERFORMANCE_PATH).head(100).assign(GPA=lambda df: df["GPA"] + 1)
+        incremental.absorb_labelled_rows(statistics, performance_rows=shifted)
+        stages = incremental.statistics_stages(statistics)
+        lifestyle, performance = random_profiles(1, seed=7)[0]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "model.bundle")
+            shutil.copyfile(ml_model.model_bundle_path(), path)
+            registry = ModelRegistry(bundle_path=path, reload_interval=0)
+            old = registry.current()
+            self.assertIs(registry.current(), old)
+
+            # ✅ Replaced file → new snapshot; requests holding the old one keep scoring with it
+            retrained = os.path.join(tmp, "retrained.bundle")
+            new_version = ml_model.save_model_bundle(stages["lifestyle"], stages["performance"], retrained)
+            os.replace(retrained, path)
+            new = registry.current()
+            self.assertEqual((new.version, registry.version), (new_version, new_version))
+            self.assertNotEqual(old.version, new.version)
+            self.assertNotEqual(old.compiled.predict(lifestyle, performance), new.compiled.predict(lifestyle, performance))
+
+            with open(path + ".tmp", "wb") as broken:
+                broken.write(b"not a bundle")
+            os.replace(path + ".tmp", path)
+            self.assertIs(registry.current(), new)
+
+
+class TrainingLockTests(SimpleTestCase):
+    def test_only_missing_bundles_are_trained_under_the_lock(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "model.bundle")
+            version = train_models_locked(path, force=False)
+            self.assertEqual(ModelRegistry(bundle_path=path).current().version, version)
+
+            # ✅ A caller queued behind the trainer reuses its bundle
+            mtime = os.stat(path).st_mtime_ns
+            self.assertIsNone(train_models_locked(path, force=False))
+            self.assertEqual(os.stat(path).st_mtime_ns, mtime)
+            self.assertFalse([name for name in os.listdir(tmp) if name not in ("model.bundle", "model.bundle.lock")])
+
+    def test_lock_is_exclusive(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "model.bundle.lock")
+            with FileLock(path):
+                with self.assertRaises(TimeoutError):
+                    FileLock(path, timeout=0.2, poll_interval=0.05).acquire()
+            with FileLock(path, timeout=0.2):
+                pass
+
+
+class IncrementalTrainingTests(SimpleTestCase):
+    def assert_matches_refit(self, running, X, y):
+        scaler = StandardScaler().fit(X)
+        model = LinearRegression().fit(scaler.transform(X), y)
+        incremental_scaler, incremental_model = running.solve()
+
+        np.testing.assert_allclose(incremental_scaler.mean_, scaler.mean_, rtol=1e-9, atol=1e-9)
+        np.testing.assert_allclose(incremental_scaler.scale_, scaler.scale_, rtol=1e-9)
+        np.testing.assert_allclose(incremental_model.coef_, model.coef_, rtol=1e-7, atol=1e-9)
+        np.testing.assert_allclose(incremental_model.intercept_, model.intercept_, rtol=1e-12)
+
+    def test_chunked_absorb_matches_full_refit(self):
+        rng = np.random.default_rng(4)
+        # ✅ Large offsets & a constant column, where raw XᵀX sums would lose precision
+        X = rng.normal(0, 1, (1000, 5)) * [1, 10, 0.1, 5, 0] + [1e6, -300, 2, 0, 7]
+        y = X @ [0.3, -0.02, 4, 1, 0] + rng.normal(0, 0.5, 1000)
+
+        running = incremental.RunningOLS([f"x{i}" for i in range(5)])
+        for start, stop in [(0, 1), (1, 250), (250, 251), (251, 1000)]:
+            running.absorb(X[start:stop], y[start:stop])
+        self.assertEqual(running.count, 1000)
+        self.assert_matches_refit(running, X, y)
+
+    def test_absorbed_rows_match_refit_on_all_rows(self):
+        statistics = incremental.initial_statistics()
+        X, y, _ = ml_model.load_performance_dataset()
+        X_train, X_new, y_train, y_new = ml_model.split_training_data(X, y)
+
+        # ✅ The held-out split arrives later as raw labelled rows
+        raw = pd.read_csv(ml_model.DATA_PERFORMANCE_PATH).loc[X_new.index]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "stats.npz")
+            incremental.save_statistics(statistics, path)
+            statistics = incremental.load_statistics(path)
+        absorbed = incremental.absorb_labelled_rows(statistics, performance_rows=raw)
+
+        self.assertEqual(absorbed, {"performance": len(raw)})
+        self.assert_matches_refit(statistics["performance"], pd.concat([X_train, X_new]), pd.concat([y_train, y_new]))
+
+    def test_edited_csv_rebuilds_the_statistics(self):
+        with tempfile.TemporaryDirectory() as tmp, override_settings(PREDICTOR_DATASET_CACHE_DIR=tmp):
+            csv_path = os.path.join(tmp, "performance.csv")
+            shutil.copy(ml_model.DATA_PERFORMANCE_PATH, csv_path)
+            bundle_path = os.path.join(tmp, "model.bundle")
+            stats_path = incremental.training_stats_path(bundle_path)
+            with mock.patch.object(ml_model, "DATA_PERFORMANCE_PATH", csv_path):
+                raw = pd.read_csv(csv_path)
+                incremental.retrain_incrementally(performance_rows=raw.head(20), bundle_path=bundle_path)
+                absorbed_count = incremental.load_statistics(stats_path)["performance"].count
+
+                raw.head(len(raw) - 100).to_csv(csv_path, index=False)
+                incremental.retrain_incrementally(bundle_path=bundle_path)
+                statistics = incremental.load_statistics(stats_path)
+                expected = incremental.initial_statistics()
+
+        self.assertEqual(statistics["data_sha256"], expected["data_sha256"])
+        self.assertEqual(statistics["performance"].count, expected["performance"].count)
+        self.assertLess(statistics["performance"].count, absorbed_count - 20)
+        np.testing.assert_allclose(statistics["performance"].comoments, expected["performance"].comoments)
+
+
+class BenchmarkTests(SimpleTestCase):
+    def test_command_writes_results_and_fails_on_regressions(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, "bench.json")
+            options = {"sizes": "1,100", "min_time": 0, "max_repeats": 2, "stdout": io.StringIO()}
+            call_command("bench_predictor", output=output, **options)
+            with open(output) as fh:
+                results = json.load(fh)
+
+            self.assertEqual(results["meta"]["model_version"], ModelRegistry().current().version)
+            measured = {(result["stage"], result["rows"]) for result in results["results"]}
+            self.assertIn(("compiled_batch", 100), measured)
+            self.assertIn(("compiled_single", 1), measured)
+            self.assertNotIn(("compiled_single", 100), measured)
+            self.assertTrue(all(result["median_s"] > 0 for result in results["results"]))
+
+            # ✅ Baseline 1000x faster → every stage regressed; 1000x slower → none did
+            for factor, regressed in ((1e-3, True), (1e3, False)):
+                baseline = os.path.join(tmp, f"baseline-{factor}.json")
+                with open(baseline, "w") as fh:
+                    json.dump({"results": [dict(result, median_s=result["median_s"] * factor)
+                                           for result in results["results"]]}, fh)
+                if regressed:
+                    with self.assertRaises(CommandError):
+                        call_command("bench_predictor", baseline=baseline, stderr=io.StringIO(), **options)
+                else:
+                    call_command("bench_predictor", baseline=baseline, **options)
+
+
+class ModelSelectionTests(SimpleTestCase):
+    def test_selected_model_is_refit_and_bundled(self):
+        lifestyle = model_selection.select_lifestyle_model(folds=3)
+        performance = model_selection.select_performance_model(folds=3)
+        reports = performance["selection"]["candidates"]
+
+        self.assertEqual(len(reports), len(model_selection.candidate_grid()))
+        self.assertEqual([report["cv_rmse"] for report in reports], sorted(report["cv_rmse"] for report in reports))
+        self.assertEqual(type(performance["model"]).__name__, performance["selection"]["selected"]["name"])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "model.bundle")
+            ml_model.save_model_bundle(lifestyle, performance, path)
+            artifacts = ModelRegistry(bundle_path=path).current()
+            self.assertEqual(artifacts.metadata["model_selection"]["performance"]["selected"],
+                             performance["selection"]["selected"])
+            np.testing.assert_allclose(artifacts.performance_model.coef_, performance["model"].coef_)
+
+
+class DatasetCacheTests(SimpleTestCase):
+    def test_cache_matches_csv_encoding_in_row_groups(self):
+        with tempfile.TemporaryDirectory() as tmp, \
+                override_settings(PREDICTOR_DATASET_CACHE_DIR=tmp, PREDICTOR_DATASET_ROW_GROUP_SIZE=64):
+            X, y, vocabularies = ml_model.load_performance_dataset()
+            chunks = list(datasets.iter_dataset(datasets.PERFORMANCE))
+            statistics = incremental.initial_statistics()
+
+        expected = ml_model.encode_categorical_features(pd.read_csv(ml_model.DATA_PERFORMANCE_PATH))
+        expected_y = expected.pop("GPA")
+        self.assertEqual(X.columns.tolist(), expected.columns.tolist())
+        np.testing.assert_array_equal(X.to_numpy(dtype=float), expected.to_numpy(dtype=float))
+        np.testing.assert_array_equal(y, expected_y)
+        self.assertEqual(vocabularies["Major"], sorted(pd.read_csv(ml_model.DATA_PERFORMANCE_PATH)["Major"].unique()))
+
+        self.assertEqual([len(chunk) for chunk in chunks[:-1]], [64] * (len(chunks) - 1))
+        self.assertEqual(sum(len(chunk) for chunk in chunks), len(X))
+        self.assertEqual(statistics["performance"].count, len(ml_model.split_training_data(X, y)[0]))
+
+
+class PredictionCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.cache = build_prediction_cache({"BACKEND": "inprocess"})
+        self.artifacts = chained_artifacts(seed=4)
+        self.lifestyle, self.performance = random_profiles(1, seed=4)[0]
+        self.performance.update(Gender="Male", PartTimeJob=1)
+
+    def test_equivalent_inputs_hit_one_entry_and_score_alike(self):
+        first = self.cache.get_or_predict(self.lifestyle, self.performance, artifacts=self.artifacts)
+        padded = dict(self.performance, Gender="Male ", PartTimeJob="Yes",
+                      StudyHoursPerWeek=float(self.performance["StudyHoursPerWeek"]))
+        self.assertEqual(self.cache.get_or_predict(self.lifestyle, padded, artifacts=self.artifacts), first)
+        self.assertEqual((self.cache.stats()["hits"], self.cache.stats()["misses"]), (1, 1))
+
+        # ✅ A cached answer equals what the model gives the padded input itself
+        uncached = build_prediction_cache({"BACKEND": "inprocess"})
+        self.assertEqual(uncached.get_or_predict(self.lifestyle, padded, artifacts=self.artifacts), first)
+
+    def test_different_profile_misses(self):
+        self.cache.get_or_predict(self.lifestyle, self.performance, artifacts=self.artifacts)
+        other = dict(self.performance, Gender="Female")
+        self.cache.get_or_predict(self.lifestyle, other, artifacts=self.artifacts)
+        self.assertEqual((self.cache.stats()["hits"], self.cache.stats()["misses"]), (0, 2))
+
+    def test_new_model_version_is_a_miss(self):
+        old = self.cache.get_or_predict(self.lifestyle, self.performance, artifacts=self.artifacts)
+        retrained = chained_artifacts(seed=5, version="retrained")
+        new = self.cache.get_or_predict(self.lifestyle, self.performance, artifacts=retrained)
+        self.assertEqual(self.cache.stats()["misses"], 2)
+        self.assertNotEqual(new, old)
+        self.assertAlmostEqual(new, retrained.compiled.predict(self.lifestyle, self.performance), places=9)
+
+
+class MetricsTests(TestCase):
+    def test_histogram_exposition_format(self):
+        histogram = Histogram("demo_seconds", "Demo.", label_names=("stage",), buckets=(1, 0.1))
+        for value in (0.05, 0.5, 5):
+            histogram.observe(value, 'say "hi"')
+        histogram.observe(0.1, "a")
+        self.assertEqual(histogram.render(), [
+            'demo_seconds_bucket{stage="a",le="0.1"} 1',
+            'demo_seconds_bucket{stage="a",le="1"} 1',
+            'demo_seconds_bucket{stage="a",le="+Inf"} 1',
+            'demo_seconds_sum{stage="a"} 0.1',
+            'demo_seconds_count{stage="a"} 1',
+            'demo_seconds_bucket{stage="say \\"hi\\"",le="0.1"} 1',
+            'demo_seconds_bucket{stage="say \\"hi\\"",le="1"} 2',
+            'demo_seconds_bucket{stage="say \\"hi\\"",le="+Inf"} 3',
+            'demo_seconds_sum{stage="say \\"hi\\""} 5.55',
+            'demo_seconds_count{stage="say \\"hi\\""} 3',
+        ])
+
+    def test_predict_request_records_stage_timings(self):
+        stages = ("parsing", "validation", "model_load", "serialization")
+        before = {stage: sum(STAGE_LATENCY.labels(stage).snapshot()[0]) for stage in stages}
+        lifestyle, performance = random_profiles(1, seed=6)[0]
+        client = APIClient(HTTP_HOST="localhost")
+        response = client.post("/api/predictor/predict/", dict(lifestyle, **performance, username="alice", persist=False),
+                               format="json")
+        self.assertEqual(response.status_code, 200)
+        for stage in stages:
+            self.assertEqual(sum(STAGE_LATENCY.labels(stage).snapshot()[0]), before[stage] + 1, stage)
+
+        self.assertEqual(client.get("/api/predictor/metrics/").status_code, 403)
+        with override_settings(PREDICTOR_METRICS_TOKEN="scrape-secret"):
+            self.assertEqual(client.get("/api/predictor/metrics/", HTTP_AUTHORIZATION="Bearer wrong").status_code, 403)
+            scrape = client.get("/api/predictor/metrics/", HTTP_AUTHORIZATION="Bearer scrape-secret")
+        self.assertEqual(scrape.status_code, 200)
+        self.assertEqual(scrape["Content-Type"], "text/plain; version=0.0.4; charset=utf-8")
+        text = scrape.content.decode()
+        self.assertIn("# TYPE predictor_stage_duration_seconds histogram\n", text)
+        self.assertIn('predictor_stage_duration_seconds_bucket{stage="validation",le="+Inf"} ', text)
+        self.assertEqual(StudentPerformance.objects.count(), 0)
+
+        # ✅ No token configured: only an admin's session can read it
+        client.force_login(create_user("root", role="admin"))
+        self.assertEqual(client.get("/api/predictor/metrics/").status_code, 200)
+
+
+class FeatureSchemaTests(SimpleTestCase):
+    def test_encode_matches_training_layout(self):
+        df = pd.read_csv(ml_model.DATA_PERFORMANCE_PATH)
+        schema = FeatureSchema.fit(df.drop(columns="GPA"))
+        expected = ml_model.encode_categorical_features(df.drop(columns="GPA"))
+
+        self.assertEqual(schema.features, expected.columns.tolist())
+        np.testing.assert_array_equal(schema.encode(df), expected.to_numpy(dtype=float))
+        # ✅ A single row keeps the full layout, whatever its own categories
+        np.testing.assert_array_equal(
+            schema.encode(df.iloc[[7]].to_dict("records")), expected.iloc[[7]].to_numpy(dtype=float)
+        )
+
+    def test_unknown_categories_follow_policy(self):
+        features = ["AttendanceRate", "PartTimeJob", "Major_Business", "Major_Science"]
+        vocabularies = {"Major": ["Arts", "Business", "Science"]}
+        rows = [{"AttendanceRate": 90.0, "PartTimeJob": "Yes", "Major": "Science"},
+                {"AttendanceRate": 50.0, "PartTimeJob": 0, "Major": "Law"}]
+
+        out = np.full((2, 4), 7.0)
+        encoded = FeatureSchema(features, vocabularies).encode(rows, out=out)
+        self.assertIs(encoded, out)
+        np.testing.assert_array_equal(encoded, [[90, 1, 0, 1], [50, 0, 0, 0]])
+
+        strict = FeatureSchema(features, vocabularies, unknown=UNKNOWN_ERROR)
+        strict.encode(rows[:1])
+        with self.assertRaisesMessage(UnknownCategoryError, "Unknown Major: Law"):
+            strict.encode(rows)
+
+    def test_column_missing_from_some_records_is_an_error(self):
+        schema = FeatureSchema(["AttendanceRate", "PartTimeJob", "Major_Science"], {"Major": ["Arts", "Science"]})
+        rows = [{"AttendanceRate": 90.0, "PartTimeJob": 1, "Major": "Arts"},
+                {"AttendanceRate": 50.0, "Major": "Science"}]
+        with self.assertRaisesMessage(ValueError, "Row 1 has no PartTimeJob column"):
+            schema.encode(rows)
+        with self.assertRaisesMessage(ValueError, "Row 0 has no Major column"):
+            schema.encode([{"AttendanceRate": 1.0, "PartTimeJob": 0}, dict(rows[0], PartTimeJob=0)])
+
+        # ✅ A column none of the records carry still encodes as 0
+        np.testing.assert_array_equal(schema.encode([{"AttendanceRate": 1.0}, {"AttendanceRate": 2.0}]),
+                                      [[1, 0, 0], [2, 0, 0]])
+
+
+class ShadowScoringTests(SimpleTestCase):
+    def test_candidate_deltas_and_promotion(self):
+        live = ModelRegistry().current()
+        statistics = incremental.initial_statistics()
+        shifted = pd.read_csv(ml_model.DATA_PERFORMANCE_PATH).head(100).assign(GPA=lambda df: df["GPA"] + 1)
+        incremental.absorb_labelled_rows(statistics, performance_rows=shifted)
+        stages = incremental.statistics_stages(statistics)
+
+        profiles = random_profiles(20, seed=5)
+        lifestyle_rows = [lifestyle for lifestyle, _ in profiles]
+        performance_rows = [performance for _, performance in profiles]
+        with tempfile.TemporaryDirectory() as tmp:
+            candidate_path = os.path.join(tmp, "model.bundle.candidate")
+            candidate_version = ml_model.save_model_bundle(stages["lifestyle"], stages["performance"], candidate_path)
+            candidate = ModelRegistry(bundle_path=candidate_path).current()
+
+            scorer = ShadowScorer(candidate_path)
+            live_predictions = live.compiled.predict_batch(lifestyle_rows, performance_rows)
+            scorer.submit(lifestyle_rows[:5], performance_rows[:5], live_predictions[:5], live.version, 0.001)
+            scorer.submit(lifestyle_rows[5:], performance_rows[5:], live_predictions[5:], live.version, 0.002)
+            scorer.wait(timeout=10)
+            scorer.shutdown()
+
+            [comparison] = scorer.report()["comparisons"]
+            deltas = candidate.compiled.predict_batch(lifestyle_rows, performance_rows) - live_predictions
+            self.assertEqual((comparison["live_version"], comparison["candidate_version"]),
+                             (live.version, candidate_version))
+            self.assertEqual((comparison["requests"], comparison["rows"]), (2, 20))
+            self.assertAlmostEqual(comparison["mean_delta"], deltas.mean(), places=9)
+            self.assertAlmostEqual(comparison["max_abs_delta"], np.abs(deltas).max(), places=9)
+            self.assertEqual(sum(comparison["abs_delta_buckets"].values()), 20)
+            self.assertEqual(comparison["latency"]["live"]["samples"], 2)
+
+            live_path = os.path.join(tmp, "model.bundle")
+            self.assertEqual(promote_candidate(candidate_path, live_path), candidate_version)
+            self.assertEqual(ModelRegistry(bundle_path=live_path).current().version, candidate_version)
+
+
+class MonitoringAccessTests(TestCase):
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST="localhost")
+
+    def test_shadow_report_is_admin_only(self):
+        self.assertEqual(self.client.get("/api/predictor/shadow/").status_code, 401)
+        self.client.force_authenticate(create_user("prof", role="professor"))
+        self.assertEqual(self.client.get("/api/predictor/shadow/").status_code, 403)
+
+        self.client.force_authenticate(create_user("root", role="admin"))
+        config = {"ENABLED": True, "BUNDLE_PATH": ml_model.model_bundle_path()}
+        with override_settings(PREDICTOR_SHADOW=config), mock.patch("predictor.shadow._scorer", None):
+            report = self.client.get("/api/predictor/shadow/").json()
+            get_shadow_scorer().shutdown()
+        self.assertTrue(report["enabled"])
+        self.assertNotIn("candidate_path", report)
+
+    def test_analytics_is_for_cohort_viewers(self):
+        self.assertEqual(self.client.get("/api/predictor/analytics/").status_code, 401)
+        self.client.force_authenticate(create_user("alice"))
+        self.assertEqual(self.client.get("/api/predictor/analytics/").status_code, 403)
+        self.client.force_authenticate(create_user("prof", role="professor"))
+        self.assertEqual(self.client.get("/api/predictor/analytics/").status_code, 200)
+
+
+class ShadowTrafficTests(TestCase):
+    def test_cache_hits_are_shadowed_and_sweeps_are_not(self):
+        client = APIClient(HTTP_HOST="localhost")
+        lifestyle, performance = random_profiles(1, seed=8)[0]
+        record = dict(lifestyle, **performance, username="alice", persist=False)
+        config = {"ENABLED": True, "BUNDLE_PATH": ml_model.model_bundle_path()}
+        with override_settings(PREDICTOR_SHADOW=config), mock.patch("predictor.shadow._scorer", None):
+            scorer = get_shadow_scorer()
+            hits = get_prediction_cache().stats()["hits"]
+            for _ in range(2):
+                self.assertEqual(client.post("/api/predictor/predict/", record, format="json").status_code, 200)
+            self.assertEqual(get_prediction_cache().stats()["hits"], hits + 1)
+
+            sweep = client.post("/api/predictor/predict/sweep/", {"profile": record, "sweep": [
+                {"feature": "Sleep_Hours_Per_Day", "start": 4, "stop": 10, "steps": 50},
+            ]}, format="json")
+            self.assertEqual(sweep.status_code, 200)
+            scorer.wait(timeout=10)
+
+            [comparison] = scorer.report()["comparisons"]
+            self.assertEqual((comparison["requests"], comparison["rows"]), (2, 2))
+            scorer.shutdown()
+
+
+# ✅ Run the fanned-out chunk tasks inline, no Redis needed
+@override_settings(CELERY_TASK_ALWAYS_EAGER=True, CELERY_BROKER_URL="memory://")
+class PredictionJobTests(TestCase):
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST="localhost")
+        self.client.force_authenticate(get_user_model().objects.create_user("jobs", "jobs@example.com", password="secret"))
+
+    def test_chunked_job_matches_bulk_scoring(self):
+        lifestyle = pd.read_csv(ml_model.DATA_LIFESTYLE_PATH).head(45)
+        performance = pd.read_csv(ml_model.DATA_PERFORMANCE_PATH).head(45)
+        rows = pd.concat([lifestyle[["Student_ID"] + LIFESTYLE_FIELDS], performance[PERFORMANCE_FIELDS]], axis=1)
+        rows.loc[7, "Study_Hours_Per_Day"] = None
+        content = rows.to_csv(index=False).encode()
+
+        with tempfile.TemporaryDirectory() as tmp, override_settings(PREDICTOR_JOBS_DIR=tmp):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post("/api/predictor/jobs/", {
+                    "file": SimpleUploadedFile("students.csv", content, content_type="text/csv"),
+                    "chunk_size": 10,
+                }, format="multipart")
+            self.assertEqual(response.status_code, 202)
+
+            job = self.client.get(f"/api/predictor/jobs/{response.data['id']}/").data
+            self.assertEqual((job["status"], job["progress"]), ("succeeded", 1))
+            self.assertEqual((job["total_chunks"], job["total_rows"], job["invalid_rows"]), (5, 45, 1))
+
+            download = self.client.get(f"/api/predictor/jobs/{job['id']}/result/")
+            self.assertEqual(download.status_code, 200)
+            expected = pd.concat(score_csv(io.BytesIO(content), chunk_size=20)).to_csv().encode()
+            self.assertEqual(b"".join(download.streaming_content), expected)
+            self.assertEqual(os.listdir(os.path.join(tmp, job["id"])), ["result.csv"])
+
+    def test_redelivered_tasks_count_once_and_model_changes_fail_the_job(self):
+        lifestyle = pd.read_csv(ml_model.DATA_LIFESTYLE_PATH).head(30)
+        performance = pd.read_csv(ml_model.DATA_PERFORMANCE_PATH).head(30)
+        content = pd.concat([lifestyle[["Student_ID"] + LIFESTYLE_FIELDS], performance[PERFORMANCE_FIELDS]],
+                            axis=1).to_csv(index=False).encode()
+
+        with tempfile.TemporaryDirectory() as tmp, override_settings(PREDICTOR_JOBS_DIR=tmp):
+            job = jobs.create_job(None, 10, upload=SimpleUploadedFile("students.csv", content))
+            chunks = jobs.split_job(job.id)
+            self.assertEqual(len(chunks), 3)
+            self.assertEqual(jobs.split_job(job.id), [])
+
+            self.assertFalse(jobs.score_job_chunk(job.id, *chunks[0]))
+            self.assertFalse(jobs.score_job_chunk(job.id, *chunks[0]))
+            job.refresh_from_db()
+            self.assertEqual((job.completed_chunk_ids, job.scored_rows), ([0], 10))
+
+            PredictionJob.objects.filter(pk=job.id).update(model_version="retired")
+            self.assertFalse(jobs.score_job_chunk(job.id, *chunks[1]))
+            job.refresh_from_db()
+            self.assertEqual(job.status, PredictionJob.FAILED)
+            self.assertIn("Model changed from retired", job.error)
+            self.assertFalse(jobs.score_job_chunk(job.id, *chunks[2]))
+            self.assertEqual(PredictionJob.objects.get(pk=job.id).completed_chunks, 1)
+
+    def test_job_without_a_model_bundle_fails(self):
+        content = pd.read_csv(ml_model.DATA_PERFORMANCE_PATH).head(5).to_csv(index=False).encode()
+        with tempfile.TemporaryDirectory() as tmp, override_settings(PREDICTOR_JOBS_DIR=tmp), \
+                mock.patch("predictor.registry._registry", ModelRegistry(bundle_path=os.path.join(tmp, "missing.pkl"))):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post("/api/predictor/jobs/", {
+                    "file": SimpleUploadedFile("students.csv", content, content_type="text/csv"),
+                }, format="multipart")
+            self.assertEqual(response.status_code, 202)
+
+            job = self.client.get(f"/api/predictor/jobs/{response.data['id']}/").data
+        self.assertEqual((job["status"], job["total_chunks"]), ("failed", 0))
+        self.assertIn("Model loading failed", job["error"])
+
+
+class WebSocketClient(ApplicationCommunicator):
+    """Minimal WebSocket client for the ASGI app (``channels.testing`` needs daphne)."""
+
+    def __init__(self, path, query):
+        super().__init__(application, {
+            "type": "websocket", "path": path, "query_string": query.encode(),
+            "headers": [(b"host", b"localhost"), (b"origin", b"http://localhost")], "subprotocols": [],
+        })
+
+    async def connect(self):
+        await self.send_input({"type": "websocket.connect"})
+        return await self.receive_output(5)
+
+    async def receive_json(self):
+        return json.loads((await self.receive_output(5))["text"])
+
+    async def disconnect(self):
+        await self.send_input({"type": "websocket.disconnect", "code": 1000})
+        await self.wait(5)
+
+
+@override_settings(PREDICTOR_LIVE_UPDATES={"ENABLED": True, "MIN_INTERVAL": 60})
+class LiveDashboardTests(TransactionTestCase):
+    def prediction(self, major, gpa):
+        return StudentPerformance(
+            username="student", Study_Hours_Per_Day=5, Extracurricular_Hours_Per_Day=1, Sleep_Hours_Per_Day=8,
+            Social_Hours_Per_Day=2, Physical_Activity_Hours_Per_Day=1, Stress_Level=1, Major=major, GPA=gpa,
+        )
+
+    def token(self, username, role):
+        user = get_user_model().objects.create_user(username, f"{username}@example.com", password="x", role=role)
+        return Token.objects.get_or_create(user=user)[0].key
+
+    def test_bursts_are_coalesced_per_group(self):
+        professor = self.token("prof", "professor")
+        student = self.token("stud", "student")
+        publisher = get_live_publisher()
+
+        async def scenario():
+            rejected = WebSocketClient("/ws/predictor/dashboard/", f"token={student}")
+            self.assertEqual((await rejected.connect())["type"], "websocket.close")
+
+            everything = WebSocketClient("/ws/predictor/dashboard/", f"token={professor}")
+            law = WebSocketClient("/ws/predictor/dashboard/", f"token={professor}&major=Law")
+            for client in (everything, law):
+                self.assertEqual((await client.connect())["type"], "websocket.accept")
+                self.assertEqual((await client.receive_json())["type"], "snapshot")
+
+            # ✅ First save goes out at once, the burst behind it waits for one coalesced frame
+            await sync_to_async(save_predictions)([self.prediction("Law", 3.0)])
+            first = await everything.receive_json()
+            await law.receive_json()
+            for gpa in (2.0, 2.5, 3.5):
+                await sync_to_async(save_predictions)([self.prediction(None, gpa)])
+            await sync_to_async(save_predictions)([self.prediction("Law", 4.0), self.prediction("Law", 1.0)])
+            self.assertTrue(await everything.receive_nothing(0.2))
+
+            await sync_to_async(publisher.flush)()
+            burst = await everything.receive_json()
+            law_burst = await law.receive_json()
+            self.assertTrue(await everything.receive_nothing(0.2))
+            for client in (everything, law):
+                await client.disconnect()
+            return first, burst, law_burst
+
+        first, burst, law_burst = async_to_sync(scenario)()
+        self.assertEqual((first["type"], first["coalesced"]), ("update", 1))
+        self.assertEqual(burst["coalesced"], 5)
+        self.assertEqual([p["GPA"] for p in burst["predictions"]], [2.0, 2.5, 3.5, 4.0, 1.0])
+        self.assertEqual(burst["aggregates"]["all"][0]["count"], 6)
+        self.assertEqual((law_burst["coalesced"], [p["Major"] for p in law_burst["predictions"]]), (2, ["Law", "Law"]))
+
+
+class RendererTests(TestCase):
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST="localhost")
+        self.client.force_authenticate(create_user("professor", role="professor"))
+        save_predictions(prediction_rows("renderer", 5, seed=11))
+
+    def test_history_as_arrow_matches_json(self):
+        url = "/api/predictor/history/?username=renderer&fields=id,Major,GPA,created_at&limit=3"
+        as_json = self.client.get(url).json()
+        response = self.client.get(url, HTTP_ACCEPT=ARROW_STREAM_MEDIA_TYPE)
+        self.assertEqual(response["Content-Type"], ARROW_STREAM_MEDIA_TYPE)
+
+        table = pa.ipc.open_stream(response.content).read_all()
+        self.assertEqual(table.column_names, ["id", "Major", "GPA", "created_at"])
+        self.assertEqual(table["id"].to_pylist(), [row["id"] for row in as_json["results"]])
+        self.assertEqual(table["GPA"].to_pylist(), [row["GPA"] for row in as_json["results"]])
+        self.assertEqual(json.loads(table.schema.metadata[b"next_cursor"]), as_json["next_cursor"])
+
+    def test_batch_and_csv_export_as_arrow(self):
+        lifestyle, performance = random_profiles(1, seed=12)[0]
+        records = [dict(lifestyle, **performance, username="renderer"), {"username": "renderer"}]
+        as_json = self.client.post("/api/predictor/predict/batch/", records, format="json").json()
+        table = pa.ipc.open_stream(self.client.post(
+            "/api/predictor/predict/batch/?format=arrow", records, format="json").content).read_all()
+        self.assertEqual(table["index"].to_pylist(), [0, 1])
+        self.assertEqual(table["GPA"][1].as_py(), None)
+        self.assertAlmostEqual(table["GPA"][0].as_py(), as_json["results"][0]["GPA"])
+        self.assertEqual(table["error"][1].as_py(), as_json["results"][1]["error"])
+
+        lifestyle = pd.read_csv(ml_model.DATA_LIFESTYLE_PATH).head(25)
+        performance = pd.read_csv(ml_model.DATA_PERFORMANCE_PATH).head(25)
+        content = pd.concat([lifestyle[["Student_ID"] + LIFESTYLE_FIELDS], performance[PERFORMANCE_FIELDS]],
+                            axis=1).to_csv(index=False).encode()
+        response = self.client.post("/api/predictor/predict/csv/?output=arrow&chunk_size=10", {
+            "file": SimpleUploadedFile("students.csv", content, content_type="text/csv"),
+        }, format="multipart")
+        batches = list(pa.ipc.open_stream(b"".join(response.streaming_content)))
+        self.assertEqual(len(batches), 3)  # one record batch per chunk
+        exported = pa.Table.from_batches(batches).to_pandas()
+        expected = pd.concat(score_csv(io.BytesIO(content), chunk_size=10)).reset_index()
+        pd.testing.assert_frame_equal(exported[["row", "Student_ID", "GPA"]], expected[["row", "Student_ID", "GPA"]])
+
+
+class PredictionApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST="localhost")
+        self.artifacts = ModelRegistry().current()
+
+    def record(self, seed, **overrides):
+        lifestyle, performance = random_profiles(1, seed=seed)[0]
+        return dict(lifestyle, **performance, username="alice", **overrides)
+
+    def expected_gpa(self, record):
+        lifestyle = {field: record[field] for field in LIFESTYLE_FIELDS}
+        performance = {field: record[field] for field in PERFORMANCE_FIELDS}
+        return round(float(ml_model.predict_gpa(lifestyle, performance, artifacts=self.artifacts)), 2)
+
+    def test_batch_scores_valid_rows_and_reports_invalid_ones(self):
+        records = [self.record(51), self.record(52, Stress_Level="high"), self.record(53)]
+        response = self.client.post("/api/predictor/predict/batch/", {"students": records}, format="json")
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual((body["saved"], body["failed"]), (2, 1))
+        self.assertEqual(body["results"][0], {"index": 0, "GPA": self.expected_gpa(records[0])})
+        self.assertEqual(body["results"][2], {"index": 2, "GPA": self.expected_gpa(records[2])})
+        self.assertEqual(body["results"][1]["index"], 1)
+        self.assertIn("Stress_Level", body["results"][1]["error"])
+        self.assertEqual(StudentPerformance.objects.count(), 2)
+        self.assertEqual(analytics_summary("all")["all"][0]["count"], 2)
+
+        self.assertEqual(self.client.post("/api/predictor/predict/batch/", [], format="json").status_code, 400)
+        invalid_only = self.client.post("/api/predictor/predict/batch/", [{"username": "x"}], format="json")
+        self.assertEqual(invalid_only.status_code, 400)
+        with override_settings(PREDICTOR_BATCH_MAX_SIZE=2):
+            self.assertEqual(self.client.post("/api/predictor/predict/batch/", records, format="json").status_code, 400)
+
+    def test_csv_reports_bad_stress_levels_and_unknown_categories_per_row(self):
+        lifestyle = pd.read_csv(ml_model.DATA_LIFESTYLE_PATH).head(6)
+        performance = pd.read_csv(ml_model.DATA_PERFORMANCE_PATH).head(6)
+        rows = pd.concat([lifestyle[["Student_ID"] + LIFESTYLE_FIELDS], performance[PERFORMANCE_FIELDS]], axis=1)
+        rows["Stress_Level"] = rows["Stress_Level"].astype(float)
+        rows.loc[1, "Stress_Level"] = 1.5
+        rows.loc[4, "Major"] = "Law"
+        content = rows.to_csv(index=False).encode()
+
+        with override_settings(PREDICTOR_UNKNOWN_CATEGORY=UNKNOWN_ERROR):
+            artifacts = ModelRegistry().current()
+        scored = pd.concat(score_csv(io.BytesIO(content), chunk_size=3, artifacts=artifacts))
+
+        self.assertEqual(scored["error"].tolist(),
+                         [None, "Invalid integer for Stress_Level: 1.5", None, None, "Unknown Major: Law", None])
+        self.assertEqual(scored["GPA"].isna().tolist(), [False, True, False, False, True, False])
+
+    def test_async_predict_scores_and_saves(self):
+        record = self.record(54)
+        response = self.client.post("/api/predictor/predict/async/", record, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"GPA": self.expected_gpa(record), "model_version": self.artifacts.version})
+        saved = StudentPerformance.objects.get()
+        self.assertEqual((saved.username, round(saved.GPA, 2)), ("alice", self.expected_gpa(record)))
+
+        self.assertEqual(self.client.get("/api/predictor/predict/async/").status_code, 405)
+        self.assertEqual(self.client.post("/api/predictor/predict/async/", "{", content_type="application/json").status_code, 400)
+        missing = self.client.post("/api/predictor/predict/async/", {"username": "alice"}, format="json")
+        self.assertEqual(missing.status_code, 400)
+        self.assertIn("Missing fields", missing.json()["error"])
+        self.assertEqual(StudentPerformance.objects.count(), 1)
+
+    def test_sweep_grid_matches_single_predictions(self):
+        profile = self.record(55)
+        response = self.client.post("/api/predictor/predict/sweep/", {"profile": profile, "sweep": [
+            {"feature": "Sleep_Hours_Per_Day", "start": 4, "stop": 10, "steps": 4},
+            {"feature": "Stress_Level", "values": [0, 2]},
+        ]}, format="json")
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["axes"], {"Sleep_Hours_Per_Day": [4.0, 6.0, 8.0, 10.0], "Stress_Level": [0.0, 2.0]})
+        self.assertEqual(body["model_version"], self.artifacts.version)
+        for i, sleep in enumerate(body["axes"]["Sleep_Hours_Per_Day"]):
+            for j, stress in enumerate(body["axes"]["Stress_Level"]):
+                expected = self.expected_gpa(dict(profile, Sleep_Hours_Per_Day=sleep, Stress_Level=stress))
+                self.assertAlmostEqual(body["GPA"][i][j], expected, delta=0.005)
+        self.assertAlmostEqual(body["baseline_GPA"], self.expected_gpa(profile), delta=0.005)
+        self.assertEqual(StudentPerformance.objects.count(), 0)
+
+        for sweep in ([{"feature": "Gender", "values": [1]}], [{"feature": "AttendanceRate", "start": 0}],
+                      [{"feature": "AttendanceRate", "start": 0, "stop": 1, "steps": 10 ** 6}]):
+            rejected = self.client.post("/api/predictor/predict/sweep/", {"profile": profile, "sweep": sweep},
+                                        format="json")
+            self.assertEqual(rejected.status_code, 400)
+
+
+class AggregateTests(TestCase):
+    def setUp(self):
+        rows = prediction_rows("alice", 12, seed=41) + prediction_rows("bob", 6, seed=42)
+        rows[3].Major = None
+        rows[5].GPA = None
+        save_predictions(rows[:1])
+        save_predictions(rows[1:10])
+        save_predictions(rows[10:])
+
+    def aggregates(self):
+        return {
+            (row.dimension, row.value): (row.count, round(row.total, 9), round(row.total_squares, 9),
+                                         row.minimum, row.maximum)
+            for row in group_aggregates()
+        }
+
+    def assert_matches_rebuild(self):
+        incremental = self.aggregates()
+        rebuild_aggregates()
+        self.assertEqual(incremental, self.aggregates())
+
+    def test_incremental_aggregates_match_full_recompute(self):
+        self.assertEqual(self.aggregates()[("all", "")][0], 17)
+        self.assertIn(("Major", ""), self.aggregates())
+        self.assert_matches_rebuild()
+
+    def test_deleted_predictions_leave_the_aggregates(self):
+        # ✅ The overall maximum has to be re-read, not decremented
+        top = StudentPerformance.objects.exclude(GPA=None).order_by("-GPA").values("pk")[:1]
+        self.assertEqual(delete_predictions(StudentPerformance.objects.filter(pk__in=top)), 1)
+        self.assert_matches_rebuild()
+
+        self.assertEqual(delete_predictions(StudentPerformance.objects.filter(Major=None)), 1)
+        self.assertNotIn(("Major", ""), self.aggregates())
+        self.assert_matches_rebuild()
+
+    @override_settings(PREDICTOR_AGGREGATE_SHARDS=4)
+    def test_striped_rows_rebuild_into_one_row_per_group(self):
+        rows = prediction_rows("carol", 9, seed=43)
+        with mock.patch("predictor.aggregates.random.randrange", side_effect=[0, 1, 3]):
+            for start in (0, 3, 6):
+                save_predictions(rows[start:start + 3])
+        stripes = PredictionAggregate.objects.filter(dimension="all").values_list("shard", flat=True)
+        self.assertLessEqual({0, 1, 3}, set(stripes))
+        self.assertEqual(self.aggregates()[("all", "")][0], 26)
+
+        carol = StudentPerformance.objects.filter(username="carol").values_list("pk", flat=True)
+        self.assertEqual(delete_predictions(StudentPerformance.objects.filter(pk__in=list(carol[:4]))), 4)
+        self.assert_matches_rebuild()
+        self.assertEqual(PredictionAggregate.objects.filter(dimension="all").count(), 1)
+
+        delete_predictions(StudentPerformance.objects.all())
+        self.assertEqual(self.aggregates(), {})
+
+
+class PredictionHistoryTests(TestCase):
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST="localhost")
+        self.student = create_user("alice")
+        save_predictions(prediction_rows("alice", 5, seed=21))
+        save_predictions(prediction_rows("bob", 2, seed=22))
+
+    def history(self, **params):
+        return self.client.get("/api/predictor/history/", params)
+
+    def test_students_only_see_their_own_predictions(self):
+        self.assertEqual(self.history(username="alice").status_code, 401)
+
+        self.client.force_authenticate(self.student)
+        self.assertEqual(self.history(username="bob").status_code, 403)
+        own = self.history(fields="username")
+        self.assertEqual(own.status_code, 200)
+        self.assertEqual({row["username"] for row in own.json()["results"]}, {"alice"})
+
+        self.client.force_authenticate(create_user("prof", role="professor"))
+        self.assertEqual(len(self.history(username="bob").json()["results"]), 2)
+
+    def test_keyset_pages_are_stable_and_sparse(self):
+        self.client.force_authenticate(self.student)
+        expected = list(StudentPerformance.objects.filter(username="alice")
+                        .order_by("-created_at", "-id").values_list("id", flat=True))
+
+        first = self.history(limit=2, fields="id,GPA").json()
+        self.assertEqual([set(row) for row in first["results"]], [{"id", "GPA"}] * 2)
+
+        # ✅ Rows saved after the first page do not shift the following pages
+        save_predictions(prediction_rows("alice", 3, seed=23))
+        seen, cursor = [row["id"] for row in first["results"]], first["next_cursor"]
+        while cursor:
+            page = self.history(limit=2, fields="id", cursor=cursor).json()
+            seen += [row["id"] for row in page["results"]]
+            cursor = page["next_cursor"]
+        self.assertEqual(seen, expected)
+
+        last = self.history(limit=8).json()
+        self.assertEqual((len(last["results"]), last["next_cursor"]), (8, None))
+        self.assertEqual(self.history(fields="id,password").status_code, 400)
+        self.assertEqual(self.history(cursor="not-a-cursor").status_code, 400)
+
+
+class WriteBehindTests(TransactionTestCase):
+    def buffer(self, **options):
+        return WriteBehindBuffer(**dict({"flush_size": 2, "flush_interval": 0.05, "flush_retries": 2}, **options))
+
+    def test_flusher_saves_in_batches_and_shutdown_drains(self):
+        buffer = self.buffer(flush_interval=60)
+        for row in prediction_rows("alice", 5, seed=31):
+            buffer.put(row)
+        buffer.shutdown()
+        stats = buffer.stats()
+        self.assertEqual(StudentPerformance.objects.filter(username="alice").count(), 5)
+        self.assertEqual((stats["queue_depth"], stats["enqueued"], stats["flushed"], stats["failed"]), (0, 5, 5, 0))
+        self.assertGreaterEqual(stats["flushes"], 2)
+
+    def test_transient_failure_is_retried(self):
+        buffer = self.buffer(flush_size=3)
+        failures = [OperationalError("database is locked")]
+
+        def flaky_save(*args, **kwargs):
+            if failures:
+                raise failures.pop()
+            return save_predictions(*args, **kwargs)
+
+        with mock.patch("predictor.writebehind.save_predictions", side_effect=flaky_save) as save:
+            buffer._write(prediction_rows("alice", 3, seed=32))
+        self.assertEqual(save.call_count, 2)
+        self.assertEqual((buffer.stats()["flushed"], buffer.stats()["failed"]), (3, 0))
+        self.assertEqual(StudentPerformance.objects.count(), 3)
+
+    def test_bad_row_only_drops_itself(self):
+        buffer = self.buffer(flush_size=4)
+        rows = prediction_rows("alice", 4, seed=33)
+        rows[2].Stress_Level = None
+        with self.assertLogs("predictor.writebehind", "ERROR") as logs:
+            buffer._write(rows)
+        self.assertEqual((buffer.stats()["flushed"], buffer.stats()["failed"]), (3, 1))
+        self.assertEqual(StudentPerformance.objects.count(), 3)
+        self.assertEqual(sum("Dropped write-behind prediction" in line for line in logs.output), 1)
+
+    @override_settings(PREDICTOR_WRITE_BEHIND={"ENABLED": True})
+    def test_invalid_request_is_rejected_before_queueing(self):
+        lifestyle, performance = random_profiles(1, seed=34)[0]
+        record = dict(lifestyle, **performance, username="alice", Study_Hours_Per_Day="lots")
+        enqueued = get_write_behind_buffer().stats()["enqueued"]
+        response = APIClient(HTTP_HOST="localhost").post("/api/predictor/predict/", record, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Study_Hours_Per_Day", response.json()["error"])
+        self.assertEqual(get_write_behind_buffer().stats()["enqueued"], enqueued)
@@ -0,0 +1,91 @@
+import logging
+import os
+import time
+
+from predictor import ml_model
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+
+class FileLock:
+    """Exclusive advisory lock on a file, shared by every process on the host.
+
+    Uses ``flock`` on POSIX and ``msvcrt.locking`` on Windows. The lock is
+    released by the OS if the holder dies, so a crashed training run never
+    leaves a stale lock behind.
+    """
+
+    def __init__(self, path, timeout=None, poll_interval=0.2):
+        self.path = path
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._fh = None
+
+    def acquire(self):
+        fh = open(self.path, "a+")
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while True:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    fh.seek(0)
+                    msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+                break
+            except OSError:
+                if deadline is not None and time.monotonic() >= deadline:
+                    fh.close()
+                    raise TimeoutError(f"❌ Could not acquire lock {self.path} within {self.timeout}s")
+                time.sleep(self.poll_interval)
+        self._fh = fh
+        return self
+
+    def release(self):
+        if self._fh is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fh.fileno(), fcntl.LOCK_UN)
+            else:
+                self._fh.seek(0)
+                msvcrt.locking(self._fh.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._fh.close()
+            self._fh = None
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+def train_models_locked(bundle_path=None, force=True, lock_timeout=None, select=False, folds=None, n_jobs=None):
+    """Train and publish a model bundle, with at most one trainer per host.
+
+    Training runs under an exclusive lock on ``<bundle>.lock``. With
+    ``force=False`` the bundle is only trained when it is still missing
+    once the lock is held, so processes that queued behind another trainer
+    reuse its result. The bundle itself is written to a temporary file and
+    renamed into place, so readers only ever see complete bundles.
+
+    ``select``, ``folds`` & ``n_jobs`` are passed on to
+    :func:`predictor.ml_model.train_models`.
+
+    Returns the new bundle version, or ``None`` when training was skipped.
+    """
+    bundle_path = bundle_path or ml_model.model_bundle_path()
+
+    with FileLock(f"{bundle_path}.lock", timeout=lock_timeout):
+        if not force and os.path.exists(bundle_path):
+            logger.info(f"✅ Model bundle already present at {bundle_path}. Skipping training.")
+            return None
+
+        logger.info("🚀 Training models...")
+        return ml_model.train_models(bundle_path, select=select, folds=folds, n_jobs=n_jobs)
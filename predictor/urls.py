@@ -1,9 +1,33 @@
 from django.urls import path
-from .views import PredictStudentPerformance
+from .async_views import predict_async
+from .views import (
+    PredictionAnalytics,
+    PredictionHistory,
+    PredictionJobDetail,
+    PredictionJobResult,
+    PredictionJobs,
+    PredictStudentPerformance,
+    PredictStudentPerformanceBatch,
+    PredictStudentPerformanceCSV,
+    PredictionSweep,
+    ShadowReport,
+    predictor_metrics,
+)
 
 
 
 urlpatterns = [
     path("predict/", PredictStudentPerformance.as_view(), name="predict"),
+    path("predict/batch/", PredictStudentPerformanceBatch.as_view(), name="predict-batch"),
+    path("predict/async/", predict_async, name="predict-async"),
+    path("predict/csv/", PredictStudentPerformanceCSV.as_view(), name="predict-csv"),
+    path("predict/sweep/", PredictionSweep.as_view(), name="predict-sweep"),
+    path("history/", PredictionHistory.as_view(), name="predictor-history"),
+    path("analytics/", PredictionAnalytics.as_view(), name="predictor-analytics"),
+    path("metrics/", predictor_metrics, name="predictor-metrics"),
+    path("shadow/", ShadowReport.as_view(), name="predictor-shadow"),
+    path("jobs/", PredictionJobs.as_view(), name="prediction-jobs"),
+    path("jobs/<uuid:job_id>/", PredictionJobDetail.as_view(), name="prediction-job"),
+    path("jobs/<uuid:job_id>/result/", PredictionJobResult.as_view(), name="prediction-job-result"),
 
 ]
@@ -0,0 +1,91 @@
+import math
+
+# ✅ Inputs of the lifestyle model, in the order the scaler was fitted on
+LIFESTYLE_FIELDS = [
+    "Study_Hours_Per_Day",
+    "Extracurricular_Hours_Per_Day",
+    "Sleep_Hours_Per_Day",
+    "Social_Hours_Per_Day",
+    "Physical_Activity_Hours_Per_Day",
+    "Stress_Level",
+]
+
+# ✅ Raw inputs of the performance model (before one-hot encoding)
+PERFORMANCE_FIELDS = [
+    "StudyHoursPerWeek",
+    "AttendanceRate",
+    "Gender",
+    "Major",
+    "PartTimeJob",
+    "ExtraCurricularActivities",
+]
+
+REQUIRED_FIELDS = ["username"] + LIFESTYLE_FIELDS + PERFORMANCE_FIELDS
+
+FLOAT_FIELDS = [
+    "Study_Hours_Per_Day",
+    "Extracurricular_Hours_Per_Day",
+    "Sleep_Hours_Per_Day",
+    "Social_Hours_Per_Day",
+    "Physical_Activity_Hours_Per_Day",
+    "StudyHoursPerWeek",
+    "AttendanceRate",
+]
+BINARY_FIELDS = ["PartTimeJob", "ExtraCurricularActivities"]
+TEXT_FIELDS = ["username", "Gender", "Major"]
+
+BINARY_VALUES = {"Yes": 1, "No": 0, "1": 1, "0": 0, 1: 1, 0: 0}
+
+
+def clean_prediction_record(record):
+    """Validate and normalise one student record.
+
+    Returns ``(cleaned, None)`` on success or ``(None, error_message)``.
+    Binary fields accept ``Yes``/``No`` as well as ``1``/``0`` and are
+    returned as integers.
+    """
+    if not isinstance(record, dict):
+        return None, "Expected an object with student fields"
+
+    missing_fields = [field for field in REQUIRED_FIELDS if field not in record]
+    if missing_fields:
+        return None, f"Missing fields: {', '.join(missing_fields)}"
+
+    cleaned = {}
+    for field in FLOAT_FIELDS:
+        try:
+            value = float(record[field])
+        except (TypeError, ValueError):
+            return None, f"Invalid number for {field}: {record[field]!r}"
+        if not math.isfinite(value):
+            return None, f"Invalid number for {field}: {record[field]!r}"
+        cleaned[field] = value
+
+    try:
+        stress_level = float(record["Stress_Level"])
+    except (TypeError, ValueError):
+        stress_level = None
+    if stress_level is None or not stress_level.is_integer():
+        return None, f"Invalid integer for Stress_Level: {record['Stress_Level']!r}"
+    cleaned["Stress_Level"] = int(stress_level)
+
+    for field in BINARY_FIELDS:
+        value = record[field]
+        if not isinstance(value, (str, int, float)) or value not in BINARY_VALUES:
+            return None, f"Invalid value for {field}: {value!r} (expected Yes/No)"
+        cleaned[field] = BINARY_VALUES[value]
+
+    for field in TEXT_FIELDS:
+        value = record[field]
+        if not isinstance(value, str) or not value.strip():
+            return None, f"Invalid value for {field}: {value!r}"
+        cleaned[field] = value.strip()
+
+    return cleaned, None
+
+
+def split_prediction_record(record):
+    """Split a cleaned record into ``(lifestyle_data, performance_data)``."""
+    lifestyle_data = {key: record[key] for key in LIFESTYLE_FIELDS}
+    performance_data = {key: record[key] for key in PERFORMANCE_FIELDS}
+    return lifestyle_data, performance_data
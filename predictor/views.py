@@ -1,98 +1,435 @@
-from django.http import JsonResponse
+from django.conf import settings
+from django.utils.crypto import constant_time_compare
+from django.http import FileResponse, HttpResponse, JsonResponse, StreamingHttpResponse
+from rest_framework.parsers import JSONParser, MultiPartParser
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from .models import StudentPerformance
+from .models import PredictionJob, StudentPerformance
 import logging
+import time
+
+import numpy as np
 
 # ✅ Correctly Import the Entire Module
 from predictor import ml_model
+from predictor.aggregates import AGGREGATE_DIMENSIONS, OVERALL, analytics_summary, save_predictions
+from predictor.bulk_scoring import OUTPUT_FORMATS, render_chunks, score_csv
+from predictor.cache import cached_predict_gpa
+from predictor.jobs import create_job, job_summary, result_path
+from predictor.metrics import record_error, render_prometheus, timed
+from predictor.pagination import keyset_page
+from predictor.registry import get_model_registry
+from predictor.renderers import COLUMNAR_RENDERERS, DEFAULT_RENDERERS, Columns, columns_requested
+from predictor.serializers import StudentPerformanceSerializer
+from predictor.shadow import shadow_predictions, shadow_report
+from predictor.sweep import sweep_profile
+from predictor.validation import clean_prediction_record, split_prediction_record
+from predictor.writebehind import save_prediction
+from users.permissions import CanViewCohort, IsAdminRole
 
 logger = logging.getLogger(__name__)
 
-class PredictStudentPerformance(APIView):
-    """API to predict GPA based on student performance."""
+
+class StageTimedAPIView(APIView):
+    """APIView whose response rendering is recorded as the ``serialization`` stage.
+
+    JSON is encoded with orjson; endpoints returning many rows also offer
+    Arrow IPC and MessagePack (``Accept`` header or ``?format=arrow|msgpack``).
+    """
+
+    renderer_classes = DEFAULT_RENDERERS
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if isinstance(response, Response):
+            with timed("serialization"):
+                response.render()
+        return response
+
+
+class PredictStudentPerformance(StageTimedAPIView):
+    """API to predict GPA based on student performance.
+
+    Send ``"persist": false`` to only score the profile without saving it
+    (used by the dashboard's live mode while sliders move).
+    """
 
     def post(self, request):
         try:
-            # ✅ Extract data from request
-            data = request.data
+            # ✅ Extract data from request (DRF parses the body on first access)
+            with timed("parsing"):
+                data = request.data
             logger.info(f"📩 Received data: {data}")
 
-            # ✅ Validate input fields
-            required_fields = [
-                "username",
-                "Study_Hours_Per_Day",
-                "Extracurricular_Hours_Per_Day",
-                "Sleep_Hours_Per_Day",
-                "Social_Hours_Per_Day",
-                "Physical_Activity_Hours_Per_Day",
-                "Stress_Level",
-                "StudyHoursPerWeek",
-                "AttendanceRate",
-                "Gender",
-                "Major",
-                "PartTimeJob",
-                "ExtraCurricularActivities"
-            ]
+            with timed("validation"):
+                # ✅ Same checks as the batch endpoint: types, Yes/No → 1/0, stripped text
+                cleaned, error = clean_prediction_record(data)
+                if error:
+                    record_error("validation", "MissingFields" if error.startswith("Missing") else "InvalidRecord")
+                    return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+                lifestyle_data, performance_data = split_prediction_record(cleaned)
 
-            # ✅ Check for missing fields
-            missing_fields = [field for field in required_fields if field not in data]
-            if missing_fields:
-                return Response(
-                    {"error": f"Missing fields: {', '.join(missing_fields)}"},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
+            # ✅ Pin one model snapshot so the reported version is the one that served
+            with timed("model_load"):
+                artifacts = get_model_registry().current()
 
-            # ✅ Convert categorical fields ('Yes'/'No') into numeric values (1/0)
-            binary_fields = ["PartTimeJob", "ExtraCurricularActivities"]
-            for field in binary_fields:
-                if data[field] in ["Yes", "No"]:
-                    data[field] = 1 if data[field] == "Yes" else 0
-
-            # ✅ Prepare data for model
-            lifestyle_data = {key: data[key] for key in [
-                "Study_Hours_Per_Day",
-                "Extracurricular_Hours_Per_Day",
-                "Sleep_Hours_Per_Day",
-                "Social_Hours_Per_Day",
-                "Physical_Activity_Hours_Per_Day",
-                "Stress_Level"
-            ]}
-
-            performance_data = {key: data[key] for key in [
-                "StudyHoursPerWeek",
-                "AttendanceRate",
-                "Gender",
-                "Major",
-                "PartTimeJob",
-                "ExtraCurricularActivities"
-            ]}
-
-            # ✅ Predict GPA using the correctly imported module
-            predicted_gpa = ml_model.predict_student_performance(lifestyle_data, performance_data)
-            logger.info(f"📊 Predicted GPA: {predicted_gpa}")
-
-            # ✅ Save Prediction to Database
-            student_perf = StudentPerformance.objects.create(
-                username=data["username"],
-                GPA=predicted_gpa,
-                Study_Hours_Per_Day=data["Study_Hours_Per_Day"],
-                Extracurricular_Hours_Per_Day=data["Extracurricular_Hours_Per_Day"],
-                Sleep_Hours_Per_Day=data["Sleep_Hours_Per_Day"],
-                Social_Hours_Per_Day=data["Social_Hours_Per_Day"],
-                Physical_Activity_Hours_Per_Day=data["Physical_Activity_Hours_Per_Day"],
-                Stress_Level=data["Stress_Level"],
-                StudyHoursPerWeek=data["StudyHoursPerWeek"],
-                AttendanceRate=data["AttendanceRate"],
-                Gender=data["Gender"],
-                Major=data["Major"],
-                PartTimeJob=data["PartTimeJob"],
-                ExtraCurricularActivities=data["ExtraCurricularActivities"]
-            )
+            # ✅ Predict GPA (identical profiles are served from the prediction cache)
+            start = time.perf_counter()
+            predicted_gpa = cached_predict_gpa(lifestyle_data, performance_data, artifacts=artifacts)
+            shadow_predictions([lifestyle_data], [performance_data], [predicted_gpa], artifacts,
+                               time.perf_counter() - start)
+            logger.info(f"📊 Predicted GPA: {predicted_gpa} (model {artifacts.version})")
+
+            # ✅ Save Prediction to Database (queued when write-behind mode is on)
+            persist = data.get("persist", True) not in (False, 0, "false", "False", "0")
+            if persist:
+                with timed("db_insert"):
+                    save_prediction(StudentPerformance(GPA=predicted_gpa, **cleaned))
 
-            return Response({"GPA": round(predicted_gpa, 2)}, status=status.HTTP_200_OK)
+            return Response(
+                {"GPA": round(predicted_gpa, 2), "model_version": artifacts.version},
+                status=status.HTTP_200_OK
+            )
 
         except Exception as e:
             logger.error(f"❌ API Error: {str(e)}")
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class PredictStudentPerformanceBatch(StageTimedAPIView):
+    """API to predict GPA for a whole list of students in one request.
+
+    Accepts either a JSON array of student records or ``{"students": [...]}``.
+    Valid rows are scored together and saved in one transaction; invalid rows
+    are reported with their index and do not block the others. Arrow and
+    MessagePack responses return ``results`` as ``index``, ``GPA`` & ``error``
+    columns.
+    """
+
+    renderer_classes = COLUMNAR_RENDERERS
+
+    def post(self, request):
+        with timed("parsing"):
+            records = request.data
+        if isinstance(records, dict):
+            records = records.get("students")
+
+        if not isinstance(records, list) or not records:
+            return Response(
+                {"error": "Expected a non-empty list of student records"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        max_size = getattr(settings, "PREDICTOR_BATCH_MAX_SIZE", 10000)
+        if len(records) > max_size:
+            return Response(
+                {"error": f"Batch too large: {len(records)} records (max {max_size})"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # ✅ Validate all rows up front, keeping per-row errors
+        results = [None] * len(records)
+        valid = []
+        with timed("validation"):
+            for index, record in enumerate(records):
+                cleaned, error = clean_prediction_record(record)
+                if error:
+                    results[index] = {"index": index, "error": error}
+                else:
+                    valid.append((index, cleaned))
+        if len(valid) < len(records):
+            record_error("validation", "InvalidRecord")
+
+        if not valid:
+            return Response({"error": "No valid student records", "results": results},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            # ✅ Score every valid row in a single vectorized pass
+            with timed("model_load"):
+                artifacts = get_model_registry().current()
+            split_rows = [split_prediction_record(cleaned) for _, cleaned in valid]
+            lifestyle_rows = [lifestyle for lifestyle, _ in split_rows]
+            performance_rows = [performance for _, performance in split_rows]
+            start = time.perf_counter()
+            predicted_gpas = ml_model.predict_gpa_batch(lifestyle_rows, performance_rows, artifacts=artifacts)
+            shadow_predictions(lifestyle_rows, performance_rows, predicted_gpas, artifacts, time.perf_counter() - start)
+
+            # ✅ Save all predictions with one bulk INSERT per batch_size rows (and update aggregates)
+            instances = [
+                StudentPerformance(GPA=float(gpa), **cleaned)
+                for (_, cleaned), gpa in zip(valid, predicted_gpas)
+            ]
+            with timed("db_insert"):
+                save_predictions(
+                    instances, batch_size=getattr(settings, "PREDICTOR_BULK_CREATE_BATCH_SIZE", 1000)
+                )
+        except Exception as e:
+            logger.error(f"❌ Batch API Error: {str(e)}")
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if columns_requested(request):
+            # ✅ Straight from the prediction array, no dict per row
+            gpa = np.full(len(records), np.nan)
+            gpa[[index for index, _ in valid]] = np.round(predicted_gpas, 2)
+            results = Columns({
+                "index": np.arange(len(records)),
+                "GPA": gpa,
+                "error": [result["error"] if result else None for result in results],
+            })
+        else:
+            for (index, _), gpa in zip(valid, predicted_gpas):
+                results[index] = {"index": index, "GPA": round(float(gpa), 2)}
+        logger.info(f"📊 Batch predicted {len(valid)} of {len(records)} rows (model {artifacts.version})")
+
+        return Response({
+            "model_version": artifacts.version,
+            "saved": len(valid),
+            "failed": len(records) - len(valid),
+            "results": results,
+        }, status=status.HTTP_200_OK)
+
+
+class PredictionSweep(StageTimedAPIView):
+    """API for what-if curves: GPA over a grid of one or two features.
+
+    Body: ``{"profile": {...student fields...}, "sweep": [{"feature":
+    "Sleep_Hours_Per_Day", "start": 4, "stop": 10, "steps": 13}]}``. The
+    whole grid is scored in one batched pass and nothing is saved.
+    """
+
+    def post(self, request):
+        with timed("parsing"):
+            data = request.data
+        if not isinstance(data, dict):
+            return Response({"error": "Expected an object with profile and sweep"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            with timed("model_load"):
+                artifacts = get_model_registry().current()
+            result = sweep_profile(data.get("profile"), data.get("sweep"), artifacts)
+        except ValueError as e:
+            record_error("validation", "InvalidSweep")
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(dict(result, model_version=artifacts.version), status=status.HTTP_200_OK)
+
+
+class PredictStudentPerformanceCSV(StageTimedAPIView):
+    """API to score an uploaded CSV export and stream the GPAs back.
+
+    Upload the file as multipart field ``file``. ``?output=csv|ndjson|arrow|msgpack``
+    selects the response format and ``?chunk_size=N`` the rows scored per
+    step; only one chunk is held in memory at a time. Rows are not saved.
+    """
+
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"error": "Missing CSV upload in field 'file'"}, status=status.HTTP_400_BAD_REQUEST)
+
+        output_format = request.query_params.get("output", "csv")
+        if output_format not in OUTPUT_FORMATS:
+            return Response(
+                {"error": f"Unknown output format: {output_format} (use {', '.join(OUTPUT_FORMATS)})"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            chunk_size = int(request.query_params.get("chunk_size") or 0) or None
+            max_chunk_size = getattr(settings, "PREDICTOR_CSV_MAX_CHUNK_SIZE", 50000)
+            if chunk_size is not None and not 0 < chunk_size <= max_chunk_size:
+                raise ValueError(f"chunk_size must be between 1 and {max_chunk_size}")
+
+            # ✅ Reads the header & first chunk now so bad files fail with a 400
+            chunks = score_csv(upload, chunk_size=chunk_size)
+        except ValueError as e:
+            logger.error(f"❌ CSV API Error: {str(e)}")
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = StreamingHttpResponse(
+            render_chunks(chunks, output_format), content_type=OUTPUT_FORMATS[output_format]
+        )
+        response["Content-Disposition"] = f'attachment; filename="predictions.{output_format}"'
+        return response
+
+
+class PredictionAnalytics(StageTimedAPIView):
+    """API with GPA statistics per Major, Gender & stress level.
+
+    Served from the running aggregates, so the response time does not grow
+    with the number of saved predictions. ``?dimension=Major`` limits the
+    response to one group. Cohort-wide, so professors & admins only.
+    """
+
+    permission_classes = [IsAuthenticated, CanViewCohort]
+
+    def get(self, request):
+        dimension = request.query_params.get("dimension")
+        if dimension is not None and dimension not in [OVERALL, *AGGREGATE_DIMENSIONS]:
+            return Response(
+                {"error": f"Unknown dimension: {dimension} (use {', '.join([OVERALL, *AGGREGATE_DIMENSIONS])})"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(analytics_summary(dimension), status=status.HTTP_200_OK)
+
+
+class PredictionHistory(StageTimedAPIView):
+    """API listing saved predictions, newest first.
+
+    Filter with ``?username=`` and/or ``?major=`` (at least one is required).
+    Students only ever see their own predictions; professors & admins any.
+    ``?fields=GPA,created_at`` returns only those fields, ``?limit=`` sets the
+    page size and ``?cursor=`` continues from the previous page's
+    ``next_cursor``. Pages are selected by keyset, not ``OFFSET``. Arrow and
+    MessagePack responses return ``results`` as columns.
+    """
+
+    renderer_classes = COLUMNAR_RENDERERS
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        username = request.query_params.get("username")
+        major = request.query_params.get("major")
+        if not request.user.can_view_cohort:
+            if username and username != request.user.username:
+                return Response({"error": "You can only view your own predictions"},
+                                status=status.HTTP_403_FORBIDDEN)
+            username = request.user.username
+        if not username and not major:
+            return Response({"error": "Pass username and/or major"}, status=status.HTTP_400_BAD_REQUEST)
+
+        all_fields = list(StudentPerformanceSerializer().fields)
+        fields = request.query_params.get("fields")
+        fields = [field.strip() for field in fields.split(",") if field.strip()] if fields else all_fields
+        unknown_fields = [field for field in fields if field not in all_fields]
+        if unknown_fields:
+            return Response({"error": f"Unknown fields: {', '.join(unknown_fields)}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            page_size = getattr(settings, "PREDICTOR_HISTORY_PAGE_SIZE", 50)
+            max_page_size = getattr(settings, "PREDICTOR_HISTORY_MAX_PAGE_SIZE", 500)
+            limit = int(request.query_params.get("limit") or page_size)
+            if not 0 < limit <= max_page_size:
+                raise ValueError(f"limit must be between 1 and {max_page_size}")
+
+            queryset = StudentPerformance.objects.all()
+            if username:
+                queryset = queryset.filter(username=username)
+            if major:
+                queryset = queryset.filter(Major=major)
+
+            # ✅ Only load the requested columns (plus the keyset columns)
+            queryset = queryset.only(*{*fields, "id", "created_at"})
+            rows, next_cursor = keyset_page(queryset, request.query_params.get("cursor"), limit)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if columns_requested(request):
+            results = Columns.from_objects(rows, fields)
+        else:
+            results = StudentPerformanceSerializer(rows, many=True, fields=fields).data
+        return Response({
+            "results": results,
+            "next_cursor": next_cursor,
+        }, status=status.HTTP_200_OK)
+
+
+class PredictionJobs(StageTimedAPIView):
+    """Asynchronous batch scoring of large CSV files on Celery workers.
+
+    POST a multipart ``file`` upload, or JSON ``{"dataset": "<name>"}``
+    naming a file in ``PREDICTOR_JOB_DATASETS_DIR``, plus an optional
+    ``chunk_size`` (rows per Celery task). Returns 202 with the job; poll
+    ``jobs/<id>/`` for status & progress and download ``jobs/<id>/result/``.
+    GET lists your latest jobs.
+    """
+
+    permission_classes = [IsAuthenticated]
+    parser_classes = [JSONParser, MultiPartParser]
+
+    def get(self, request):
+        jobs = PredictionJob.objects.filter(owner=request.user).order_by("-created_at")[:50]
+        return Response({"results": [job_summary(job) for job in jobs]}, status=status.HTTP_200_OK)
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        dataset = request.data.get("dataset")
+        if (upload is None) == (not dataset):
+            return Response({"error": "Send either a CSV upload in field 'file' or a 'dataset' reference"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            chunk_size = int(request.data.get("chunk_size") or getattr(settings, "PREDICTOR_JOB_CHUNK_SIZE", 50000))
+            max_chunk_size = getattr(settings, "PREDICTOR_JOB_MAX_CHUNK_SIZE", 500000)
+            if not 0 < chunk_size <= max_chunk_size:
+                raise ValueError(f"chunk_size must be between 1 and {max_chunk_size}")
+            job = create_job(request.user, chunk_size, upload=upload, dataset=dataset)
+        except (TypeError, ValueError) as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        logger.info(f"🚀 Queued prediction job {job.id} for {job.source}")
+        return Response(job_summary(job), status=status.HTTP_202_ACCEPTED)
+
+
+class PredictionJobDetail(StageTimedAPIView):
+    """Status & progress of one of your prediction jobs."""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id):
+        job = PredictionJob.objects.filter(owner=request.user, pk=job_id).first()
+        if job is None:
+            return Response({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(job_summary(job), status=status.HTTP_200_OK)
+
+
+class PredictionJobResult(StageTimedAPIView):
+    """Download the scored CSV of a finished prediction job."""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id):
+        job = PredictionJob.objects.filter(owner=request.user, pk=job_id).first()
+        if job is None:
+            return Response({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+        if job.status != PredictionJob.SUCCEEDED:
+            return Response({"error": f"Job is {job.status}", "status": job.status},
+                            status=status.HTTP_409_CONFLICT)
+        return FileResponse(open(result_path(job.id), "rb"), as_attachment=True,
+                            filename=f"predictions-{job.id}.csv", content_type="text/csv")
+
+
+class ShadowReport(StageTimedAPIView):
+    """Live vs. candidate comparison of shadow mode: prediction deltas & latency percentiles.
+
+    Statistics are kept per process, like ``/metrics/``. Admins only: it
+    describes the models being evaluated.
+    """
+
+    permission_classes = [IsAuthenticated, IsAdminRole]
+
+    def get(self, request):
+        return Response(shadow_report(), status=status.HTTP_200_OK)
+
+
+def predictor_metrics(request):
+    """Prometheus scrape endpoint: stage latencies, errors, cache & write-behind stats.
+
+    Metrics are kept per process, so with several workers each scrape sees
+    only the worker that answered it. Scrapers send ``Authorization: Bearer
+    <PREDICTOR_METRICS_TOKEN>``; logged-in admins may read it too.
+    """
+    user = request.user
+    token = getattr(settings, "PREDICTOR_METRICS_TOKEN", None)
+    if not (user.is_authenticated and (user.role == "admin" or user.is_staff)) and not (
+        token and constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}")
+    ):
+        return HttpResponse("Forbidden", status=403, content_type="text/plain")
+    return HttpResponse(render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
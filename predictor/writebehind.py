@@ -0,0 +1,235 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import DataError, IntegrityError, close_old_connections, connection
+
+from predictor.aggregates import save_predictions
+from predictor.metrics import WRITE_BEHIND_FLUSH_LATENCY
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WRITE_BEHIND_CONFIG = {
+    "ENABLED": False,
+    "MAX_QUEUE_SIZE": 10000,   # back-pressure kicks in above this many pending rows
+    "FLUSH_SIZE": 500,         # flush as soon as this many rows are pending ...
+    "FLUSH_INTERVAL": 1.0,     # ... or this many seconds after the first one arrived
+    "PUT_TIMEOUT": 2.0,        # seconds a request waits for room before writing itself
+    "FLUSH_RETRIES": 3,
+}
+
+
+class WriteBehindBuffer:
+    """Bounded in-process queue of unsaved predictions drained by one thread.
+
+    ``put`` returns as soon as the row is queued. A daemon thread saves
+    queued rows with ``bulk_create`` when ``flush_size`` rows are pending or
+    ``flush_interval`` seconds have passed. When the queue is full ``put``
+    blocks for up to ``put_timeout`` seconds and then saves the row
+    synchronously, so producers slow down instead of losing data. A batch
+    that still fails after ``flush_retries`` attempts (or at once, on a
+    data error) is saved row by row, so only the bad rows are dropped.
+    ``shutdown`` (registered with ``atexit``) drains everything left.
+    """
+
+    def __init__(self, max_queue_size=10000, flush_size=500, flush_interval=1.0,
+                 put_timeout=2.0, flush_retries=3):
+        self.max_queue_size = max_queue_size
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.flush_retries = flush_retries
+
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._stop = threading.Event()
+        self._start_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+        self.enqueued = 0
+        self.flushed = 0
+        self.flushes = 0
+        self.failed = 0
+        self.sync_fallbacks = 0
+        self.last_flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+        self.total_flush_seconds = 0.0
+
+    def put(self, instance):
+        """Queue an unsaved ``StudentPerformance`` for the next flush."""
+        self._ensure_started()
+        try:
+            self._queue.put(instance, timeout=self.put_timeout)
+        except queue.Full:
+            # ✅ Back-pressure: the caller pays the write itself
+            logger.warning("⚠️ Write-behind queue full, saving prediction synchronously")
+            with self._stats_lock:
+                self.sync_fallbacks += 1
+            save_predictions([instance])
+            return
+        with self._stats_lock:
+            self.enqueued += 1
+
+    def flush(self):
+        """Synchronously save every row queued so far."""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._write(batch)
+
+    def shutdown(self, timeout=10.0):
+        """Stop the flusher thread and save whatever is still queued."""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout)
+        self.flush()
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "max_queue_size": self.max_queue_size,
+                "enqueued": self.enqueued,
+                "flushed": self.flushed,
+                "flushes": self.flushes,
+                "failed": self.failed,
+                "sync_fallbacks": self.sync_fallbacks,
+                "last_flush_seconds": self.last_flush_seconds,
+                "max_flush_seconds": self.max_flush_seconds,
+                "avg_flush_seconds": self.total_flush_seconds / self.flushes if self.flushes else 0.0,
+            }
+
+    def _ensure_started(self):
+        # ✅ Started lazily (and again after a fork) so each worker owns its thread
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="predictor-write-behind", daemon=True)
+            self._thread.start()
+            atexit.register(self.shutdown)
+
+    def _run(self):
+        try:
+            while not self._stop.is_set():
+                batch = self._collect()
+                if batch:
+                    self._write(batch)
+        finally:
+            connection.close()
+
+    def _collect(self):
+        """Block until a flush is due and return the rows to write."""
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.flush_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._stop.is_set():
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        with self._flush_lock:
+            for attempt in range(1, self.flush_retries + 1):
+                close_old_connections()
+                start = time.perf_counter()
+                try:
+                    save_predictions(batch, batch_size=self.flush_size)
+                except (DataError, IntegrityError, TypeError, ValueError) as e:
+                    # ✅ A bad row fails every retry the same way
+                    logger.error(f"❌ Write-behind flush of {len(batch)} rows hit a bad row: {str(e)}")
+                    break
+                except Exception as e:
+                    logger.error(f"❌ Write-behind flush of {len(batch)} rows failed (attempt {attempt}): {str(e)}")
+                    if attempt < self.flush_retries:
+                        time.sleep(min(0.5 * attempt, 2.0))
+                    continue
+
+                elapsed = time.perf_counter() - start
+                WRITE_BEHIND_FLUSH_LATENCY.observe(elapsed)
+                with self._stats_lock:
+                    self.flushed += len(batch)
+                    self.flushes += 1
+                    self.last_flush_seconds = elapsed
+                    self.max_flush_seconds = max(self.max_flush_seconds, elapsed)
+                    self.total_flush_seconds += elapsed
+                return
+
+            self._write_rows(batch)
+
+    def _write_rows(self, batch):
+        """Save ``batch`` one row at a time, dropping (and logging) only the rows that fail."""
+        saved = failed = 0
+        for instance in batch:
+            try:
+                save_predictions([instance])
+                saved += 1
+            except Exception as e:
+                failed += 1
+                logger.error(f"❌ Dropped write-behind prediction for {instance.username!r}: {str(e)}")
+        with self._stats_lock:
+            self.flushed += saved
+            self.failed += failed
+        logger.warning(f"⚠️ Saved {saved} of {len(batch)} predictions row by row ({failed} dropped)")
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def write_behind_config():
+    return dict(DEFAULT_WRITE_BEHIND_CONFIG, **getattr(settings, "PREDICTOR_WRITE_BEHIND", {}))
+
+
+def write_behind_enabled():
+    return bool(write_behind_config()["ENABLED"])
+
+
+def get_write_behind_buffer():
+    """Process-wide :class:`WriteBehindBuffer` configured by ``PREDICTOR_WRITE_BEHIND``."""
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                config = write_behind_config()
+                _buffer = WriteBehindBuffer(
+                    max_queue_size=config["MAX_QUEUE_SIZE"],
+                    flush_size=config["FLUSH_SIZE"],
+                    flush_interval=config["FLUSH_INTERVAL"],
+                    put_timeout=config["PUT_TIMEOUT"],
+                    flush_retries=config["FLUSH_RETRIES"],
+                )
+    return _buffer
+
+
+def save_prediction(instance):
+    """Save one prediction now, or queue it when write-behind mode is on.
+
+    Either way the analytics aggregates are updated with the same write.
+    """
+    if write_behind_enabled():
+        get_write_behind_buffer().put(instance)
+    else:
+        save_predictions([instance])
+    return instance
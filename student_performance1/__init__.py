@@ -1 +1,3 @@
-default_app_config = 'predictor.apps.PredictorConfig'
+from .celery import app as celery_app
+
+__all__ = ('celery_app',)
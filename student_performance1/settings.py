@@ -72,19 +72,42 @@ INSTALLED_APPS = [
 ]
 
 
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'users.authentication.CachedTokenAuthentication',
+        'rest_framework.authentication.SessionAuthentication',
+        'rest_framework.authentication.BasicAuthentication',
+    ],
+}
+# In-process token -> user cache used by CachedTokenAuthentication. TIMEOUT also bounds
+# how long other workers accept a token after it is deleted or its user changes.
+TOKEN_AUTH_CACHE = {
+    "MAX_ENTRIES": 10000,
+    "TIMEOUT": int(os.getenv("TOKEN_AUTH_CACHE_TIMEOUT", "60")),
+}
+# Bulk student provisioning (/api/users/bulk/ and manage.py provision_users)
+USERS_BULK_MAX_SIZE = 2000
+USERS_BULK_BATCH_SIZE = 500
+# Passwords are hashed by one pool of spawned processes per web worker, started on first
+# use and reused afterwards; smaller batches are hashed in the request itself.
+USERS_HASHING_WORKERS = int(os.getenv("USERS_HASHING_WORKERS", "0")) or None  # None = all cores
+USERS_HASHING_PARALLEL_MIN = 16
+
 AUTHENTICATION_BACKENDS = (
     'django.contrib.auth.backends.ModelBackend',
     'allauth.account.auth_backends.AuthenticationBackend',
 )
 
-# # Celery Configuration
-# CELERY_BROKER_URL = 'redis://localhost:6379/0'
-# CELERY_ACCEPT_CONTENT = ['json']
-# CELERY_TASK_SERIALIZER = 'json'
-# CELERY_RESULT_BACKEND = 'django-db'
+# Celery Configuration
+CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0')
+CELERY_ACCEPT_CONTENT = ['json']
+CELERY_TASK_SERIALIZER = 'json'
+CELERY_RESULT_BACKEND = 'django-db'
+# Run tasks inline in the calling process (no broker needed), e.g. for local development
+CELERY_TASK_ALWAYS_EAGER = os.getenv('CELERY_TASK_ALWAYS_EAGER', 'False') == 'True'
 
 # Django Channels Configuration
-ASGI_APPLICATION = 'student_performance.asgi.application'
+ASGI_APPLICATION = 'student_performance1.asgi.application'
 CHANNEL_LAYERS = {
     'default': {
         'BACKEND': 'channels.layers.InMemoryChannelLayer',
@@ -193,3 +216,86 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Predictor model serving
+# Seconds between checks of the model artifact files for a hot reload
+PREDICTOR_MODEL_RELOAD_INTERVAL = float(os.getenv("PREDICTOR_MODEL_RELOAD_INTERVAL", "5"))
+# Maximum number of student records accepted by /api/predictor/predict/batch/
+PREDICTOR_BATCH_MAX_SIZE = int(os.getenv("PREDICTOR_BATCH_MAX_SIZE", "10000"))
+# Rows per INSERT statement when saving bulk predictions
+PREDICTOR_BULK_CREATE_BATCH_SIZE = 1000
+# Serve predictions from the compiled affine predictor instead of the sklearn pipeline
+PREDICTOR_USE_COMPILED = os.getenv("PREDICTOR_USE_COMPILED", "True") == "True"
+# Rows read, scored and streamed per step by the CSV bulk-scoring upload
+PREDICTOR_CSV_CHUNK_SIZE = int(os.getenv("PREDICTOR_CSV_CHUNK_SIZE", "5000"))
+PREDICTOR_CSV_MAX_CHUNK_SIZE = 50000
+# Prediction cache in front of the single-student predict endpoint.
+# BACKEND is "inprocess" (per-worker LRU with TTL), "django" (uses CACHES[CACHE_ALIAS]) or None.
+PREDICTOR_CACHE = {
+    "BACKEND": os.getenv("PREDICTOR_CACHE_BACKEND", "inprocess") or None,
+    "MAX_ENTRIES": 10000,
+    "TIMEOUT": 3600,
+    "CACHE_ALIAS": "default",
+}
+# Columnar (Parquet) cache of the training CSVs, keyed by their content hash
+PREDICTOR_DATASET_CACHE_DIR = os.getenv("PREDICTOR_DATASET_CACHE_DIR") or None
+# Rows parsed per CSV chunk and stored per Parquet row group
+PREDICTOR_DATASET_ROW_GROUP_SIZE = 100000
+# Running training statistics for incremental retraining (default: next to the model bundle)
+PREDICTOR_TRAINING_STATS_PATH = os.getenv("PREDICTOR_TRAINING_STATS_PATH") or None
+# Parallel CV workers of `train_models --select` (-1 = all cores)
+PREDICTOR_SELECTION_N_JOBS = int(os.getenv("PREDICTOR_SELECTION_N_JOBS", "-1"))
+# Categories the models were not trained on: "reference" encodes them like the
+# reference category, "error" rejects the request
+PREDICTOR_UNKNOWN_CATEGORY = os.getenv("PREDICTOR_UNKNOWN_CATEGORY", "reference")
+# Largest grid (points) scored by one /api/predictor/predict/sweep/ request
+PREDICTOR_SWEEP_MAX_POINTS = 10000
+# Page size of /api/predictor/history/ (keyset pagination)
+PREDICTOR_HISTORY_PAGE_SIZE = 50
+PREDICTOR_HISTORY_MAX_PAGE_SIZE = 500
+# Threads scoring requests for the async predict view (ASGI / uvicorn)
+PREDICTOR_ASYNC_MAX_WORKERS = int(os.getenv("PREDICTOR_ASYNC_MAX_WORKERS", "4"))
+# Analytics aggregates: rows each group is striped over, so concurrent inserts rarely
+# wait on the same row lock (reads sum the stripes)
+PREDICTOR_AGGREGATE_SHARDS = int(os.getenv("PREDICTOR_AGGREGATE_SHARDS", "8"))
+# Optional write-behind mode: predictions are queued in-process and saved in bulk
+# by a background thread instead of during the request.
+PREDICTOR_WRITE_BEHIND = {
+    "ENABLED": os.getenv("PREDICTOR_WRITE_BEHIND", "False") == "True",
+    "MAX_QUEUE_SIZE": 10000,
+    "FLUSH_SIZE": 500,
+    "FLUSH_INTERVAL": 1.0,
+    "PUT_TIMEOUT": 2.0,
+    "FLUSH_RETRIES": 3,
+}
+# Batch prediction jobs (/api/predictor/jobs/): inputs, chunks & results live under
+# PREDICTOR_JOBS_DIR, which every Celery worker must share. Dataset references are
+# resolved inside PREDICTOR_JOB_DATASETS_DIR (unset = uploads only).
+PREDICTOR_JOBS_DIR = os.getenv("PREDICTOR_JOBS_DIR") or os.path.join(BASE_DIR, "prediction_jobs")
+PREDICTOR_JOB_DATASETS_DIR = os.getenv("PREDICTOR_JOB_DATASETS_DIR") or None
+# Rows scored by one Celery task
+PREDICTOR_JOB_CHUNK_SIZE = int(os.getenv("PREDICTOR_JOB_CHUNK_SIZE", "50000"))
+PREDICTOR_JOB_MAX_CHUNK_SIZE = 500000
+# Live professor dashboards (ws/predictor/dashboard/): new predictions & aggregates are
+# pushed at most once per MIN_INTERVAL seconds per group. Off by default: the in-memory
+# channel layer only reaches sockets of the same process, so only turn it on together
+# with a shared layer (channels_redis) in CHANNEL_LAYERS when running several workers.
+PREDICTOR_LIVE_UPDATES = {
+    "ENABLED": os.getenv("PREDICTOR_LIVE_UPDATES", "False") == "True",
+    "MIN_INTERVAL": float(os.getenv("PREDICTOR_LIVE_UPDATES_INTERVAL", "1.0")),
+    "MAX_PREDICTIONS": 50,
+}
+# Bearer token Prometheus sends to /api/predictor/metrics/ (unset = admins only)
+PREDICTOR_METRICS_TOKEN = os.getenv("PREDICTOR_METRICS_TOKEN") or None
+# Optional shadow mode: requests served by the predict, batch & async endpoints (cache
+# hits included; sweeps, CSV exports & jobs are not) are re-scored by a candidate bundle on a
+# background thread and compared at /api/predictor/shadow/ (promote with
+# `manage.py promote_candidate`). BUNDLE_PATH defaults to <live bundle>.candidate.
+PREDICTOR_SHADOW = {
+    "ENABLED": os.getenv("PREDICTOR_SHADOW", "False") == "True",
+    "BUNDLE_PATH": os.getenv("PREDICTOR_SHADOW_BUNDLE_PATH") or None,
+    "SAMPLE_RATE": float(os.getenv("PREDICTOR_SHADOW_SAMPLE_RATE", "1.0")),
+    "MAX_WORKERS": 1,
+    "MAX_PENDING": 1000,
+    "LATENCY_WINDOW": 10000,
+}
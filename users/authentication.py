@@ -0,0 +1,166 @@
+import copy
+import threading
+from urllib.parse import parse_qs
+
+from cachetools import TTLCache
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.authtoken.models import Token
+
+DEFAULT_TOKEN_AUTH_CACHE_CONFIG = {
+    "MAX_ENTRIES": 10000,
+    "TIMEOUT": 60,  # seconds; also the longest another worker can serve a revoked token
+}
+
+
+class TokenCache:
+    """Bounded LRU with TTL mapping token keys to ``(user, token)``.
+
+    Entries are dropped by the signal handlers below when the token is
+    deleted or its user is saved or deleted. The cache is per process and
+    signals only reach the process that made the change: other workers keep
+    accepting a deleted token, or a deactivated user, for at most
+    ``timeout`` seconds (``TOKEN_AUTH_CACHE["TIMEOUT"]``). Changes made
+    with ``QuerySet.update`` send no signals at all and are only picked up
+    on expiry.
+    """
+
+    def __init__(self, max_entries=10000, timeout=60):
+        self._cache = TTLCache(maxsize=max_entries, ttl=timeout)
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def generation(self):
+        return self._generation
+
+    def get(self, key):
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return entry
+
+    def set(self, key, entry, generation):
+        """Store ``entry`` unless an invalidation ran since ``generation`` was read."""
+        with self._lock:
+            if generation == self._generation:
+                self._cache[key] = entry
+
+    def invalidate_token(self, key):
+        with self._lock:
+            self._generation += 1
+            self._cache.pop(key, None)
+
+    def invalidate_user(self, user_id):
+        with self._lock:
+            self._generation += 1
+            for key in [key for key, (user, _) in self._cache.items() if user.pk == user_id]:
+                self._cache.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._cache.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._cache),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+_token_cache = None
+_token_cache_lock = threading.Lock()
+
+
+def get_token_cache():
+    """Process-wide :class:`TokenCache` configured by ``TOKEN_AUTH_CACHE``."""
+    global _token_cache
+    if _token_cache is None:
+        with _token_cache_lock:
+            if _token_cache is None:
+                config = dict(DEFAULT_TOKEN_AUTH_CACHE_CONFIG, **getattr(settings, "TOKEN_AUTH_CACHE", {}))
+                _token_cache = TokenCache(max_entries=config["MAX_ENTRIES"], timeout=config["TIMEOUT"])
+    return _token_cache
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """``TokenAuthentication`` that skips the token/user join for recently seen tokens."""
+
+    def authenticate_credentials(self, key):
+        cache = get_token_cache()
+        entry = cache.get(key)
+        if entry is None:
+            generation = cache.generation
+            user, token = super().authenticate_credentials(key)
+            cache.set(key, (user, token), generation)
+        else:
+            user, token = entry
+
+        # ✅ Shallow copies so one request cannot leak attribute changes into another
+        user, token = copy.copy(user), copy.copy(token)
+        token.user = user
+        return user, token
+
+
+@receiver(post_delete, sender=Token)
+def _invalidate_deleted_token(sender, instance, **kwargs):
+    get_token_cache().invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def _invalidate_changed_user(sender, instance, **kwargs):
+    # ✅ Covers deactivation, role & password changes and deletion
+    get_token_cache().invalidate_user(instance.pk)
+
+
+def token_cache_samples():
+    """Token cache statistics for :func:`predictor.metrics.register_collector`."""
+    stats = get_token_cache().stats()
+    return [
+        ("auth_token_cache_hits_total", "counter", "Token authentication cache hits.", [({}, stats["hits"])]),
+        ("auth_token_cache_misses_total", "counter", "Token authentication cache misses.", [({}, stats["misses"])]),
+        ("auth_token_cache_entries", "gauge", "Tokens currently cached.", [({}, stats["entries"])]),
+    ]
+
+
+@database_sync_to_async
+def _websocket_token_user(key):
+    try:
+        user, _ = CachedTokenAuthentication().authenticate_credentials(key)
+    except AuthenticationFailed:
+        return AnonymousUser()
+    return user
+
+
+class QueryTokenAuthMiddleware(BaseMiddleware):
+    """Channels middleware authenticating WebSockets by ``?token=<key>``.
+
+    Browsers cannot set an ``Authorization`` header on a WebSocket, so the
+    API token travels in the query string instead (mind access logs). When
+    no token is given the session user set by ``AuthMiddlewareStack`` is
+    kept; an invalid token yields an anonymous user.
+    """
+
+    async def __call__(self, scope, receive, send):
+        token = parse_qs(scope.get("query_string", b"").decode()).get("token")
+        if token:
+            scope = dict(scope, user=await _websocket_token_user(token[0]))
+        return await super().__call__(scope, receive, send)
@@ -0,0 +1,83 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+
+# ✅ This module must not import models: spawned workers import it before django.setup()
+
+logger = logging.getLogger(__name__)
+
+# Below this many passwords hashing serially is cheaper than the round trips to the pool
+PARALLEL_MIN_PASSWORDS = 16
+
+
+def _init_hashing_worker():
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "student_performance1.settings")
+    django.setup()
+
+
+_pool = None
+_pool_pid = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def get_hashing_pool(workers=None):
+    """Process-wide pool of hashing workers, started on first use.
+
+    Workers are spawned rather than forked so they never inherit the
+    parent's database connections, and each one runs ``django.setup()``
+    once to load the hasher settings; the pool is then reused by every
+    later request. ``workers`` (default ``USERS_HASHING_WORKERS`` or all
+    cores) only sizes the pool when it is started.
+    """
+    global _pool, _pool_pid, _pool_workers
+    if _pool is None or _pool_pid != os.getpid():
+        with _pool_lock:
+            # ✅ A forked web worker must not reuse its parent's pool
+            if _pool is None or _pool_pid != os.getpid():
+                workers = workers or getattr(settings, "USERS_HASHING_WORKERS", None) or os.cpu_count() or 1
+                _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                            initializer=_init_hashing_worker)
+                _pool_pid = os.getpid()
+                _pool_workers = workers
+    return _pool
+
+
+def _discard_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def hash_passwords(passwords, workers=None):
+    """``make_password`` for every password, spread over the hashing pool.
+
+    PBKDF2 is CPU bound, so threads would serialize on the GIL. Fewer than
+    ``USERS_HASHING_PARALLEL_MIN`` passwords (or ``workers=1``) are hashed
+    in this process. ``None`` passwords become unusable passwords, like
+    ``create_user``.
+    """
+    passwords = list(passwords)
+    threshold = getattr(settings, "USERS_HASHING_PARALLEL_MIN", PARALLEL_MIN_PASSWORDS)
+    if workers == 1 or len(passwords) < max(threshold, 2):
+        return [make_password(password) for password in passwords]
+
+    pool = get_hashing_pool(workers)
+    chunksize = max(1, len(passwords) // (_pool_workers * 4))
+    try:
+        return list(pool.map(make_password, passwords, chunksize=chunksize))
+    except BrokenProcessPool as e:
+        # ✅ A worker died: start a fresh pool next time, finish this batch here
+        logger.warning(f"⚠️ Password hashing pool broke, hashing serially: {str(e)}")
+        _discard_pool(pool)
+        return [make_password(password) for password in passwords]
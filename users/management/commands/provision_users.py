@@ -0,0 +1,51 @@
+import csv
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from users.provisioning import provision_users
+
+
+def read_rows(path, file_format=None):
+    """User rows from a CSV (with a header) or JSON (array) file."""
+    file_format = file_format or ("json" if path.lower().endswith(".json") else "csv")
+    with open(path, newline="", encoding="utf-8-sig") as fh:
+        if file_format == "json":
+            rows = json.load(fh)
+            if isinstance(rows, dict):
+                rows = rows.get("users")
+            if not isinstance(rows, list):
+                raise ValueError("JSON input must be a list of users or {\"users\": [...]}")
+            return rows
+        return list(csv.DictReader(fh))
+
+
+class Command(BaseCommand):
+    help = "Register many students from a CSV or JSON file (username, email, password[, role])."
+
+    def add_arguments(self, parser):
+        parser.add_argument("input", help="CSV with a header row, or a JSON array")
+        parser.add_argument("--format", choices=["csv", "json"], help="Input format (default: by file extension)")
+        parser.add_argument("--batch-size", type=int, default=getattr(settings, "USERS_BULK_BATCH_SIZE", 500),
+                            help="Users inserted per transaction")
+        parser.add_argument("--workers", type=int, help="Password hashing processes (default: USERS_HASHING_WORKERS or all cores)")
+        parser.add_argument("--report", help="Write the per-row outcomes to this JSON file")
+
+    def handle(self, *args, **options):
+        try:
+            rows = read_rows(options["input"], options["format"])
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        outcomes = provision_users(rows, batch_size=options["batch_size"], workers=options["workers"])
+
+        if options["report"]:
+            with open(options["report"], "w") as fh:
+                json.dump(outcomes, fh, indent=1)
+        for outcome in outcomes:
+            if outcome["status"] != "created":
+                self.stderr.write(f"❌ Row {outcome['index']} ({outcome['email']}): {outcome['error']}")
+
+        created = sum(outcome["status"] == "created" for outcome in outcomes)
+        self.stdout.write(self.style.SUCCESS(f"✅ Created {created} of {len(outcomes)} users"))
@@ -0,0 +1,17 @@
+from rest_framework.permissions import BasePermission
+
+
+class IsAdminRole(BasePermission):
+    """Allows users with the ``admin`` role (or staff) only."""
+
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(user and user.is_authenticated and (user.role == 'admin' or user.is_staff))
+
+
+class CanViewCohort(BasePermission):
+    """Allows professors, admins & staff: users who may see every student's data."""
+
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(user and user.is_authenticated and user.can_view_cohort)
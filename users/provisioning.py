@@ -0,0 +1,126 @@
+import logging
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from rest_framework.authtoken.models import Token
+
+from .hashing import hash_passwords
+from .models import CustomUser
+
+logger = logging.getLogger(__name__)
+
+ROLES = {role for role, _ in CustomUser.ROLE_CHOICES}
+# Keeps each IN (...) well below every backend's bound-parameter limit
+LOOKUP_CHUNK_SIZE = 5000
+
+
+def _clean_row(row):
+    if not isinstance(row, dict):
+        return None, "Expected an object with username, email & password"
+    username = str(row.get("username") or "").strip()
+    email = CustomUser.objects.normalize_email(str(row.get("email") or "").strip())
+    role = row.get("role") or "student"
+    missing = [name for name, value in (("username", username), ("email", email)) if not value]
+    if missing:
+        return None, f"Missing fields: {', '.join(missing)}"
+    if role not in ROLES:
+        return None, f"Invalid role: {role}"
+    password = row.get("password")
+    return {"username": username, "email": email, "role": role,
+            "password": None if password in (None, "") else str(password)}, None
+
+
+def _existing_accounts(emails, usernames):
+    """Emails & usernames already taken, with one query per LOOKUP_CHUNK_SIZE rows."""
+    taken_emails, taken_usernames = set(), set()
+    emails, usernames = list(emails), list(usernames)
+    for start in range(0, max(len(emails), len(usernames)), LOOKUP_CHUNK_SIZE):
+        taken = CustomUser.objects.filter(
+            Q(email__in=emails[start:start + LOOKUP_CHUNK_SIZE])
+            | Q(username__in=usernames[start:start + LOOKUP_CHUNK_SIZE])
+        ).values_list("email", "username")
+        for email, username in taken:
+            taken_emails.add(email)
+            taken_usernames.add(username)
+    return taken_emails, taken_usernames
+
+
+def _insert_batch(users):
+    """Insert ``users`` and one token each in a single transaction."""
+    with transaction.atomic():
+        CustomUser.objects.bulk_create(users)
+        if any(user.pk is None for user in users):
+            # ✅ Backends that cannot return primary keys from a bulk INSERT
+            ids = dict(CustomUser.objects.filter(email__in=[user.email for user in users])
+                       .values_list("email", "id"))
+            for user in users:
+                user.pk = ids[user.email]
+        Token.objects.bulk_create([Token(key=Token.generate_key(), user=user) for user in users])
+
+
+def provision_users(rows, batch_size=500, workers=None):
+    """Create many users (and their API tokens) at once.
+
+    ``rows`` are dicts with ``username``, ``email``, ``password`` and an
+    optional ``role``. Already registered and repeated emails/usernames are
+    found with one set query, passwords are hashed in parallel and users
+    are inserted with ``bulk_create`` in transactions of ``batch_size``.
+    Returns one ``{"index", "email", "status"[, "error"]}`` per row, where
+    status is ``created``, ``duplicate`` or ``error``.
+    """
+    outcomes = [None] * len(rows)
+    cleaned = []
+    for index, row in enumerate(rows):
+        values, error = _clean_row(row)
+        if error:
+            outcomes[index] = {"index": index, "email": row.get("email") if isinstance(row, dict) else None,
+                               "status": "error", "error": error}
+        else:
+            cleaned.append((index, values))
+
+    taken_emails, taken_usernames = _existing_accounts(
+        (values["email"] for _, values in cleaned), (values["username"] for _, values in cleaned)
+    )
+    pending = []
+    for index, values in cleaned:
+        if values["email"] in taken_emails:
+            outcomes[index] = {"index": index, "email": values["email"], "status": "duplicate",
+                               "error": "Email already exists"}
+        elif values["username"] in taken_usernames:
+            outcomes[index] = {"index": index, "email": values["email"], "status": "duplicate",
+                               "error": "Username already exists"}
+        else:
+            # ✅ Later rows repeating this email/username are duplicates too
+            taken_emails.add(values["email"])
+            taken_usernames.add(values["username"])
+            pending.append((index, values))
+
+    hashes = hash_passwords([values["password"] for _, values in pending], workers=workers)
+    users = [
+        (index, CustomUser(username=values["username"], email=values["email"], role=values["role"], password=hashed))
+        for (index, values), hashed in zip(pending, hashes)
+    ]
+
+    for start in range(0, len(users), batch_size):
+        batch = users[start:start + batch_size]
+        try:
+            _insert_batch([user for _, user in batch])
+        except IntegrityError as e:
+            # ✅ Someone registered one of these accounts since the duplicate check
+            logger.warning(f"⚠️ Bulk user insert conflicted, retrying batch one by one: {str(e)}")
+            for index, user in batch:
+                user.pk = None
+                try:
+                    _insert_batch([user])
+                except IntegrityError:
+                    outcomes[index] = {"index": index, "email": user.email, "status": "duplicate",
+                                       "error": "Email or username already exists"}
+                    continue
+                outcomes[index] = {"index": index, "email": user.email, "status": "created"}
+            continue
+        for index, user in batch:
+            outcomes[index] = {"index": index, "email": user.email, "status": "created"}
+
+    created = sum(outcome["status"] == "created" for outcome in outcomes)
+    logger.info(f"✅ Provisioned {created} of {len(rows)} users")
+    return outcomes
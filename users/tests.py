@@ -1,3 +1,65 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password
+from django.test import TestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
 
-# Create your tests here.
+from users.authentication import CachedTokenAuthentication, get_token_cache
+from users.hashing import get_hashing_pool, hash_passwords
+from users.provisioning import provision_users
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    def setUp(self):
+        get_token_cache().clear()
+        self.user = get_user_model().objects.create_user("alice", "alice@example.com", password="secret")
+        self.token = Token.objects.get_or_create(user=self.user)[0]
+        self.auth = CachedTokenAuthentication()
+
+        # ✅ Second lookup is served from the cache
+        for _ in range(2):
+            self.assertEqual(self.auth.authenticate_credentials(self.token.key)[0].pk, self.user.pk)
+        self.assertEqual(get_token_cache().stats()["hits"], 1)
+
+    def test_deleted_token_stops_authenticating(self):
+        self.token.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(self.token.key)
+
+    def test_deactivated_user_stops_authenticating(self):
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(self.token.key)
+
+
+class ProvisioningTests(TestCase):
+    def test_creates_users_with_tokens_and_reports_bad_rows(self):
+        get_user_model().objects.create_user("taken", "taken@example.com", password="secret")
+        rows = [
+            {"username": "ann", "email": "ann@example.com", "password": "pw-ann"},
+            {"username": "ben", "email": "BEN@Example.com", "password": "pw-ben", "role": "professor"},
+            {"username": "ann2", "email": "ann@example.com", "password": "pw"},
+            {"username": "other", "email": "taken@example.com", "password": "pw"},
+            {"username": "cat", "email": "", "password": "pw"},
+            {"username": "dan", "email": "dan@example.com", "role": "janitor"},
+        ]
+        outcomes = provision_users(rows, batch_size=1, workers=1)
+        self.assertEqual([outcome["status"] for outcome in outcomes],
+                         ["created", "created", "duplicate", "duplicate", "error", "error"])
+
+        ben = get_user_model().objects.get(username="ben")
+        self.assertEqual((ben.email, ben.role), ("BEN@example.com", "professor"))
+        self.assertTrue(ben.check_password("pw-ben"))
+        self.assertTrue(Token.objects.filter(user=ben).exists())
+        self.assertEqual(get_user_model().objects.count(), 3)
+
+    @override_settings(USERS_HASHING_PARALLEL_MIN=4)
+    def test_hashing_pool_is_started_once_and_reused(self):
+        passwords = [f"password-{index}" for index in range(8)]
+        pools = []
+        for _ in range(2):
+            hashes = hash_passwords(passwords, workers=2)
+            self.assertTrue(all(check_password(password, hashed) for password, hashed in zip(passwords, hashes)))
+            pools.append(get_hashing_pool())
+        self.assertIs(pools[0], pools[1])
@@ -1,7 +1,8 @@
 from django.urls import path
-from .views import CreateUserView, LoginUserView
+from .views import BulkCreateUsersView, CreateUserView, LoginUserView
 
 urlpatterns = [
     path('register/', CreateUserView.as_view(), name='register-user'),
     path('login/', LoginUserView.as_view(), name='login-user'),
+    path('bulk/', BulkCreateUsersView.as_view(), name='bulk-create-users'),
 ]
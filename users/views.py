@@ -2,8 +2,11 @@ from rest_framework import generics, status
 from rest_framework.response import Response
 from django.contrib.auth import authenticate
 from rest_framework.views import APIView
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from django.conf import settings
 from .models import CustomUser
+from .permissions import IsAdminRole
+from .provisioning import provision_users
 from .serializers import UserSerializer
 from rest_framework.authtoken.models import Token
 
@@ -41,3 +44,33 @@ class LoginUserView(APIView):
                 "username": user.username
             }, status=status.HTTP_200_OK)
         return Response({"error": "Invalid credentials"}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class BulkCreateUsersView(APIView):
+    """Register many students in one call (admins only).
+
+    Accepts a JSON array of ``{username, email, password[, role]}`` objects
+    or ``{"users": [...]}`` and returns one outcome per row. For very large
+    imports use ``manage.py provision_users`` instead of one long request.
+    """
+    permission_classes = [IsAuthenticated, IsAdminRole]
+
+    def post(self, request):
+        rows = request.data
+        if isinstance(rows, dict):
+            rows = rows.get('users')
+        if not isinstance(rows, list) or not rows:
+            return Response({'error': 'Expected a non-empty list of users'}, status=status.HTTP_400_BAD_REQUEST)
+
+        max_size = getattr(settings, 'USERS_BULK_MAX_SIZE', 2000)
+        if len(rows) > max_size:
+            return Response({'error': f'Too many users: {len(rows)} (max {max_size})'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        outcomes = provision_users(rows, batch_size=getattr(settings, 'USERS_BULK_BATCH_SIZE', 500))
+        created = sum(outcome['status'] == 'created' for outcome in outcomes)
+        return Response({
+            'created': created,
+            'failed': len(outcomes) - created,
+            'results': outcomes,
+        }, status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST)